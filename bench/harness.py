@@ -0,0 +1,308 @@
+"""Benchmark the MCP tools against the mock portal and report throughput and latency percentiles per tool.
+
+Each tool is called through ``mcp.call_tool`` exactly as an MCP client's request would be, so the
+numbers include argument validation, the worker pool, caching, the HTTP round trip to the portal and
+result serialization. Calls are spread across the mock portal's tenants and records.
+
+The portal runs in a child process by default, so that serving it does not compete with the server
+for the interpreter lock and inflate its latencies.
+
+    python -m bench.harness --calls 500 --concurrency 16 --latency-ms 25
+    python -m bench.harness --tools service_get,host_list --fresh --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from bench.mock_portal import (
+    STATS_PATH,
+    MockPortal,
+    PortalSettings,
+    PortalState,
+    add_settings_arguments,
+    settings_from_arguments,
+    settings_to_arguments,
+)
+from duplocloud_mcp.cache import reset_cache
+from duplocloud_mcp.client import reset_client
+from duplocloud_mcp.metrics import error_code, reset_metrics
+from duplocloud_mcp.pagination import reset_store
+from duplocloud_mcp.persist import reset_persistent_store
+from duplocloud_mcp.ratelimit import reset_limiter
+from duplocloud_mcp.resilience import reset_resilience
+from duplocloud_mcp.server import load_tools, mcp
+from duplocloud_mcp.singleflight import reset_flight
+
+DEFAULT_CALLS = 200
+DEFAULT_CONCURRENCY = 8
+
+# Settings applied for the run unless already set in the environment: the portal's client-side
+# rate limits would otherwise measure the limiter rather than the server.
+_BENCH_ENV = {"DUPLO_TOKEN": "mock-token", "DUPLO_RATE_READ": "0", "DUPLO_RATE_WRITE": "0"}
+
+
+class Dataset:
+    """Names of the mock portal's records, so that call ``i`` of a tool can pick a tenant and a record."""
+
+    def __init__(self, state: PortalState):
+        self.tenants = [
+            {
+                "tenant_id": tenant_id,
+                "name": tenant.name,
+                "services": list(tenant.services),
+                "hosts": list(tenant.hosts),
+                "databases": list(tenant.databases),
+                "buckets": list(tenant.buckets),
+                "ecs_services": list(tenant.ecs_services),
+            }
+            for tenant_id, tenant in state.tenants.items()
+        ]
+
+    def tenant(self, i: int) -> dict:
+        return self.tenants[i % len(self.tenants)]
+
+    def tenant_id(self, i: int) -> str:
+        return self.tenant(i)["tenant_id"]
+
+    def record(self, i: int, kind: str) -> str:
+        """Walk the tenants first, then the records within each tenant."""
+        names = self.tenant(i)[kind]
+        return names[(i // len(self.tenants)) % len(names)] if names else "missing"
+
+
+# Tool name -> (is a write, arguments for call i). Writes only set state, so they can be repeated.
+WORKLOADS: dict[str, tuple[bool, Callable[[Dataset, int], dict]]] = {
+    "tenant_list": (False, lambda d, i: {}),
+    "tenant_get": (False, lambda d, i: {"name": d.tenant(i)["name"]}),
+    "service_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "service_get": (False, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "services")}),
+    "host_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "host_get": (False, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "hosts")}),
+    "database_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "database_get": (False, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "databases")}),
+    "bucket_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "bucket_get": (False, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "buckets")}),
+    "ecs_service_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "ecs_task_def_list": (False, lambda d, i: {"tenant_id": d.tenant_id(i)}),
+    "ecs_task_list": (
+        False,
+        lambda d, i: {"tenant_id": d.tenant_id(i), "service_name": d.record(i, "ecs_services")},
+    ),
+    "inventory_search": (False, lambda d, i: {"query": f"svc-{i % 10:03d}"}),
+    "service_list_all_tenants": (False, lambda d, i: {"limit": 100}),
+    "service_update": (
+        True,
+        lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "services"), "replicas": i % 3 + 1},
+    ),
+    "service_restart": (True, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "services")}),
+    "host_reboot": (True, lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "hosts")}),
+    "database_update": (
+        True,
+        lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "databases"), "size": "db.t3.large"},
+    ),
+    "bucket_update": (
+        True,
+        lambda d, i: {"tenant_id": d.tenant_id(i), "name": d.record(i, "buckets"), "versioning": i % 2 == 0},
+    ),
+}
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(max(math.ceil(q * len(sorted_samples)) - 1, 0), len(sorted_samples) - 1)]
+
+
+def _reset_server_state() -> None:
+    reset_client()
+    reset_resilience()
+    reset_limiter()
+    reset_cache()
+    reset_flight()
+    reset_persistent_store()
+    reset_store()
+    reset_metrics()
+
+
+@contextlib.contextmanager
+def serve_portal(settings: PortalSettings = PortalSettings(), in_process: bool = False):
+    """Run a mock portal for the duration of the block and yield its URL."""
+    if in_process:
+        with MockPortal(settings) as portal:
+            yield portal.url
+        return
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "bench.mock_portal", "--port", "0", *settings_to_arguments(settings)],
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = proc.stdout.readline().strip()
+        if not line.startswith("DUPLO_HOST="):
+            raise RuntimeError(f"Mock portal did not start (exit code {proc.poll()})")
+        yield line.partition("=")[2]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        proc.stdout.close()
+
+
+def portal_requests(url: str) -> int:
+    """Total requests the mock portal at ``url`` has served."""
+    return requests.get(f"{url}/{STATS_PATH}", timeout=5).json()["total"]
+
+
+def server_environment(url: str) -> dict[str, str]:
+    """The environment for a server pointed at the mock portal at ``url``: this one plus the run's defaults."""
+    return {**_BENCH_ENV, **os.environ, "DUPLO_HOST": url}
+
+
+@contextlib.contextmanager
+def portal_environment(url: str):
+    """Point the server at ``url`` for the duration of the block, with fresh clients and caches."""
+    saved = {name: os.environ.get(name) for name in ("DUPLO_HOST", *_BENCH_ENV)}
+    env = server_environment(url)
+    os.environ.update({name: env[name] for name in saved})
+    _reset_server_state()
+    try:
+        yield
+    finally:
+        _reset_server_state()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+async def _call(name: str, arguments: dict) -> str | None:
+    """Call one tool; return its error code, ``"exception"`` if it raised, or None on success."""
+    try:
+        content, _ = await mcp.call_tool(name, arguments)
+    except Exception:
+        return "exception"
+    return error_code(content[0].text if content else None)
+
+
+async def bench_tool(name: str, url: str, dataset: Dataset, calls: int, concurrency: int, fresh: bool = False) -> dict:
+    """Call one tool ``calls`` times, at most ``concurrency`` at once, after an unmeasured warm-up round."""
+    write, build = WORKLOADS[name]
+    extra = {"fresh": True} if fresh and not write else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def one(i: int, measured: bool) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            code = await _call(name, {**build(dataset, i), **extra})
+            if measured:
+                latencies.append(time.perf_counter() - start)
+                if code is not None:
+                    errors[code] = errors.get(code, 0) + 1
+
+    await asyncio.gather(*(one(i, False) for i in range(min(concurrency, calls))))
+    requests_before = portal_requests(url)
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i, True) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "write": write,
+        "calls": calls,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(calls / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "portal_requests_per_call": round((portal_requests(url) - requests_before) / calls, 2),
+    }
+
+
+async def run_benchmark(
+    tools: list[str] | None = None,
+    calls: int = DEFAULT_CALLS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    fresh: bool = False,
+    settings: PortalSettings = PortalSettings(),
+    in_process: bool = False,
+) -> dict:
+    """Start a mock portal, benchmark each tool in turn against it and return the report."""
+    tools = tools or list(WORKLOADS)
+    unknown = sorted(set(tools) - set(WORKLOADS))
+    if unknown:
+        raise ValueError(f"No benchmark workload for: {', '.join(unknown)}")
+    if calls < 1 or concurrency < 1:
+        raise ValueError("calls and concurrency must be at least 1")
+    dataset = Dataset(PortalState(settings))
+    with serve_portal(settings, in_process) as url, portal_environment(url):
+        load_tools()
+        results = {name: await bench_tool(name, url, dataset, calls, concurrency, fresh) for name in tools}
+    return {
+        "portal": settings._asdict(),
+        "calls": calls,
+        "concurrency": concurrency,
+        "fresh": fresh,
+        "tools": results,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Render a report as a fixed-width table, one row per tool."""
+    portal = report["portal"]
+    lines = [
+        f"{report['calls']} calls per tool, concurrency {report['concurrency']}, "
+        f"{'fresh (cache bypassed)' if report['fresh'] else 'cached'} reads; portal latency "
+        f"{portal['latency_ms']}ms +{portal['jitter_ms']}ms jitter, error rate {portal['error_rate']}",
+        f"{'tool':<26}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}{'req/call':>10}",
+    ]
+    for name, r in report["tools"].items():
+        latency = r["latency_ms"]
+        lines.append(
+            f"{name:<26}{r['throughput_rps']:>9}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+            f"{latency['max']:>10}{sum(r['errors'].values()):>8}{r['portal_requests_per_call']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tools against a local mock portal.")
+    parser.add_argument("--tools", help=f"Comma-separated tools to run. Default: {','.join(WORKLOADS)}")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="Measured calls per tool.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Calls in flight at once.")
+    parser.add_argument("--fresh", action="store_true", help="Bypass the response cache on reads.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--in-process", action="store_true", help="Serve the mock portal from this process.")
+    add_settings_arguments(parser)
+    args = parser.parse_args(argv)
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()] if args.tools else None
+    try:
+        report = asyncio.run(
+            run_benchmark(
+                tools, args.calls, args.concurrency, args.fresh, settings_from_arguments(args), args.in_process
+            )
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Load test: many concurrent MCP agents driving a real server process against the mock portal.
+
+The server is started as ``main.py`` with the chosen transport, exactly as it is deployed, and the
+agents are real MCP clients. Over ``http`` (streamable HTTP) every agent has its own session, so
+per-session limits apply. Over ``stdio`` one server process serves a single session, as it does for
+one MCP host, and all agents share that session.
+
+The run steps through increasing numbers of agents (stages). In each stage every agent calls tools
+back to back for ``duration`` seconds, choosing a write with probability ``write_ratio`` and a read
+otherwise. Each stage reports throughput, latency percentiles, error rates and the server's resident
+memory; the run reports the saturation throughput and the memory growth since warm-up.
+
+    python -m bench.load --transport http --agents 50 --duration 10 --write-ratio 0.1
+    python -m bench.load --transport stdio --stages 1,8,32 --latency-ms 30 --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, NamedTuple
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamable_http_client
+
+from bench.harness import WORKLOADS, Dataset, percentile, serve_portal, server_environment
+from bench.mock_portal import PortalSettings, PortalState, add_settings_arguments, settings_from_arguments
+from duplocloud_mcp.metrics import error_code
+
+ROOT = Path(__file__).resolve().parent.parent
+TRANSPORTS = ("stdio", "http")
+
+# A stage's throughput within this fraction of the best stage counts as saturated.
+_SATURATION = 0.95
+
+
+class LoadSettings(NamedTuple):
+    transport: str = "http"
+    agents: int = 50
+    stages: tuple[int, ...] = ()
+    duration: float = 10.0
+    write_ratio: float = 0.1
+    tools: tuple[str, ...] = ()
+    seed: int = 0
+
+    def stage_sizes(self) -> list[int]:
+        """The agent count of each stage: ``stages`` if given, otherwise a ramp up to ``agents``."""
+        sizes = self.stages or (1, 5, 10, 25, self.agents)
+        return sorted({n for n in sizes if 0 < n <= self.agents} | {self.agents})
+
+
+class _Stage:
+    """Samples collected while one stage runs."""
+
+    def __init__(self, agents: int, duration: float):
+        self.agents = agents
+        self.duration = duration
+        self.started = asyncio.Event()
+        self.deadline = 0.0
+        self.latencies: list[float] = []
+        self.errors: dict[str, int] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def record(self, write: bool, elapsed: float, code: str | None) -> None:
+        self.latencies.append(elapsed)
+        if write:
+            self.writes += 1
+        else:
+            self.reads += 1
+        if code is not None:
+            self.errors[code] = self.errors.get(code, 0) + 1
+
+    def report(self, elapsed: float, rss_bytes: int | None) -> dict:
+        latencies = sorted(self.latencies)
+        calls = len(latencies)
+        return {
+            "agents": self.agents,
+            "calls": calls,
+            "reads": self.reads,
+            "writes": self.writes,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(calls / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            "errors": self.errors,
+            "error_rate": round(sum(self.errors.values()) / calls, 4) if calls else 0.0,
+            "rss_bytes": rss_bytes,
+        }
+
+
+async def call(session: ClientSession, name: str, arguments: dict) -> str | None:
+    """Call one tool; return its error code, ``"exception"`` if it raised or failed, or None on success."""
+    try:
+        result = await session.call_tool(name, arguments)
+    except Exception:
+        return "exception"
+    if result.isError:
+        return "exception"
+    text = result.content[0].text if result.content and result.content[0].type == "text" else None
+    return error_code(text)
+
+
+async def server_memory(session: ClientSession) -> int | None:
+    """The server's resident memory in bytes, from ``server_stats``."""
+    result = await session.call_tool("server_stats", {})
+    return json.loads(result.content[0].text)["process"]["rss_bytes"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def http_server(env: dict[str, str]) -> AsyncIterator[str]:
+    """Run ``main.py`` on streamable HTTP on a free loopback port and yield its MCP endpoint URL."""
+    port = _free_port()
+    env = {**env, "DUPLO_MCP_TRANSPORT": "streamable-http", "DUPLO_MCP_HOST": "127.0.0.1", "DUPLO_MCP_PORT": str(port)}
+    proc = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "main.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"MCP server exited with code {proc.returncode}")
+            with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=1):
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError("MCP server did not start listening within 30s")
+            await asyncio.sleep(0.1)
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+@contextlib.asynccontextmanager
+async def http_session(url: str) -> AsyncIterator[ClientSession]:
+    async with streamable_http_client(url) as (read, write, _), ClientSession(read, write) as session:
+        await session.initialize()
+        yield session
+
+
+@contextlib.asynccontextmanager
+async def stdio_session(env: dict[str, str]) -> AsyncIterator[ClientSession]:
+    """Start ``main.py`` on stdio and yield the one session it serves."""
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-W", "ignore", "main.py"],
+        env={**env, "DUPLO_MCP_TRANSPORT": "stdio"},
+        cwd=ROOT,
+    )
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+def _tool_mix(settings: LoadSettings) -> tuple[list[str], list[str]]:
+    tools = settings.tools or tuple(WORKLOADS)
+    unknown = sorted(set(tools) - set(WORKLOADS))
+    if unknown:
+        raise ValueError(f"No load workload for: {', '.join(unknown)}")
+    reads = [t for t in tools if not WORKLOADS[t][0]]
+    writes = [t for t in tools if WORKLOADS[t][0]]
+    if not reads and settings.write_ratio < 1 or not writes and settings.write_ratio > 0:
+        raise ValueError("The tool list needs reads unless write_ratio is 1, and writes unless it is 0")
+    return reads, writes
+
+
+async def _agent(
+    number: int,
+    open_session: Callable[[], contextlib.AbstractAsyncContextManager[ClientSession]],
+    stage: _Stage,
+    ready: asyncio.Barrier,
+    dataset: Dataset,
+    mix: tuple[list[str], list[str]],
+    settings: LoadSettings,
+) -> None:
+    reads, writes = mix
+    rng = random.Random(settings.seed * 100_003 + number)
+    async with open_session() as session:
+        await ready.wait()
+        await stage.started.wait()
+        i = number
+        while time.perf_counter() < stage.deadline:
+            write = rng.random() < settings.write_ratio
+            name = rng.choice(writes if write else reads)
+            arguments = WORKLOADS[name][1](dataset, i)
+            start = time.perf_counter()
+            code = await call(session, name, arguments)
+            stage.record(write, time.perf_counter() - start, code)
+            i += settings.agents
+
+
+async def _run_stage(
+    agents: int,
+    open_session: Callable[[], contextlib.AbstractAsyncContextManager[ClientSession]],
+    monitor: ClientSession,
+    dataset: Dataset,
+    mix: tuple[list[str], list[str]],
+    settings: LoadSettings,
+) -> dict:
+    stage = _Stage(agents, settings.duration)
+    # Agents open their sessions first; the clock starts once all of them are connected.
+    ready = asyncio.Barrier(agents + 1)
+    tasks = [asyncio.create_task(_agent(n, open_session, stage, ready, dataset, mix, settings)) for n in range(agents)]
+    await ready.wait()
+    start = time.perf_counter()
+    stage.deadline = start + settings.duration
+    stage.started.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return stage.report(elapsed, await server_memory(monitor))
+
+
+async def _warm_up(session: ClientSession, dataset: Dataset, mix: tuple[list[str], list[str]]) -> None:
+    """Call every read tool once per tenant, so stage one does not pay for imports and cold caches."""
+    for name in mix[0]:
+        for i in range(len(dataset.tenants)):
+            await call(session, name, WORKLOADS[name][1](dataset, i))
+
+
+async def run_load(settings: LoadSettings = LoadSettings(), portal: PortalSettings = PortalSettings()) -> dict:
+    """Start the mock portal and a server, run every stage and return the report."""
+    if settings.transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {settings.transport!r}; use one of {', '.join(TRANSPORTS)}")
+    if settings.agents < 1 or settings.duration <= 0 or not 0 <= settings.write_ratio <= 1:
+        raise ValueError("agents must be at least 1, duration positive and write_ratio between 0 and 1")
+    mix = _tool_mix(settings)
+    dataset = Dataset(PortalState(portal))
+    stages = []
+    async with contextlib.AsyncExitStack() as stack:
+        url = stack.enter_context(serve_portal(portal))
+        env = server_environment(url)
+        if settings.transport == "http":
+            endpoint = await stack.enter_async_context(http_server(env))
+            monitor = await stack.enter_async_context(http_session(endpoint))
+
+            def open_session():
+                return http_session(endpoint)
+        else:
+            monitor = await stack.enter_async_context(stdio_session(env))
+
+            @contextlib.asynccontextmanager
+            async def open_session():
+                yield monitor
+
+        await _warm_up(monitor, dataset, mix)
+        baseline = await server_memory(monitor)
+        for agents in settings.stage_sizes():
+            stages.append(await _run_stage(agents, open_session, monitor, dataset, mix, settings))
+        stats = json.loads((await monitor.call_tool("server_stats", {})).content[0].text)
+
+    best = max(stages, key=lambda s: s["throughput_rps"])
+    saturated = next(s for s in stages if s["throughput_rps"] >= _SATURATION * best["throughput_rps"])
+    calls = sum(s["calls"] for s in stages)
+    errors = sum(sum(s["errors"].values()) for s in stages)
+    final = stages[-1]["rss_bytes"]
+    return {
+        "transport": settings.transport,
+        "duration": settings.duration,
+        "write_ratio": settings.write_ratio,
+        "portal": portal._asdict(),
+        "stages": stages,
+        "saturation": {"throughput_rps": best["throughput_rps"], "agents": saturated["agents"]},
+        "error_rate": round(errors / calls, 4) if calls else 0.0,
+        "memory": {
+            "baseline_bytes": baseline,
+            "final_bytes": final,
+            "growth_bytes": final - baseline if final is not None and baseline is not None else None,
+            "peak_bytes": stats["process"]["peak_rss_bytes"],
+        },
+        "server": {"workers": stats["workers"], "sessions": stats["sessions"]},
+    }
+
+
+def _mb(value: int | None) -> str:
+    return "-" if value is None else f"{value / 1024 / 1024:.1f}"
+
+
+def format_load_report(report: dict) -> str:
+    """Render a load report as a fixed-width table, one row per stage."""
+    portal = report["portal"]
+    lines = [
+        f"{report['transport']} transport, {report['duration']}s per stage, {report['write_ratio']:.0%} writes; "
+        f"portal latency {portal['latency_ms']}ms +{portal['jitter_ms']}ms jitter, error rate {portal['error_rate']}",
+        f"{'agents':>6}{'calls':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'RSS MB':>9}",
+    ]
+    for s in report["stages"]:
+        latency = s["latency_ms"]
+        lines.append(
+            f"{s['agents']:>6}{s['calls']:>8}{s['throughput_rps']:>9}{latency['p50']:>10}{latency['p95']:>10}"
+            f"{latency['p99']:>10}{s['error_rate']:>8.2%}{_mb(s['rss_bytes']):>9}"
+        )
+    memory, saturation = report["memory"], report["saturation"]
+    lines.append(
+        f"saturation: {saturation['throughput_rps']} calls/s, reached at {saturation['agents']} agents; "
+        f"error rate {report['error_rate']:.2%}; memory {_mb(memory['baseline_bytes'])} -> "
+        f"{_mb(memory['final_bytes'])} MB (peak {_mb(memory['peak_bytes'])} MB)"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    defaults = LoadSettings()
+    parser = argparse.ArgumentParser(description="Load-test the MCP server with many concurrent agents.")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="http")
+    parser.add_argument("--agents", type=int, default=defaults.agents, help="Agents in the last stage.")
+    parser.add_argument("--stages", help="Comma-separated agent counts per stage. Default: ramp up to --agents.")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Seconds per stage.")
+    parser.add_argument("--write-ratio", type=float, default=defaults.write_ratio, help="Share of write calls.")
+    parser.add_argument("--tools", help=f"Comma-separated tools in the mix. Default: {','.join(WORKLOADS)}")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    add_settings_arguments(parser)
+    args = parser.parse_args(argv)
+    # Importing the server configures INFO logging; the MCP client logs every request and reconnect at INFO.
+    for name in ("httpx", "mcp.client"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    settings = LoadSettings(
+        transport=args.transport,
+        agents=args.agents,
+        stages=tuple(int(n) for n in args.stages.split(",")) if args.stages else (),
+        duration=args.duration,
+        write_ratio=args.write_ratio,
+        tools=tuple(t.strip() for t in args.tools.split(",") if t.strip()) if args.tools else (),
+        seed=args.seed,
+    )
+    try:
+        report = asyncio.run(run_load(settings, settings_from_arguments(args)))
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2) if args.json else format_load_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+"""A local stand-in for the DuploCloud portal API, for benchmarks and load tests.
+
+It serves the endpoints the tools call for tenants, services, hosts, RDS, S3 and ECS from a seeded
+in-memory dataset, over plain HTTP on a loopback port. Latency, error injection and dataset size are
+configurable. Writes change the dataset, so a read after a create or delete sees the change.
+
+    with MockPortal(PortalSettings(services=500, latency_ms=20)) as portal:
+        os.environ["DUPLO_HOST"] = portal.url
+        ...
+
+Run it standalone with ``python -m bench.mock_portal --port 8080`` and point ``DUPLO_HOST`` at it.
+``GET /_mock/requests`` returns the number of requests served per route and status.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, NamedTuple
+
+DEFAULT_REGION = "us-west-2"
+# Reports the request counts; not part of the portal API and not itself counted or delayed.
+STATS_PATH = "_mock/requests"
+_ACCOUNT = "123456789012"
+
+
+class PortalSettings(NamedTuple):
+    """Dataset size (records per tenant), injected latency and injected errors."""
+
+    tenants: int = 3
+    services: int = 50
+    hosts: int = 20
+    databases: int = 5
+    buckets: int = 10
+    ecs_services: int = 10
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    seed: int = 0
+
+
+class PortalError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _service(tenant: str, i: int) -> dict:
+    name = f"svc-{i:04d}"
+    return {
+        "Name": name,
+        "Replicas": i % 4 + 1,
+        "AgentPlatform": 7,
+        "Cloud": 0,
+        "Tags": [{"Key": "Owner", "Value": f"team-{i % 9}"}],
+        "Template": {
+            "Containers": [
+                {
+                    "Name": name,
+                    "Image": f"{_ACCOUNT}.dkr.ecr.{DEFAULT_REGION}.amazonaws.com/app-{i % 40}:v1.{i % 17}.{i % 5}",
+                    "Ports": [80, 443],
+                    "Cpu": 0.25,
+                    "Memory": "512Mi",
+                }
+            ],
+            "AllocationTags": "",
+            "OtherDockerConfig": '{"Env":[{"Name":"LOG_LEVEL","Value":"info"}]}',
+            "AgentPlatform": 7,
+        },
+    }
+
+
+def _host(tenant: str, i: int) -> dict:
+    return {
+        "FriendlyName": f"duploservices-{tenant}-host{i:04d}",
+        "InstanceId": f"i-{tenant[-2:]}{i:015x}",
+        "Capacity": "t3.large",
+        "Status": "running",
+        "PrivateIpAddress": f"10.{i // 250}.{i % 250}.{i % 7 + 10}",
+        "Zone": i % 3,
+        "AgentPlatform": 0,
+        "IsMinion": True,
+        "Tags": [{"Key": "CostCenter", "Value": f"cc-{i % 12}"}],
+    }
+
+
+def _database(tenant: str, i: int) -> dict:
+    return {
+        "Identifier": f"duplo{tenant}db{i:02d}",
+        "Engine": 1,
+        "EngineVersion": "15.4",
+        "SizeEx": "db.t3.medium",
+        "Endpoint": f"duplo{tenant}db{i:02d}.abc.{DEFAULT_REGION}.rds.amazonaws.com:5432",
+        "InstanceStatus": "available",
+        "MultiAZ": i % 2 == 0,
+    }
+
+
+def _bucket(tenant: str, i: int) -> dict:
+    return {
+        "Name": f"duploservices-{tenant}-bucket{i:02d}-{_ACCOUNT}",
+        "Region": DEFAULT_REGION,
+        "EnableVersioning": i % 2 == 0,
+        "EnableAccessLogs": False,
+        "AllowPublicAccess": False,
+        "DefaultEncryption": "Sse",
+    }
+
+
+def _task_def(family: str, revision: int, image: str) -> dict:
+    return {
+        "Family": family,
+        "TaskDefinitionArn": f"arn:aws:ecs:{DEFAULT_REGION}:{_ACCOUNT}:task-definition/{family}:{revision}",
+        "Revision": revision,
+        "NetworkMode": {"Value": "awsvpc"},
+        "RequiresCompatibilities": ["FARGATE"],
+        "Cpu": "256",
+        "Memory": "512",
+        "ContainerDefinitions": [{"Name": family.rsplit("-", 1)[-1], "Image": image, "Essential": True}],
+    }
+
+
+class _Tenant:
+    """One tenant's records, keyed by name in portal order."""
+
+    def __init__(self, index: int, settings: PortalSettings):
+        self.name = f"tenant{index:02d}"
+        self.record = {"AccountName": self.name, "TenantId": f"tid-{index:03d}", "PlanID": "default"}
+        self.services = {s["Name"]: s for s in (_service(self.name, i) for i in range(settings.services))}
+        self.hosts = {h["FriendlyName"]: h for h in (_host(self.name, i) for i in range(settings.hosts))}
+        self.databases = {d["Identifier"]: d for d in (_database(self.name, i) for i in range(settings.databases))}
+        self.buckets = {b["Name"]: b for b in (_bucket(self.name, i) for i in range(settings.buckets))}
+        self.task_defs: dict[str, list[dict]] = {}
+        self.ecs_services: dict[str, dict] = {}
+        for i in range(settings.ecs_services):
+            family = f"duploservices-{self.name}-app{i:02d}"
+            definition = _task_def(family, 1, f"nginx:1.{i % 10}")
+            self.task_defs[family] = [definition]
+            self.ecs_services[family] = {
+                "Name": family,
+                "TaskDefinition": definition["TaskDefinitionArn"],
+                "Replicas": i % 3 + 1,
+                "DnsPrfx": f"app{i:02d}",
+            }
+
+
+class PortalState:
+    """The seeded dataset and every route that reads or changes it."""
+
+    def __init__(self, settings: PortalSettings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self.tenants = {t.record["TenantId"]: t for t in (_Tenant(i, settings) for i in range(settings.tenants))}
+        self.routes: list[tuple[str, str, re.Pattern, Callable[..., Any]]] = [
+            (method, route, re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", route) + "$"), handler)
+            for method, route, handler in (
+                ("GET", "adminproxy/GetTenantNames", self.tenant_list),
+                ("POST", "admin/AddTenant", self.tenant_create),
+                ("POST", "admin/DeleteTenant/{tid}", self.tenant_delete),
+                ("GET", "v3/subscriptions/{tid}/nativeHostImages", self.host_images),
+                ("GET", "subscriptions/{tid}/GetReplicationControllers", self.service_list),
+                ("GET", "v3/subscriptions/{tid}/replicationcontroller/{name}", self.service_get),
+                ("POST", "subscriptions/{tid}/ReplicationControllerUpdate", self.service_update),
+                ("POST", "subscriptions/{tid}/ReplicationControllerChange", self.service_change),
+                ("POST", "subscriptions/{tid}/ReplicationControllerReboot/{name}", self.ack),
+                ("GET", "subscriptions/{tid}/GetNativeHosts", self.host_list),
+                ("POST", "subscriptions/{tid}/CreateNativeHost", self.host_create),
+                ("POST", "subscriptions/{tid}/TerminateNativeHost/{iid}", self.host_delete),
+                ("POST", "subscriptions/{tid}/RebootNativeHost/{iid}", self.ack),
+                ("GET", "v3/subscriptions/{tid}/aws/rds/instance", self.database_list),
+                ("POST", "v3/subscriptions/{tid}/aws/rds/instance", self.database_create),
+                ("GET", "v3/subscriptions/{tid}/aws/rds/instance/{name}", self.database_get),
+                ("DELETE", "v3/subscriptions/{tid}/aws/rds/instance/{name}", self.database_delete),
+                ("PUT", "v3/subscriptions/{tid}/aws/rds/instance/{name}/updatePayload", self.database_update),
+                ("GET", "v3/subscriptions/{tid}/aws/s3bucket", self.bucket_list),
+                ("POST", "v3/subscriptions/{tid}/aws/s3bucket", self.bucket_create),
+                ("GET", "v3/subscriptions/{tid}/aws/s3bucket/{name}", self.bucket_get),
+                ("PUT", "v3/subscriptions/{tid}/aws/s3bucket/{name}", self.bucket_update),
+                ("DELETE", "v3/subscriptions/{tid}/aws/s3bucket/{name}", self.bucket_delete),
+                ("GET", "subscriptions/{tid}/GetEcsServices", self.ecs_service_list),
+                ("POST", "subscriptions/{tid}/DeleteEcsService/{name}", self.ecs_service_delete),
+                ("POST", "subscriptions/{tid}/UpdateEcsService", self.ecs_service_update),
+                ("GET", "v3/subscriptions/{tid}/aws/ecs/taskDefFamily", self.task_def_list),
+                ("GET", "v3/subscriptions/{tid}/aws/ecs/taskDefFamily/{name}", self.task_def_get),
+                ("GET", "v3/subscriptions/{tid}/aws/ecs/service/taskDefFamily/{name}", self.ecs_service_family),
+                ("POST", "subscriptions/{tid}/FindEcsTaskDefinition", self.task_def_find),
+                ("POST", "subscriptions/{tid}/UpdateEcsTaskDefinition", self.task_def_update),
+                ("GET", "v3/subscriptions/{tid}/aws/ecsTasks/{name}", self.ecs_task_list),
+                ("POST", "v3/subscriptions/{tid}/aws/runEcsTask", self.ecs_task_run),
+            )
+        ]
+
+    def handle(self, method: str, path: str, body: Any) -> tuple[str, bytes]:
+        """Dispatch one request; return the matched route template and the JSON-encoded response."""
+        for route_method, route, pattern, handler in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                params = match.groupdict()
+                with self._lock:
+                    if "tid" in params:
+                        params["tenant"] = self._tenant(params.pop("tid"))
+                    return route, json.dumps(handler(body=body, **params)).encode()
+        raise PortalError(404, f"No route for {method} /{path}")
+
+    def _tenant(self, tenant_id: str) -> _Tenant:
+        tenant = self.tenants.get(tenant_id)
+        if tenant is None:
+            raise PortalError(404, f"Tenant {tenant_id} not found")
+        return tenant
+
+    @staticmethod
+    def _get(records: dict, name: str, kind: str) -> dict:
+        record = records.get(name)
+        if record is None:
+            raise PortalError(404, f"{kind} {name} not found")
+        return record
+
+    def ack(self, body, **_) -> dict:
+        return {}
+
+    def tenant_list(self, body) -> list:
+        return [t.record for t in self.tenants.values()]
+
+    def tenant_create(self, body) -> dict:
+        index = len(self.tenants)
+        while f"tid-{index:03d}" in self.tenants:
+            index += 1
+        tenant = _Tenant(index, self.settings._replace(services=0, hosts=0, databases=0, buckets=0, ecs_services=0))
+        tenant.name = tenant.record["AccountName"] = body["AccountName"]
+        tenant.record["PlanID"] = body.get("PlanID", "default")
+        self.tenants[tenant.record["TenantId"]] = tenant
+        return {}
+
+    def tenant_delete(self, body, tenant: _Tenant) -> dict:
+        del self.tenants[tenant.record["TenantId"]]
+        return {}
+
+    def host_images(self, body, tenant: _Tenant) -> list:
+        return [
+            {"Name": "ubuntu-22", "ImageId": "ami-0123456789abcdef0", "Agent": 0, "Arch": "amd64"},
+            {"Name": "ubuntu-22-arm", "ImageId": "ami-0fedcba9876543210", "Agent": 0, "Arch": "arm64"},
+        ]
+
+    def service_list(self, body, tenant: _Tenant) -> list:
+        return list(tenant.services.values())
+
+    def service_get(self, body, tenant: _Tenant, name: str) -> dict:
+        return self._get(tenant.services, name, "Service")
+
+    def service_update(self, body, tenant: _Tenant) -> dict:
+        if body.get("State") == "delete":
+            self._get(tenant.services, body["Name"], "Service")
+            del tenant.services[body["Name"]]
+        else:
+            record = _service(tenant.name, len(tenant.services))
+            container = record["Template"]["Containers"][0]
+            container.update(Name=body["Name"], Image=body.get("Image", container["Image"]))
+            record.update(Name=body["Name"], Replicas=body.get("Replicas", 1))
+            tenant.services[body["Name"]] = record
+        return {}
+
+    def service_change(self, body, tenant: _Tenant) -> dict:
+        record = self._get(tenant.services, body["Name"], "Service")
+        if "Image" in body:
+            record["Template"]["Containers"][0]["Image"] = body["Image"]
+        if "Replicas" in body:
+            record["Replicas"] = body["Replicas"]
+        return {}
+
+    def host_list(self, body, tenant: _Tenant) -> list:
+        return list(tenant.hosts.values())
+
+    def host_create(self, body, tenant: _Tenant) -> str:
+        record = _host(tenant.name, len(tenant.hosts) + 10000)
+        record.update(FriendlyName=body["FriendlyName"], Capacity=body.get("Capacity", "t3.large"), Status="pending")
+        tenant.hosts[record["FriendlyName"]] = record
+        return record["InstanceId"]
+
+    def host_delete(self, body, tenant: _Tenant, iid: str) -> dict:
+        for name, record in tenant.hosts.items():
+            if record["InstanceId"] == iid:
+                del tenant.hosts[name]
+                return {}
+        raise PortalError(404, f"Host {iid} not found")
+
+    def database_list(self, body, tenant: _Tenant) -> list:
+        return list(tenant.databases.values())
+
+    def database_get(self, body, tenant: _Tenant, name: str) -> dict:
+        return self._get(tenant.databases, name, "RDS instance")
+
+    def database_create(self, body, tenant: _Tenant) -> dict:
+        record = _database(tenant.name, len(tenant.databases))
+        record.update(Identifier=body["Identifier"], SizeEx=body.get("SizeEx", record["SizeEx"]))
+        record["InstanceStatus"] = "creating"
+        tenant.databases[record["Identifier"]] = record
+        return record
+
+    def database_update(self, body, tenant: _Tenant, name: str) -> dict:
+        self._get(tenant.databases, name, "RDS instance").update(body)
+        return {}
+
+    def database_delete(self, body, tenant: _Tenant, name: str) -> dict:
+        self._get(tenant.databases, name, "RDS instance")
+        del tenant.databases[name]
+        return {}
+
+    def bucket_list(self, body, tenant: _Tenant) -> list:
+        return list(tenant.buckets.values())
+
+    def bucket_get(self, body, tenant: _Tenant, name: str) -> dict:
+        return self._get(tenant.buckets, name, "S3 bucket")
+
+    def bucket_create(self, body, tenant: _Tenant) -> dict:
+        record = _bucket(tenant.name, len(tenant.buckets))
+        record["Name"] = body["Name"]
+        tenant.buckets[record["Name"]] = record
+        return record
+
+    def bucket_update(self, body, tenant: _Tenant, name: str) -> dict:
+        record = self._get(tenant.buckets, name, "S3 bucket")
+        record.update(body)
+        return record
+
+    def bucket_delete(self, body, tenant: _Tenant, name: str) -> dict:
+        self._get(tenant.buckets, name, "S3 bucket")
+        del tenant.buckets[name]
+        return {}
+
+    def ecs_service_list(self, body, tenant: _Tenant) -> list:
+        return list(tenant.ecs_services.values())
+
+    def ecs_service_delete(self, body, tenant: _Tenant, name: str) -> dict:
+        self._get(tenant.ecs_services, name, "ECS service")
+        del tenant.ecs_services[name]
+        return {}
+
+    def ecs_service_update(self, body, tenant: _Tenant) -> dict:
+        self._get(tenant.ecs_services, body["Name"], "ECS service").update(body)
+        return {}
+
+    def ecs_service_family(self, body, tenant: _Tenant, name: str) -> dict:
+        service = self._get(tenant.ecs_services, name, "ECS service")
+        return {"DuploEcsService": dict(service), "EcsServiceName": name, "TaskDefFamily": name}
+
+    def task_def_list(self, body, tenant: _Tenant) -> list:
+        return [{"Family": f, "VersionArns": [d["TaskDefinitionArn"] for d in v]} for f, v in tenant.task_defs.items()]
+
+    def task_def_get(self, body, tenant: _Tenant, name: str) -> dict:
+        versions = self._get(tenant.task_defs, name, "Task definition family")
+        return {"Family": name, "VersionArns": [d["TaskDefinitionArn"] for d in versions]}
+
+    def task_def_find(self, body, tenant: _Tenant) -> dict:
+        for versions in tenant.task_defs.values():
+            for definition in versions:
+                if definition["TaskDefinitionArn"] == body["Arn"]:
+                    return definition
+        raise PortalError(404, f"Task definition {body['Arn']} not found")
+
+    def task_def_update(self, body, tenant: _Tenant) -> str:
+        versions = self._get(tenant.task_defs, body["Family"], "Task definition family")
+        image = body["ContainerDefinitions"][0]["Image"]
+        definition = _task_def(body["Family"], len(versions) + 1, image)
+        versions.append(definition)
+        return definition["TaskDefinitionArn"]
+
+    def ecs_task_list(self, body, tenant: _Tenant, name: str) -> list:
+        service = self._get(tenant.ecs_services, name, "ECS service")
+        return [
+            {
+                "TaskArn": f"arn:aws:ecs:{DEFAULT_REGION}:{_ACCOUNT}:task/{name}/{i:032x}",
+                "TaskDefinitionArn": service["TaskDefinition"],
+                "DesiredStatus": "RUNNING",
+                "LastStatus": "RUNNING",
+            }
+            for i in range(service["Replicas"])
+        ]
+
+    def ecs_task_run(self, body, tenant: _Tenant) -> dict:
+        return {"Tasks": [{"TaskDefinitionArn": body["TaskDefinition"]} for _ in range(body.get("Count", 1))]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Without this, small responses to requests whose body arrives in a second packet wait ~40ms for delayed ACKs.
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def _dispatch(self) -> None:
+        portal = self.server.portal
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        path = self.path.split("?", 1)[0].strip("/")
+        if path == STATS_PATH:
+            self._respond(200, json.dumps(portal.request_stats()).encode())
+            return
+        route, status = None, 200
+        try:
+            body = json.loads(raw) if raw else None
+            portal.delay()
+            if portal.should_fail():
+                raise PortalError(portal.settings.error_status, "Injected error")
+            route, out = portal.state.handle(self.command, path, body)
+        except PortalError as e:
+            status, out = e.status, json.dumps({"Message": str(e)}).encode()
+        except (KeyError, TypeError, ValueError) as e:
+            status, out = 400, json.dumps({"Message": f"Bad request: {e}"}).encode()
+        portal.record(self.command, route or path, status)
+        self._respond(status, out)
+
+    def _respond(self, status: int, out: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    portal: "MockPortal"
+
+
+class MockPortal:
+    """Serves a :class:`PortalState` over HTTP on ``host:port`` (port 0 picks a free one).
+
+    Each request first sleeps ``latency_ms`` plus up to ``jitter_ms``, then fails with
+    ``error_status`` with probability ``error_rate``. Request counts are kept per route and status.
+    """
+
+    def __init__(self, settings: PortalSettings = PortalSettings(), host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings
+        self.state = PortalState(settings)
+        self._random = random.Random(settings.seed)
+        self._lock = threading.Lock()
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self._server = _Server((host, port), _Handler)
+        self._server.portal = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self) -> None:
+        with self._lock:
+            wait = self.settings.latency_ms + self._random.uniform(0, self.settings.jitter_ms)
+        if wait > 0:
+            time.sleep(wait / 1000)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.settings.error_rate
+
+    def record(self, method: str, route: str, status: int) -> None:
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def request_stats(self) -> dict:
+        """Requests served so far, in total and by ``"METHOD route status"``. Served at ``/_mock/requests``."""
+        with self._lock:
+            return {
+                "total": sum(self.requests.values()),
+                "by_route": {f"{m} {route} {status}": n for (m, route, status), n in sorted(self.requests.items())},
+            }
+
+    def start(self) -> "MockPortal":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-portal", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockPortal":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add one ``--option`` per :class:`PortalSettings` field."""
+    for field, default in PortalSettings._field_defaults.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+
+
+def settings_from_arguments(args: argparse.Namespace) -> PortalSettings:
+    return PortalSettings(**{field: getattr(args, field) for field in PortalSettings._fields})
+
+
+def settings_to_arguments(settings: PortalSettings) -> list[str]:
+    """The command-line options that reproduce ``settings``; the inverse of :func:`settings_from_arguments`."""
+    return [arg for field, value in settings._asdict().items() for arg in (f"--{field.replace('_', '-')}", str(value))]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a mock DuploCloud portal on a local port.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_settings_arguments(parser)
+    args = parser.parse_args(argv)
+    portal = MockPortal(settings_from_arguments(args), args.host, args.port)
+    # The first line is read by bench.harness to find the port.
+    print(f"DUPLO_HOST={portal.url}", flush=True)
+    try:
+        portal._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        portal._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
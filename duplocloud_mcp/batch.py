@@ -0,0 +1,105 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from duplocloud_mcp.config import env_float, env_int
+from duplocloud_mcp.errors import error_detail
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 60.0
+MAX_CONCURRENCY = 32
+
+# How often the batch loop wakes up to check per-item deadlines while items are still queued.
+_POLL_INTERVAL = 0.1
+
+
+def _targets(names: list[str] | None) -> list[str]:
+    targets = list(dict.fromkeys(n.strip() for n in names or [] if n and n.strip()))
+    if not targets:
+        raise ValueError("At least one name is required")
+    return targets
+
+
+def run_batch(
+    names: list[str] | None,
+    func: Callable[[str], Any],
+    concurrency: int | None = None,
+    timeout: float | None = None,
+) -> dict:
+    """Call ``func`` once per name on a private thread pool and collect a per-name result table.
+
+    ``func`` is normally the helper behind a single-item tool, so each item gets the same
+    validation and cache invalidation as a one-off call; exceptions are mapped to the same
+    errors the tool would return. A failing or slow item never stops the others. Items still
+    running after ``timeout`` seconds are reported as timed out with an unknown outcome: the
+    call cannot be cancelled, so its change may still be applied after the batch returns.
+    The pool is private to the batch so that batch items never wait on the worker pool the
+    batch tool itself is running on.
+    """
+    targets = _targets(names)
+    if concurrency is None:
+        concurrency = env_int("DUPLO_BATCH_CONCURRENCY", DEFAULT_CONCURRENCY)
+    if timeout is None:
+        timeout = env_float("DUPLO_BATCH_TIMEOUT", DEFAULT_TIMEOUT)
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if timeout <= 0:
+        raise ValueError("timeout must be greater than 0")
+    concurrency = min(concurrency, MAX_CONCURRENCY, len(targets))
+
+    started: dict[int, float] = {}
+    rows: list[dict | None] = [None] * len(targets)
+
+    def call(i: int, context: contextvars.Context):
+        started[i] = time.monotonic()
+        return context.run(func, targets[i])
+
+    begun = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="duplo-batch")
+    try:
+        futures: dict[Future, int] = {
+            executor.submit(call, i, contextvars.copy_context()): i for i in range(len(targets))
+        }
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[futures[f]] + timeout - now for f in pending if futures[f] in started]
+            wake = min(deadlines, default=_POLL_INTERVAL)
+            if len(deadlines) < len(pending):
+                wake = min(wake, _POLL_INTERVAL)
+            done, pending = wait(pending, timeout=max(wake, 0), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                i = futures[future]
+                elapsed = now - started.get(i, now)
+                rows[i] = {"target": targets[i], "elapsed_ms": round(elapsed * 1000, 1)}
+                try:
+                    rows[i].update(status="ok", result=future.result())
+                except Exception as e:
+                    rows[i].update(status="error", **error_detail(e, f"batch item {targets[i]}"))
+            for future in list(pending):
+                i = futures[future]
+                if i in started and now - started[i] >= timeout:
+                    logger.warning("Batch item %s timed out after %ss", targets[i], timeout)
+                    rows[i] = {
+                        "target": targets[i],
+                        "status": "timeout",
+                        "detail": f"No result after {timeout}s; outcome unknown, the change may still be applied",
+                        "elapsed_ms": round((now - started[i]) * 1000, 1),
+                    }
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {
+        "total": len(rows),
+        "succeeded": sum(1 for row in rows if row["status"] == "ok"),
+        "failed": sum(1 for row in rows if row["status"] == "error"),
+        "timed_out": sum(1 for row in rows if row["status"] == "timeout"),
+        "elapsed_ms": round((time.monotonic() - begun) * 1000, 1),
+        "results": rows,
+    }
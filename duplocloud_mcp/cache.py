@@ -0,0 +1,391 @@
+import contextlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from duplocloud_mcp.config import env_float, env_int
+from duplocloud_mcp.encoding import dumps
+from duplocloud_mcp.metrics import count
+from duplocloud_mcp.persist import get_persistent_store
+from duplocloud_mcp.singleflight import get_flight
+from duplocloud_mcp.tracing import span
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_MB = 64
+
+# Seconds a read stays fresh, per SDK resource kind. Tenants rarely change; services and
+# ECS tasks churn with every deploy.
+RESOURCE_TTLS = {
+    "tenant": 300.0,
+    "service": 15.0,
+    "ecs": 15.0,
+    "hosts": 30.0,
+    "rds": 60.0,
+    "s3": 60.0,
+}
+
+# Record fields that hold the name a ``*_get`` tool looks a resource up by.
+NAME_FIELDS = {
+    "tenant": ("AccountName",),
+    "service": ("Name",),
+    "hosts": ("FriendlyName",),
+    "rds": ("Identifier",),
+    "s3": ("Name",),
+}
+
+PORTAL = ""
+
+_cache: "ResponseCache | None" = None
+_index: "NameIndex | None" = None
+_lock = threading.Lock()
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expires: float
+    size: int
+
+
+class ResponseCache:
+    """In-process LRU cache of SDK read results with per-resource TTLs and a memory cap.
+
+    Keys are ``(tenant, resource, op, args)`` tuples. Cached values are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        default_ttl: float = DEFAULT_TTL,
+        ttls: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._clock = clock
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._generations: dict[tuple[str, str | None], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, resource: str) -> float:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """Return ``(True, value)`` for a fresh entry, otherwise ``(False, None)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def generation(self, tenant: str, resource: str) -> tuple[int, int]:
+        """Return a token that changes whenever the tenant's entries for ``resource`` are invalidated."""
+        with self._lock:
+            return self._generation(tenant, resource)
+
+    def _generation(self, tenant: str, resource: str) -> tuple[int, int]:
+        return self._generations.get((tenant, None), 0), self._generations.get((tenant, resource), 0)
+
+    def set(self, key: tuple, value: Any, generation: tuple[int, int] | None = None, ttl: float | None = None) -> bool:
+        """Store a value for ``ttl`` seconds (default: the resource's TTL) and return whether it was stored.
+
+        When ``generation`` is given, the value is skipped if the resource was invalidated since.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key[1])
+        if ttl <= 0:
+            return False
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug("Not caching %s: %d bytes exceeds the cache memory cap", key, size)
+            return False
+        with self._lock:
+            if generation is not None and self._generation(key[0], key[1]) != generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, self._clock() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, tenant: str, resource: str | None = None) -> int:
+        """Drop every entry for a tenant, or only those for one resource kind. Returns the count."""
+        with self._lock:
+            self._generations[(tenant, resource)] = self._generations.get((tenant, resource), 0) + 1
+            stale = [k for k in self._entries if k[0] == tenant and (resource is None or k[1] == resource)]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+class NameIndex:
+    """Per-tenant name to record lookup built from the most recent list response of each resource.
+
+    A table is only trusted for the TTL of its resource; writes remove the names they touch so a
+    later get falls through to the portal for exactly those records.
+    """
+
+    def __init__(self, ttl_for: Callable[[str], float], clock: Callable[[], float] = time.monotonic):
+        self._ttl_for = ttl_for
+        self._clock = clock
+        self._tables: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def rebuild(self, tenant: str, resource: str, records: Any, current: Callable[[], bool] | None = None) -> None:
+        """Replace the table from a list response, unless ``current()`` says a write has made it stale.
+
+        ``current`` is checked under the index lock, so a write that invalidates after the check still
+        discards its names from the new table.
+        """
+        fields = NAME_FIELDS.get(resource)
+        if not fields or not isinstance(records, list):
+            return
+        table = {}
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            for field in fields:
+                name = record.get(field)
+                if isinstance(name, str) and name:
+                    table[name] = record
+        with self._lock:
+            if current is None or current():
+                self._tables[(tenant, resource)] = (self._clock(), table)
+
+    def lookup(self, tenant: str, resource: str, name: str) -> Any | None:
+        with self._lock:
+            entry = self._tables.get((tenant, resource))
+            if entry is not None and self._clock() - entry[0] >= self._ttl_for(resource):
+                del self._tables[(tenant, resource)]
+                entry = None
+            record = entry[1].get(name) if entry is not None else None
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return record
+
+    def discard(self, tenant: str, resource: str, name: str | None = None) -> None:
+        """Forget one name, or the whole table for the resource when no name is given."""
+        with self._lock:
+            if name is None:
+                self._tables.pop((tenant, resource), None)
+                return
+            entry = self._tables.get((tenant, resource))
+            if entry is not None:
+                entry[1].pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tables": len(self._tables),
+                "names": sum(len(t) for _, t in self._tables.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a response by its JSON-encoded length."""
+    try:
+        return len(dumps(value))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def _build_cache() -> ResponseCache:
+    default_ttl = env_float("DUPLO_CACHE_TTL", DEFAULT_TTL)
+    ttls = {resource: env_float(f"DUPLO_CACHE_TTL_{resource.upper()}", ttl) for resource, ttl in RESOURCE_TTLS.items()}
+    return ResponseCache(
+        max_entries=env_int("DUPLO_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+        max_bytes=int(env_float("DUPLO_CACHE_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024),
+        default_ttl=default_ttl,
+        ttls=ttls,
+    )
+
+
+def get_cache() -> ResponseCache:
+    """Return the shared response cache, configured from environment variables on first use."""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = _build_cache()
+    return _cache
+
+
+def get_index() -> NameIndex:
+    """Return the shared name index, whose tables expire with the cache TTL of their resource."""
+    global _index
+    if _index is None:
+        cache = get_cache()
+        with _lock:
+            if _index is None:
+                _index = NameIndex(cache.ttl_for)
+    return _index
+
+
+def reset_cache() -> None:
+    """Discard the shared response cache and name index. Used in testing."""
+    global _cache, _index
+    with _lock:
+        _cache = None
+        _index = None
+
+
+def cache_key(tenant: str, resource: str, op: str, args: tuple = ()) -> tuple:
+    return (tenant.strip(), resource, op, tuple(args))
+
+
+def cached_read(
+    tenant: str,
+    resource: str,
+    op: str,
+    args: tuple,
+    fetch: Callable[[], Any],
+    fresh: bool = False,
+    restored: Callable[[Any], None] | None = None,
+):
+    """Return a cached read result, calling ``fetch`` on a miss or when ``fresh`` is set.
+
+    A memory miss is looked up in the persistent store (when configured) before ``fetch`` runs;
+    ``restored`` is called with a value found there. Concurrent misses for the same key share one
+    lookup and one ``fetch`` call instead of each hitting the portal. Fresh reads only share calls
+    with other fresh reads, so they never receive a value restored from the persistent store.
+    """
+    key = cache_key(tenant, resource, op, args)
+    cache = get_cache()
+    with span("cache.read", **{"duplo.tenant": key[0], "duplo.resource": resource, "cache.op": op}) as read_span:
+        if not fresh:
+            hit, value = cache.get(key)
+            count("cache_lookups", layer="memory", result="hit" if hit else "miss")
+            if hit:
+                read_span.set("cache.result", "hit")
+                return value
+
+        generation = cache.generation(key[0], resource)
+        store = get_persistent_store()
+
+        def fetch_and_store():
+            if store is not None and not fresh:
+                hit, value, ttl_left = store.get(key)
+                count("cache_lookups", layer="persistent", result="hit" if hit else "miss")
+                if hit:
+                    read_span.set("cache.result", "persistent")
+                    if restored is not None:
+                        restored(value)
+                    cache.set(key, value, generation, ttl=min(ttl_left, cache.ttl_for(resource)))
+                    return value
+            read_span.set("cache.result", "fresh" if fresh else "miss")
+            value = fetch()
+            if cache.set(key, value, generation) and store is not None:
+                store.put(key, value, cache.ttl_for(resource))
+            return value
+
+        read_span.set("cache.result", "coalesced")
+        return get_flight().do((*key, fresh), fetch_and_store)
+
+
+def indexed_list(tenant: str, resource: str, fetch: Callable[[], Any], fresh: bool = False):
+    """Cached ``list`` read that rebuilds the resource's name index whenever it hits the portal or the store."""
+    tenant = tenant.strip()
+    cache = get_cache()
+    # A listing fetched before a write must not repopulate the index the write just cleared.
+    generation = cache.generation(tenant, resource)
+
+    def rebuild(records):
+        get_index().rebuild(tenant, resource, records, lambda: cache.generation(tenant, resource) == generation)
+
+    def fetch_and_index():
+        records = fetch()
+        rebuild(records)
+        return records
+
+    return cached_read(tenant, resource, "list", (), fetch_and_index, fresh=fresh, restored=rebuild)
+
+
+def indexed_get(tenant: str, resource: str, name: str, find: Callable[[], Any], fresh: bool = False):
+    """Look a record up in the name index, falling back to a cached ``find`` call on the portal.
+
+    Records served from the index are the entries of the last list response.
+    """
+    if not fresh:
+        record = get_index().lookup(tenant.strip(), resource, name)
+        count("cache_lookups", layer="index", result="miss" if record is None else "hit")
+        if record is not None:
+            return record
+    return cached_read(tenant, resource, "get", (name,), find, fresh=fresh)
+
+
+def invalidate(tenant: str, resource: str, name: str | None = None) -> None:
+    """Drop cached reads for a tenant's resource from memory, the name index and the persistent store.
+
+    When ``name`` is given only that record leaves the name index; otherwise the whole table goes.
+    """
+    tenant = tenant.strip()
+    get_cache().invalidate(tenant, resource)
+    get_index().discard(tenant, resource, name)
+    get_flight().forget(tenant, resource)
+    store = get_persistent_store()
+    if store is not None:
+        store.invalidate(tenant, resource)
+
+
+@contextlib.contextmanager
+def invalidating(tenant: str, resource: str, name: str | None = None):
+    """Invalidate cached reads for a tenant's resource once the wrapped write finishes, even if it fails."""
+    try:
+        yield
+    finally:
+        invalidate(tenant, resource, name)
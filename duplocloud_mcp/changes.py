@@ -0,0 +1,228 @@
+import base64
+import binascii
+import bisect
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from duplocloud_mcp.cache import NAME_FIELDS
+from duplocloud_mcp.config import env_int
+from duplocloud_mcp.encoding import dumps
+from duplocloud_mcp.projection import project
+
+DEFAULT_MAX_FEEDS = 256
+DEFAULT_MAX_LOG = 10000
+
+_tracker: "ChangeTracker | None" = None
+_lock = threading.Lock()
+
+
+class _Record(NamedTuple):
+    digest: bytes
+    record: Any
+    added: int
+
+
+def _digest(record: Any) -> bytes:
+    return hashlib.blake2b(dumps(record).encode(), digest_size=16).digest()
+
+
+def record_etag(record: Any) -> str:
+    """Return an opaque tag that changes whenever any field of the record does."""
+    return _digest(record).hex()
+
+
+def _record_name(record: Any, fields: tuple[str, ...]) -> str | None:
+    if isinstance(record, dict):
+        for field in fields:
+            name = record.get(field)
+            if isinstance(name, str) and name:
+                return name
+    return None
+
+
+class ChangeFeed:
+    """Fingerprinted snapshot of one tenant's listing of a resource, plus a log of the names changed per version.
+
+    The version goes up by one each time a listing differs from the previous one. The log only holds
+    names, so answering "what changed since version N" costs the number of changes, not the listing size.
+    """
+
+    def __init__(self, name_fields: tuple[str, ...], max_log: int = DEFAULT_MAX_LOG):
+        self.epoch = secrets.token_urlsafe(6)
+        self.version = 0
+        self.floor = 0
+        self._name_fields = name_fields
+        self._max_log = max_log
+        self._records: dict[str, _Record] = {}
+        self._removed: dict[str, tuple[int, int]] = {}
+        self._log_versions: list[int] = []
+        self._log_names: list[str] = []
+        self._source: Any = None
+        self._lock = threading.Lock()
+
+    def apply(self, records: list) -> None:
+        """Diff a listing against the snapshot by per-record hash and log the names that changed."""
+        with self._lock:
+            # Cached listings are shared objects: the same list again means nothing changed.
+            if records is self._source:
+                return
+            version = self.version + 1
+            current: dict[str, _Record] = {}
+            changed: list[str] = []
+            for record in records:
+                name = _record_name(record, self._name_fields)
+                if name is None or name in current:
+                    continue
+                digest = _digest(record)
+                previous = self._records.get(name)
+                if previous is None:
+                    current[name] = _Record(digest, record, version)
+                    changed.append(name)
+                else:
+                    current[name] = _Record(digest, record, previous.added)
+                    if previous.digest != digest:
+                        changed.append(name)
+            removed = {name: entry.added for name, entry in self._records.items() if name not in current}
+            self._records = current
+            self._source = records
+            if not changed and not removed:
+                return
+            self.version = version
+            for name in changed:
+                self._removed.pop(name, None)
+            for name, added in removed.items():
+                self._removed[name] = (added, version)
+            self._log_names.extend(changed)
+            self._log_names.extend(removed)
+            self._log_versions.extend([version] * (len(changed) + len(removed)))
+            self._trim()
+
+    def _trim(self) -> None:
+        excess = len(self._log_names) - self._max_log
+        if excess <= 0:
+            return
+        # Cut at a version boundary so every version after the floor is complete.
+        cut = bisect.bisect_right(self._log_versions, self._log_versions[excess - 1])
+        self.floor = self._log_versions[cut - 1]
+        del self._log_versions[:cut]
+        del self._log_names[:cut]
+        self._removed = {name: entry for name, entry in self._removed.items() if entry[1] > self.floor}
+
+    def since(self, version: int | None) -> dict:
+        """Return the records added and modified, and the names removed, after ``version``.
+
+        When ``version`` is missing or older than the log, every record is returned as added with
+        ``full`` set, and the caller should replace its copy.
+        """
+        with self._lock:
+            if version is None or not self.floor <= version <= self.version:
+                return {
+                    "version": self.version,
+                    "full": True,
+                    "added": [entry.record for entry in self._records.values()],
+                    "modified": [],
+                    "removed": [],
+                }
+            start = bisect.bisect_right(self._log_versions, version)
+            added, modified, removed = [], [], []
+            for name in dict.fromkeys(self._log_names[start:]):
+                entry = self._records.get(name)
+                if entry is not None:
+                    (added if entry.added > version else modified).append(entry.record)
+                elif self._removed[name][0] <= version:
+                    removed.append(name)
+            return {"version": self.version, "full": False, "added": added, "modified": modified, "removed": removed}
+
+    def name(self, record: Any) -> str | None:
+        """Return the name a record is tracked under, or None when it has none."""
+        return _record_name(record, self._name_fields)
+
+    def log_size(self) -> int:
+        with self._lock:
+            return len(self._log_names)
+
+
+def encode_version(epoch: str, version: int) -> str:
+    return base64.urlsafe_b64encode(f"{epoch}:{version}".encode()).decode()
+
+
+def decode_version(token: str) -> tuple[str, int]:
+    try:
+        epoch, version = base64.urlsafe_b64decode(token.strip().encode()).decode().rsplit(":", 1)
+        version = int(version)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid version token") from None
+    if version < 0:
+        raise ValueError("Invalid version token")
+    return epoch, version
+
+
+class ChangeTracker:
+    """Change feeds per (tenant, resource), least recently used first out once ``max_feeds`` is reached."""
+
+    def __init__(self, max_feeds: int = DEFAULT_MAX_FEEDS, max_log: int = DEFAULT_MAX_LOG):
+        self.max_feeds = max_feeds
+        self.max_log = max_log
+        self._feeds: OrderedDict[tuple[str, str], ChangeFeed] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def feed(self, tenant: str, resource: str, name_fields: tuple[str, ...] | None = None) -> ChangeFeed:
+        """Return the feed for a tenant's resource; ``name_fields`` defaults to the resource's cache name fields."""
+        key = (tenant, resource)
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = ChangeFeed(name_fields or NAME_FIELDS[resource], self.max_log)
+                while len(self._feeds) > self.max_feeds:
+                    self._feeds.popitem(last=False)
+            else:
+                self._feeds.move_to_end(key)
+            return feed
+
+    def stats(self) -> dict:
+        with self._lock:
+            feeds = list(self._feeds.values())
+        return {"feeds": len(feeds), "max_feeds": self.max_feeds, "log_entries": sum(f.log_size() for f in feeds)}
+
+
+def get_tracker() -> ChangeTracker:
+    """Return the shared change tracker, configured from environment variables on first use."""
+    global _tracker
+    if _tracker is None:
+        with _lock:
+            if _tracker is None:
+                _tracker = ChangeTracker(
+                    max_feeds=env_int("DUPLO_CHANGES_MAX_FEEDS", DEFAULT_MAX_FEEDS),
+                    max_log=env_int("DUPLO_CHANGES_MAX_LOG", DEFAULT_MAX_LOG),
+                )
+    return _tracker
+
+
+def reset_tracker() -> None:
+    """Discard the shared change tracker. Used in testing."""
+    global _tracker
+    with _lock:
+        _tracker = None
+
+
+def changes_since(tenant: str, resource: str, records: Any, since: str | None = None, fields: str | None = None):
+    """Fold a fresh listing into the tenant's change feed and return what changed after the ``since`` token.
+
+    A token from another feed, an evicted feed or a restarted server is answered with the full listing.
+    """
+    if not isinstance(records, list):
+        return records
+    epoch, version = decode_version(since) if since else (None, None)
+    feed = get_tracker().feed(tenant.strip(), resource)
+    feed.apply(records)
+    result = feed.since(version if epoch == feed.epoch else None)
+    return {
+        "version": encode_version(feed.epoch, result["version"]),
+        "full": result["full"],
+        "added": project(result["added"], fields),
+        "modified": project(result["modified"], fields),
+        "removed": result["removed"],
+    }
@@ -1,17 +1,151 @@
+import logging
 import os
+import threading
+from urllib.parse import urlparse
 
+import requests
 from duplocloud.client import DuploClient
 from duplocloud.errors import DuploError
 
-_client: DuploClient | None = None
+from duplocloud_mcp.metrics import count
+from duplocloud_mcp.ratelimit import get_limiter
+from duplocloud_mcp.resilience import RETRY_STATUSES, get_breaker, get_retry_policy, is_retryable
+from duplocloud_mcp.tracing import span
+from duplocloud_mcp.transport import build_session, http_settings, session_stats
 
+logger = logging.getLogger("duplocloud-mcp")
+
+_client: "SessionClient | None" = None
+_portal_resources: dict[str, object] = {}
+_tenant_clients: dict[str, "SessionClient"] = {}
+_session: requests.Session | None = None
+_timeout: tuple[float, float] | None = None
+_lock = threading.Lock()
+
+# Hosts the portal may be reached on over plain HTTP, for a stand-in portal on this machine.
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+class SessionClient(DuploClient):
+    """DuploClient that sends its requests through a shared, pooled HTTP session.
+
+    Tenant clients are pinned to one tenant ID at construction and never reassigned, so resources
+    loaded from different tenant clients can be used concurrently without stepping on each other.
+    Resource handles are constructed once per kind and reused for the life of the client.
+    """
+
+    def __init__(self, session: requests.Session, timeout: tuple[float, float] | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.session = session
+        self.base_url = _base_url(kwargs.get("host"), self.host)
+        if timeout is not None:
+            self.timeout = timeout
+        self._resources: dict[str, object] = {}
+        # Reentrant: resource constructors load the resources they depend on (e.g. service -> pod, tenant).
+        self._load_lock = threading.RLock()
+
+    def load(self, kind: str):
+        resource = self._resources.get(kind)
+        if resource is None:
+            with self._load_lock:
+                resource = self._resources.get(kind)
+                if resource is None:
+                    with span("sdk.load", **{"duplo.resource": kind, "duplo.tenant": self.tenantid}):
+                        resource = super().load(kind)
+                    self._resources[kind] = resource
+        return resource
+
+    # The SDK has no hook for a shared session, so requests are sent by _send, which reuses the SDK's private
+    # (name-mangled) __headers and __validate_response to keep auth and error mapping identical. pyproject pins
+    # duplocloud-client to 0.4.x and test_sdk_private_api_present fails if they go away. get() skips the SDK's
+    # 10s TTL cache on purpose: duplocloud_mcp.cache caches reads and drops them on writes.
+    def get(self, path: str):
+        return self._send("GET", path)
+
+    def post(self, path: str, data: dict | None = None):
+        return self._send("POST", path, data or {})
+
+    def put(self, path: str, data: dict | None = None):
+        return self._send("PUT", path, data or {})
+
+    def delete(self, path: str):
+        return self._send("DELETE", path)
+
+    def _send(self, method: str, path: str, data: dict | None = None) -> requests.Response:
+        """Send a request, retrying reads (and idempotent writes) on transient failures.
+
+        Every attempt first waits for a rate-limit token for this tenant, then goes through the
+        circuit breaker for the portal host, so a degraded portal is answered with a fast 503
+        instead of a pile of slow timeouts.
+        """
+        limiter = get_limiter()
+        breaker = get_breaker(self.host)
+        policy = get_retry_policy()
+        retryable = is_retryable(method)
+        attempt = 0
+        while True:
+            attributes = {"http.method": method, "http.route": path, "duplo.tenant": self.tenantid, "retry": attempt}
+            with span(f"http {method}", **attributes) as http_span:
+                waited = limiter.acquire(method, self.tenantid)
+                http_span.set("ratelimit.wait_ms", round(waited * 1000, 3))
+                breaker.before_call()
+                retry_after = None
+                try:
+                    response = self.session.request(
+                        method,
+                        f"{self.base_url}/{path}",
+                        headers=self._DuploClient__headers(),
+                        timeout=self.timeout,
+                        json=data,
+                    )
+                    http_span.set("http.status_code", response.status_code)
+                    http_span.set("http.response_bytes", len(response.content))
+                    if response.status_code >= 400:
+                        http_span.set_error(f"HTTP {response.status_code}")
+                except requests.exceptions.RequestException as e:
+                    http_span.set_error(f"{type(e).__name__}: {e}")
+                    count("upstream_requests", method=method, status="error")
+                    breaker.record_failure()
+                    delay = policy.delay(attempt) if retryable else None
+                    if delay is None:
+                        raise _transport_error(e) from e
+                else:
+                    count("upstream_requests", method=method, status=str(response.status_code))
+                    if response.status_code not in RETRY_STATUSES:
+                        breaker.record_success()
+                        return self._DuploClient__validate_response(response)
+                    if response.status_code == 429:
+                        breaker.record_throttled()
+                    else:
+                        breaker.record_failure()
+                    retry_after = response.headers.get("Retry-After")
+                    delay = policy.delay(attempt, retry_after) if retryable else None
+                    if delay is None:
+                        return self._DuploClient__validate_response(response)
+            attempt += 1
+            logger.info("Retrying %s %s in %.2fs (attempt %d)", method, path, delay, attempt + 1)
+            policy.sleep(delay)
+
+
+def _base_url(configured: str | None, sanitized: str) -> str:
+    """Return the URL requests are sent to. The SDK forces HTTPS; plain HTTP is kept for loopback hosts only."""
+    if configured and configured.startswith("http://"):
+        url = urlparse(configured)
+        if url.hostname in _LOOPBACK_HOSTS:
+            return f"http://{url.netloc}"
+    return sanitized
 
-def get_client() -> DuploClient:
-    """Return a singleton DuploClient, lazily initialized from environment variables."""
-    global _client
-    if _client is not None:
-        return _client
 
+def _transport_error(error: requests.exceptions.RequestException) -> DuploError:
+    if isinstance(error, requests.exceptions.Timeout):
+        return DuploError("Request timed out while connecting to Duplo", 500)
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return DuploError("Failed to establish connection with Duplo", 500)
+    return DuploError("Failed to send request to Duplo", 500)
+
+
+def _credentials() -> tuple[str, str, str | None]:
+    """Read and validate the portal credentials from environment variables."""
     host = os.environ.get("DUPLO_HOST", "").strip()
     token = os.environ.get("DUPLO_TOKEN", "").strip()
     tenant = os.environ.get("DUPLO_TENANT", "").strip() or None
@@ -20,12 +154,78 @@ def get_client() -> DuploClient:
         raise DuploError("DUPLO_HOST environment variable is required", 500)
     if not token:
         raise DuploError("DUPLO_TOKEN environment variable is required", 500)
+    return host, token, tenant
+
 
-    _client = DuploClient.from_creds(host=host, token=token, tenant=tenant)
+def get_client() -> SessionClient:
+    """Return the singleton portal-level client, lazily initialized from environment variables."""
+    global _client
+    if _client is not None:
+        return _client
+
+    host, token, tenant = _credentials()
+    session = get_session()
+    with _lock:
+        if _client is None:
+            _client = SessionClient(session, timeout=_timeout, host=host, token=token, tenant=tenant)
     return _client
 
 
+def get_portal_resource(kind: str):
+    """Return a portal-level resource handle from the singleton client, loading it once."""
+    resource = _portal_resources.get(kind)
+    if resource is None:
+        client = get_client()
+        with _lock:
+            resource = _portal_resources.get(kind)
+            if resource is None:
+                resource = client.load(kind)
+                _portal_resources[kind] = resource
+    return resource
+
+
+def get_session() -> requests.Session:
+    """Return the pooled HTTP session shared by every client, configured from DUPLO_HTTP_* on first use."""
+    global _session, _timeout
+    if _session is None:
+        with _lock:
+            if _session is None:
+                settings = http_settings()
+                _timeout = settings.timeout
+                _session = build_session(settings)
+    return _session
+
+
+def get_http_stats() -> dict:
+    """Return connection pool statistics for the shared session, or an empty dict before first use."""
+    session = _session
+    return session_stats(session) if session is not None else {}
+
+
+def get_tenant_client(tenant_id: str) -> SessionClient:
+    """Return the pooled client for a tenant, creating it on first use."""
+    tenant_id = tenant_id.strip()
+    client = _tenant_clients.get(tenant_id)
+    if client is not None:
+        return client
+
+    host, token, _ = _credentials()
+    session = get_session()
+    with _lock:
+        client = _tenant_clients.get(tenant_id)
+        if client is None:
+            client = SessionClient(session, timeout=_timeout, host=host, token=token, tenant_id=tenant_id)
+            _tenant_clients[tenant_id] = client
+    return client
+
+
 def reset_client() -> None:
-    """Reset the singleton client. Used in testing."""
-    global _client
-    _client = None
+    """Reset the singleton client and the tenant client pool. Used in testing."""
+    global _client, _session
+    with _lock:
+        _client = None
+        _portal_resources.clear()
+        _tenant_clients.clear()
+        if _session is not None:
+            _session.close()
+        _session = None
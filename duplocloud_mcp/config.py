@@ -0,0 +1,20 @@
+import logging
+import os
+
+logger = logging.getLogger("duplocloud-mcp")
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a numeric setting from the environment, falling back to ``default`` when unset or invalid."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r, using %s", name, raw, default)
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    return int(env_float(name, default))
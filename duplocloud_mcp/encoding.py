@@ -0,0 +1,48 @@
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger("duplocloud-mcp")
+
+try:
+    import orjson
+except ImportError:  # optional: pip install 'duplocloud-docker-mcp[fast]'
+    orjson = None
+
+# Let orjson hand datetimes and dataclasses to ``default=str`` like the stdlib encoder does, and
+# accept non-string keys, so both backends produce the same JSON values.
+_ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+)
+
+
+def dumps_stdlib(data: Any) -> str:
+    """Encode with the standard library, using compact separators and raw UTF-8 like orjson."""
+    return json.dumps(data, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_orjson(data: Any) -> str:
+    """Encode with orjson, falling back to the standard library for values orjson rejects (e.g. huge ints)."""
+    try:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS).decode()
+    except orjson.JSONEncodeError:
+        return dumps_stdlib(data)
+
+
+def _select_backend():
+    choice = os.environ.get("DUPLO_JSON_ENCODER", "").strip().lower()
+    if choice == "stdlib":
+        return dumps_stdlib
+    if orjson is None:
+        if choice == "orjson":
+            logger.warning("DUPLO_JSON_ENCODER=orjson but orjson is not installed; using the stdlib encoder")
+        return dumps_stdlib
+    return dumps_orjson
+
+
+dumps = _select_backend()
+
+
+def backend_name() -> str:
+    return "orjson" if dumps is dumps_orjson else "stdlib"
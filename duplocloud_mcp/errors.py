@@ -1,36 +1,65 @@
 import functools
-import json
+import inspect
 import logging
 
 from duplocloud.errors import DuploError
 
+from duplocloud_mcp.encoding import dumps
+from duplocloud_mcp.tracing import span
+
 logger = logging.getLogger("duplocloud-mcp")
 
 
+def _encode(result) -> str:
+    if result is None:
+        return dumps({"status": "success"})
+    if isinstance(result, (dict, list)):
+        with span("serialize") as s:
+            encoded = dumps(result)
+            s.set("payload.bytes", len(encoded))
+        return encoded
+    return str(result)
+
+
+def error_detail(e: Exception, where: str) -> dict:
+    """Map an exception to the structured error a tool returns, logging it; ``where`` names the caller."""
+    if isinstance(e, DuploError):
+        logger.error("DuploCloud API error: %s (code=%s)", e.message, e.code)
+        error_detail = {"error": e.message, "code": e.code}
+        if e.response:
+            error_detail["response"] = str(e.response)
+        return error_detail
+    if isinstance(e, ValueError):
+        logger.error("Validation error: %s", e)
+        return {"error": str(e), "code": 400}
+    logger.exception("Unexpected error in %s", where)
+    return {"error": f"Unexpected error: {e}", "code": 500}
+
+
+def _error(func, e: Exception) -> str:
+    return dumps(error_detail(e, f"tool {func.__name__}"))
+
+
 def handle_duplo_errors(func):
     """Decorator that catches DuploCloud exceptions and returns structured error messages."""
 
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return _encode(await func(*args, **kwargs))
+            except Exception as e:
+                return _error(func, e)
+
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
-            result = func(*args, **kwargs)
-            if result is None:
-                return json.dumps({"status": "success"})
-            if isinstance(result, (dict, list)):
-                return json.dumps(result, default=str)
-            return str(result)
-        except DuploError as e:
-            logger.error("DuploCloud API error: %s (code=%s)", e.message, e.code)
-            error_detail = {"error": e.message, "code": e.code}
-            if e.response:
-                error_detail["response"] = str(e.response)
-            return json.dumps(error_detail)
-        except ValueError as e:
-            logger.error("Validation error: %s", e)
-            return json.dumps({"error": str(e), "code": 400})
+            return _encode(func(*args, **kwargs))
         except Exception as e:
-            logger.exception("Unexpected error in tool %s", func.__name__)
-            return json.dumps({"error": f"Unexpected error: {e}", "code": 500})
+            return _error(func, e)
 
     return wrapper
 
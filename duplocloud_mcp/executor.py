@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from duplocloud_mcp.config import env_int
+
+DEFAULT_WORKERS = 8
+
+_pool: "WorkerPool | None" = None
+_lock = threading.Lock()
+
+
+class WorkerPool:
+    """Bounded thread pool that runs blocking DuploCloud SDK calls off the event loop.
+
+    Tracks how many calls are waiting for a worker, how many are running, and how long
+    calls sat in the queue before a worker picked them up.
+    """
+
+    def __init__(self, max_workers: int):
+        if max_workers < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="duplo-worker")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def run(self, func, *args, **kwargs):
+        """Run ``func`` on a worker thread and await its result."""
+        submitted = time.perf_counter()
+        context = contextvars.copy_context()
+
+        def call():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue depth, activity and queue wait times."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "wait_ms_avg": round(self._wait_total / started * 1000, 3) if started else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_pool() -> WorkerPool:
+    """Return the shared worker pool, sized from DUPLO_MCP_WORKERS on first use."""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = WorkerPool(max(env_int("DUPLO_MCP_WORKERS", DEFAULT_WORKERS), 1))
+    return _pool
+
+
+def reset_pool() -> None:
+    """Shut down and discard the shared worker pool. Used in testing."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+from duplocloud_mcp.cache import invalidate
+from duplocloud_mcp.config import env_float, env_int
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 30.0
+DEFAULT_TIMEOUT = 1800.0
+DEFAULT_TTL = 3600.0
+DEFAULT_MAX_JOBS = 1000
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+# A readiness check returns PENDING, READY or FAILED and a short description of what it saw.
+Check = Callable[[], tuple[str, Any]]
+
+_tracker: "JobTracker | None" = None
+_lock = threading.Lock()
+
+
+class Target:
+    """Polls one resource until it is ready, failed or out of time; shared by every job on that resource.
+
+    The first check runs right away. After that the delay doubles from ``interval`` up to ``max_interval``.
+    A check that raises, e.g. a 404 for a host the portal does not list yet, counts as still pending.
+    """
+
+    def __init__(
+        self,
+        key: tuple[str, str, str, Hashable],
+        check: Check,
+        interval: float,
+        max_interval: float,
+        timeout: float,
+        on_done: Callable[["Target"], None],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.key = key
+        self.state = PENDING
+        self.detail: Any = None
+        self.error: str | None = None
+        self.polls = 0
+        self._check = check
+        self._interval = interval
+        self._max_interval = max(max_interval, interval)
+        self._timeout = timeout
+        self._on_done = on_done
+        self._clock = clock
+        self.started = clock()
+        self.finished: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"duplo-job {key[1]} {key[2]}", daemon=True)
+
+    @property
+    def done(self) -> bool:
+        return self.state != PENDING
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def listen(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unlisten(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _run(self) -> None:
+        delay = self._interval
+        while True:
+            try:
+                state, detail = self._check()
+                error = None
+            except Exception as e:
+                state, detail, error = PENDING, self.detail, str(e)
+            if state == PENDING and self._clock() - self.started >= self._timeout:
+                state = TIMED_OUT
+            self._update(state, detail, error)
+            if state != PENDING or self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self._max_interval)
+        try:
+            self._on_done(self)
+        except Exception:
+            logger.exception("Finishing job poll for %s failed", self.key)
+
+    def _update(self, state: str, detail: Any, error: str | None) -> None:
+        with self._lock:
+            self.polls += 1
+            self.state, self.detail, self.error = state, detail, error
+            if state != PENDING:
+                self.finished = self._clock()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def elapsed(self) -> float:
+        return round((self.finished or self._clock()) - self.started, 3)
+
+
+class Job(NamedTuple):
+    id: str
+    tool: str
+    target: Target
+
+
+class JobTracker:
+    """Jobs started by provisioning tools, and the shared poll loops behind them."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+        ttl: float = DEFAULT_TTL,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._clock = clock
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._targets: dict[tuple[str, str, str, Hashable], Target] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.shared = 0
+
+    def start(self, tool: str, tenant: str, resource: str, name: str, check: Check, variant: Hashable = None) -> str:
+        """Start a job that waits for ``check`` to report the resource ready; returns its job ID.
+
+        A job joins the poll loop of another job on the same resource instead of starting one, but only
+        when their ``variant`` is equal too. The variant holds whatever makes one call's check differ from
+        another's, e.g. the pods that were running before a restart, so a job never waits on another's check.
+        """
+        key = (tenant.strip(), resource, name, variant)
+        with self._lock:
+            target = self._targets.get(key)
+            if target is None or target.done:
+                target = self._targets[key] = Target(
+                    key, check, self.interval, self.max_interval, self.timeout, self._finished, self._clock
+                )
+                target.start()
+            else:
+                self.shared += 1
+            job = Job(f"job-{secrets.token_hex(6)}", tool, target)
+            self._jobs[job.id] = job
+            self.started += 1
+            self._prune()
+        return job.id
+
+    def _finished(self, target: Target) -> None:
+        with self._lock:
+            if self._targets.get(target.key) is target:
+                del self._targets[target.key]
+        tenant, resource, name, _ = target.key
+        invalidate(tenant, resource, name or None)
+
+    def _prune(self) -> None:
+        now = self._clock()
+        for job_id, job in list(self._jobs.items()):
+            finished = job.target.finished
+            if finished is not None and now - finished >= self.ttl:
+                del self._jobs[job_id]
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            for job_id in [i for i, job in self._jobs.items() if job.target.done][:excess]:
+                del self._jobs[job_id]
+
+    def _job(self, job_id: str) -> Job:
+        with self._lock:
+            job = self._jobs.get(job_id.strip())
+        if job is None:
+            raise ValueError(f"Unknown or expired job: {job_id}")
+        return job
+
+    def status(self, job_id: str) -> dict:
+        job = self._job(job_id)
+        target = job.target
+        tenant, resource, name, _ = target.key
+        return {
+            "job_id": job.id,
+            "tool": job.tool,
+            "tenant_id": tenant,
+            "resource": resource,
+            "name": name,
+            "state": target.state,
+            "done": target.done,
+            "detail": target.detail,
+            "error": target.error,
+            "polls": target.polls,
+            "elapsed_s": target.elapsed(),
+        }
+
+    async def wait(
+        self, job_id: str, timeout: float, progress: Callable[[dict], Awaitable[None]] | None = None
+    ) -> dict:
+        """Wait up to ``timeout`` seconds for a job to finish, calling ``progress`` after every poll.
+
+        Returns the job status, which is still pending if the timeout ran out first.
+        """
+        target = self._job(job_id).target
+        loop = asyncio.get_running_loop()
+        polled = asyncio.Event()
+
+        def listener():
+            try:
+                loop.call_soon_threadsafe(polled.set)
+            except RuntimeError:
+                pass
+
+        target.listen(listener)
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    status = self.status(job_id)
+                    if status["done"]:
+                        return status
+                    if progress is not None:
+                        await progress(status)
+                    await polled.wait()
+                    polled.clear()
+        except TimeoutError:
+            return self.status(job_id)
+        finally:
+            target.unlisten(listener)
+
+    def stop(self) -> None:
+        with self._lock:
+            for target in self._targets.values():
+                target.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "polling": len(self._targets),
+                "started": self.started,
+                "shared_polls": self.shared,
+            }
+
+
+def get_jobs() -> JobTracker:
+    """Return the shared job tracker, configured from environment variables on first use."""
+    global _tracker
+    if _tracker is None:
+        with _lock:
+            if _tracker is None:
+                _tracker = JobTracker(
+                    interval=env_float("DUPLO_JOB_POLL_INTERVAL", DEFAULT_INTERVAL),
+                    max_interval=env_float("DUPLO_JOB_POLL_MAX_INTERVAL", DEFAULT_MAX_INTERVAL),
+                    timeout=env_float("DUPLO_JOB_TIMEOUT", DEFAULT_TIMEOUT),
+                    ttl=env_float("DUPLO_JOB_TTL", DEFAULT_TTL),
+                    max_jobs=env_int("DUPLO_JOB_MAX", DEFAULT_MAX_JOBS),
+                )
+    return _tracker
+
+
+def reset_jobs() -> None:
+    """Stop every poll loop and discard the shared job tracker. Used in testing."""
+    global _tracker
+    with _lock:
+        if _tracker is not None:
+            _tracker.stop()
+        _tracker = None
+
+
+def start_job(
+    result: Any, tool: str, tenant: str, resource: str, name: str, check: Check, variant: Hashable = None
+) -> dict:
+    """Wrap a provisioning tool's result with the ID of a job that waits for the resource to be ready."""
+    return {"job_id": get_jobs().start(tool, tenant, resource, name, check, variant), "result": result}
@@ -0,0 +1,50 @@
+import contextlib
+import contextvars
+import threading
+
+from mcp.types import CallToolResult, TextContent
+
+# Response metadata collected while one tool call runs. The dict is shared with the worker
+# threads the call fans out to, because they run in copies of the caller's context.
+_call_meta: contextvars.ContextVar[dict | None] = contextvars.ContextVar("duplo_call_meta", default=None)
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def collecting_meta():
+    """Collect response metadata for the tool call running in this context."""
+    meta: dict = {}
+    token = _call_meta.set(meta)
+    try:
+        yield meta
+    finally:
+        _call_meta.reset(token)
+
+
+def add_to_meta(key: str, amount: float) -> None:
+    """Add ``amount`` to a numeric metadata value of the current tool call, if one is collecting."""
+    meta = _call_meta.get()
+    if meta is None:
+        return
+    with _lock:
+        meta[key] = round(meta.get(key, 0) + amount, 3)
+
+
+def set_meta(key: str, value) -> None:
+    """Set a metadata value of the current tool call, if one is collecting."""
+    meta = _call_meta.get()
+    if meta is None:
+        return
+    with _lock:
+        meta[key] = value
+
+
+def with_meta(result: str, meta: dict):
+    """Return a tool result carrying ``meta`` as MCP ``_meta``, or the plain result when there is none."""
+    if not meta:
+        return result
+    return CallToolResult(
+        content=[TextContent(type="text", text=result)],
+        structuredContent={"result": result},
+        _meta=meta,
+    )
@@ -0,0 +1,227 @@
+import bisect
+import contextlib
+import contextvars
+import json
+import threading
+import time
+
+# Histogram bucket upper bounds: tool latency in seconds and result size in bytes.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# HELP text for the counters raised with count(); others get a generic one.
+COUNTER_HELP = {
+    "cache_lookups": "Response cache lookups by layer (memory, index, persistent) and result.",
+    "upstream_requests": "Portal HTTP requests by method and status.",
+}
+
+# Counters raised while one tool call runs, keyed by ``(name, labels)``. Like the response
+# metadata, the dict is shared with the worker threads the call fans out to.
+_call_counts: contextvars.ContextVar[dict | None] = contextvars.ContextVar("duplo_call_counts", default=None)
+_count_lock = threading.Lock()
+
+_metrics: "ToolMetrics | None" = None
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return ``(le, count)`` pairs, ending with ``+Inf``."""
+        pairs, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append(("+Inf" if bound == float("inf") else _number(bound), running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket, like ``histogram_quantile``."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        running = 0
+        for i, count in enumerate(self.counts):
+            if running + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - running) / count
+            running += count
+        return self.buckets[-1]
+
+
+def count(name: str, amount: int = 1, **labels: str) -> None:
+    """Add to a counter of the tool call running in this context; a no-op outside tool calls."""
+    counts = _call_counts.get()
+    if counts is None:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _count_lock:
+        counts[key] = counts.get(key, 0) + amount
+
+
+class ToolMetrics:
+    """Per-tool call metrics: outcomes, error codes, latency and result size histograms.
+
+    Also keeps per-tool totals of the counters raised with :func:`count` during each call,
+    such as cache lookups and portal requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: dict[tuple[str, str], int] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+        self.latency: dict[str, Histogram] = {}
+        self.sizes: dict[str, Histogram] = {}
+        self.counters: dict[tuple[str, str, tuple], int] = {}
+
+    @contextlib.contextmanager
+    def observing(self, tool: str):
+        """Measure one tool call. Set ``result`` on the yielded dict to record its size and error code."""
+        counts: dict = {}
+        call: dict = {"result": None}
+        token = _call_counts.set(counts)
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call["exception"] = True
+            raise
+        finally:
+            _call_counts.reset(token)
+            self._record(tool, time.perf_counter() - start, call, counts)
+
+    def _record(self, tool: str, elapsed: float, call: dict, counts: dict) -> None:
+        result = call["result"]
+        if call.get("exception"):
+            outcome, code = "exception", "500"
+        else:
+            code = error_code(result)
+            outcome = "ok" if code is None else "error"
+        size = len(result.encode()) if isinstance(result, str) else None
+        with self._lock:
+            self.calls[(tool, outcome)] = self.calls.get((tool, outcome), 0) + 1
+            if code is not None:
+                self.errors[(tool, code)] = self.errors.get((tool, code), 0) + 1
+            self.latency.setdefault(tool, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            if size is not None:
+                self.sizes.setdefault(tool, Histogram(SIZE_BUCKETS)).observe(size)
+            with _count_lock:
+                items = list(counts.items())
+            for (name, labels), amount in items:
+                key = (tool, name, labels)
+                self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        """Per-tool summary: calls by outcome, error codes, latency percentiles, result sizes and counters."""
+        with self._lock:
+            tools: dict[str, dict] = {}
+            for tool, hist in sorted(self.latency.items()):
+                sizes = self.sizes.get(tool)
+                tools[tool] = {
+                    "calls": {o: n for (t, o), n in self.calls.items() if t == tool},
+                    "errors": {c: n for (t, c), n in self.errors.items() if t == tool},
+                    "latency_ms": {
+                        "avg": round(hist.sum / hist.count * 1000, 3),
+                        "p50": round(hist.quantile(0.5) * 1000, 3),
+                        "p95": round(hist.quantile(0.95) * 1000, 3),
+                        "p99": round(hist.quantile(0.99) * 1000, 3),
+                    },
+                    "result_bytes": {
+                        "avg": round(sizes.sum / sizes.count) if sizes and sizes.count else 0,
+                        "p95": round(sizes.quantile(0.95)) if sizes else 0,
+                    },
+                    "counters": {},
+                }
+            for (tool, name, labels), amount in sorted(self.counters.items()):
+                label = ",".join(f"{k}={v}" for k, v in labels)
+                tools[tool]["counters"][f"{name}{{{label}}}" if label else name] = amount
+            return tools
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        with self._lock:
+            _family(lines, "duplo_mcp_tool_calls_total", "counter", "Tool calls by outcome (ok, error, exception).")
+            for (tool, outcome), n in sorted(self.calls.items()):
+                lines.append(f"duplo_mcp_tool_calls_total{_labels(tool=tool, outcome=outcome)} {n}")
+            _family(lines, "duplo_mcp_tool_errors_total", "counter", "Tool calls that returned an error, by code.")
+            for (tool, code), n in sorted(self.errors.items()):
+                lines.append(f"duplo_mcp_tool_errors_total{_labels(tool=tool, code=code)} {n}")
+            _histograms(lines, "duplo_mcp_tool_duration_seconds", "Tool call latency.", self.latency)
+            _histograms(lines, "duplo_mcp_tool_result_bytes", "Tool result size.", self.sizes)
+            families: dict[str, list[str]] = {}
+            for (tool, name, labels), amount in sorted(self.counters.items()):
+                metric = f"duplo_mcp_{name}_total"
+                families.setdefault(metric, []).append(f"{metric}{_labels(tool=tool, **dict(labels))} {amount}")
+            for metric, samples in families.items():
+                name = metric[len("duplo_mcp_") : -len("_total")]
+                _family(lines, metric, "counter", COUNTER_HELP.get(name, f"{name} per tool."))
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histograms(lines: list[str], name: str, help_text: str, histograms: dict[str, Histogram]) -> None:
+    _family(lines, name, "histogram", help_text)
+    for tool, hist in sorted(histograms.items()):
+        for le, n in hist.cumulative():
+            lines.append(f"{name}_bucket{_labels(tool=tool, le=le)} {n}")
+        lines.append(f"{name}_sum{_labels(tool=tool)} {_number(hist.sum)}")
+        lines.append(f"{name}_count{_labels(tool=tool)} {hist.count}")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def error_code(result) -> str | None:
+    """Return the code of an error result produced by ``handle_duplo_errors``, or None."""
+    if not isinstance(result, str) or not result.startswith('{"error":'):
+        return None
+    try:
+        code = json.loads(result).get("code")
+    except ValueError:
+        return None
+    return str(code) if code is not None else "unknown"
+
+
+def get_metrics() -> ToolMetrics:
+    """Return the shared tool metrics."""
+    global _metrics
+    if _metrics is None:
+        with _lock:
+            if _metrics is None:
+                _metrics = ToolMetrics()
+    return _metrics
+
+
+def reset_metrics() -> None:
+    """Discard the shared tool metrics. Used in testing."""
+    global _metrics
+    with _lock:
+        _metrics = None
@@ -0,0 +1,131 @@
+import base64
+import binascii
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from duplocloud_mcp.config import env_float, env_int
+from duplocloud_mcp.projection import project
+
+DEFAULT_SNAPSHOT_TTL = 300.0
+DEFAULT_MAX_SNAPSHOTS = 64
+
+_store: "SnapshotStore | None" = None
+_lock = threading.Lock()
+
+
+class Snapshot(NamedTuple):
+    key: tuple
+    items: list
+    expires: float
+
+
+class SnapshotStore:
+    """Keeps the full result of a paginated listing in memory so later pages are sliced, not refetched."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_SNAPSHOT_TTL,
+        max_snapshots: int = DEFAULT_MAX_SNAPSHOTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_snapshots = max_snapshots
+        self._clock = clock
+        self._snapshots: OrderedDict[str, Snapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: tuple, items: list) -> str:
+        snapshot_id = secrets.token_urlsafe(8)
+        with self._lock:
+            self._snapshots[snapshot_id] = Snapshot(key, items, self._clock() + self.ttl)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get(self, snapshot_id: str) -> Snapshot | None:
+        with self._lock:
+            snapshot = self._snapshots.get(snapshot_id)
+            if snapshot is not None and snapshot.expires <= self._clock():
+                del self._snapshots[snapshot_id]
+                return None
+            return snapshot
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"snapshots": len(self._snapshots), "max_snapshots": self.max_snapshots}
+
+
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        snapshot_id, offset = base64.urlsafe_b64decode(cursor.strip().encode()).decode().rsplit(":", 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return snapshot_id, offset
+
+
+def get_store() -> SnapshotStore:
+    """Return the shared snapshot store, configured from environment variables on first use."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = SnapshotStore(
+                    ttl=env_float("DUPLO_PAGE_TTL", DEFAULT_SNAPSHOT_TTL),
+                    max_snapshots=env_int("DUPLO_PAGE_MAX_SNAPSHOTS", DEFAULT_MAX_SNAPSHOTS),
+                )
+    return _store
+
+
+def reset_store() -> None:
+    """Discard the shared snapshot store. Used in testing."""
+    global _store
+    with _lock:
+        _store = None
+
+
+def paginate(
+    key: tuple,
+    fetch: Callable[[], Any],
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Any:
+    """Return one page of a listing, or the whole (projected) listing when neither limit nor cursor is given.
+
+    The first page stores the full list as a snapshot; the returned ``next_cursor`` points into that
+    snapshot, so following pages come from memory and are consistent with the first one.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    if cursor:
+        snapshot_id, offset = decode_cursor(cursor)
+        snapshot = get_store().get(snapshot_id)
+        if snapshot is None:
+            raise ValueError("Cursor has expired; restart the listing without a cursor")
+        if snapshot.key != key:
+            raise ValueError("Cursor belongs to a different listing")
+        items = snapshot.items
+    else:
+        items = fetch()
+        if limit is None or not isinstance(items, list):
+            return project(items, fields)
+        snapshot_id, offset = get_store().put(key, items), 0
+
+    limit = limit or len(items)
+    end = offset + limit
+    return {
+        "items": project(items[offset:end], fields),
+        "next_cursor": encode_cursor(snapshot_id, end) if end < len(items) else None,
+        "total": len(items),
+    }
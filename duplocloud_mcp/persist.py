@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from duplocloud_mcp.config import env_float
+from duplocloud_mcp.encoding import dumps
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_MAX_MB = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+CREATE INDEX IF NOT EXISTS responses_resource ON responses (scope, tenant, resource);
+CREATE INDEX IF NOT EXISTS responses_stored ON responses (stored);
+"""
+
+_store: "PersistentStore | None" = None
+_loaded = False
+_lock = threading.Lock()
+
+
+class PersistentStore:
+    """SQLite file holding list/get responses so they outlive the process and are shared between processes.
+
+    It sits behind the in-memory cache: a memory miss is looked up here before the portal is called,
+    and every portal response that is cached in memory is written here too. Rows expire by wall-clock
+    time with the same TTLs as the memory cache. Once the stored responses exceed ``max_bytes`` the
+    oldest rows are evicted. The database runs in WAL mode, so readers in any number of processes do
+    not block each other or the writer. Each thread uses its own connection. ``scope`` (the portal
+    URL and a hash of the token) keeps responses from different portals and credentials apart in a
+    shared file. A new database file is created readable by its owner only.
+
+    SQLite errors are logged and treated as misses; the store never fails a tool call.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        scope: str = "",
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.scope = scope
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        _create_private(path)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _failed(self, action: str, error: sqlite3.Error) -> None:
+        self._count("errors")
+        logger.warning("Persistent cache %s failed: %s", action, error)
+
+    def get(self, key: tuple) -> tuple[bool, Any, float]:
+        """Return ``(True, value, seconds_left)`` for an unexpired row, otherwise ``(False, None, 0)``."""
+        now = self._clock()
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value, expires FROM responses WHERE scope = ? AND key = ? AND expires > ?",
+                    (self.scope, _encode_key(key), now),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            return False, None, 0.0
+        if row is None:
+            self._count("misses")
+            return False, None, 0.0
+        self._count("hits")
+        return True, json.loads(row[0]), row[1] - now
+
+    def put(self, key: tuple, value: Any, ttl: float) -> None:
+        """Store a response for ``ttl`` seconds, then evict the oldest rows if the store is over its cap."""
+        if ttl <= 0:
+            return
+        encoded = dumps(value)
+        if len(encoded) > self.max_bytes:
+            return
+        now = self._clock()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.scope, _encode_key(key), key[0], key[1], encoded, len(encoded), now, now + ttl),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            self._failed("write", e)
+            return
+        self._count("writes")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        evicted = conn.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+        excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0] - self.max_bytes
+        if excess > 0:
+            doomed = []
+            for rowid, size in conn.execute("SELECT rowid, size FROM responses ORDER BY stored"):
+                doomed.append((rowid,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM responses WHERE rowid = ?", doomed)
+            evicted += len(doomed)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def invalidate(self, tenant: str, resource: str | None = None) -> None:
+        """Delete a tenant's rows, or only those for one resource kind, for every process sharing the file."""
+        sql, args = "DELETE FROM responses WHERE scope = ? AND tenant = ?", [self.scope, tenant]
+        if resource is not None:
+            sql, args = sql + " AND resource = ?", args + [resource]
+        try:
+            self._connect().execute(sql, args)
+        except sqlite3.Error as e:
+            self._failed("invalidate", e)
+
+    def stats(self) -> dict:
+        try:
+            rows, size = (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE scope = ?", (self.scope,))
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._failed("stats", e)
+            rows = size = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "rows": rows,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def _encode_key(key: tuple) -> str:
+    return dumps(list(key))
+
+
+def _create_private(path: str) -> None:
+    """Create the database file with owner-only permissions; SQLite gives its WAL files the same mode."""
+    if path == ":memory:" or path.startswith("file:"):
+        return
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        pass
+
+
+def store_scope(host: str, token: str) -> str:
+    """Scope for responses fetched from ``host`` with ``token``; the token itself is never stored."""
+    digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    return f"{host.strip().rstrip('/')} {digest}"
+
+
+def get_persistent_store() -> PersistentStore | None:
+    """Return the shared persistent store, or None unless DUPLO_CACHE_DB names a database file."""
+    global _store, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                path = os.environ.get("DUPLO_CACHE_DB", "").strip()
+                if path:
+                    try:
+                        _store = PersistentStore(
+                            path,
+                            scope=store_scope(
+                                os.environ.get("DUPLO_HOST", ""), os.environ.get("DUPLO_TOKEN", "").strip()
+                            ),
+                            max_bytes=int(env_float("DUPLO_CACHE_DB_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024),
+                        )
+                    except (sqlite3.Error, OSError) as e:
+                        logger.warning("Cannot open persistent cache %s, continuing without it: %s", path, e)
+                _loaded = True
+    return _store
+
+
+def reset_persistent_store() -> None:
+    """Close and discard the shared persistent store. Used in testing."""
+    global _store, _loaded
+    with _lock:
+        if _store is not None:
+            _store.close()
+        _store = None
+        _loaded = False
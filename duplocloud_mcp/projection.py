@@ -0,0 +1,54 @@
+import functools
+from typing import Any
+
+
+@functools.lru_cache(maxsize=256)
+def _field_tree(fields: str) -> dict:
+    """Parse ``"Name,Template.Image"`` into ``{"Name": {}, "Template": {"Image": {}}}``.
+
+    An empty subtree means "keep the whole value", so ``A`` wins over ``A.B`` when both are given.
+    """
+    tree: dict = {}
+    for raw in fields.split(","):
+        path = raw.strip()
+        if not path:
+            continue
+        parts = path.split(".")
+        if any(not p.strip() for p in parts):
+            raise ValueError(f"Invalid field path '{path}'")
+        node = tree
+        for i, part in enumerate(p.strip() for p in parts):
+            last = i == len(parts) - 1
+            if part in node and not node[part]:
+                break
+            if last:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _apply(value: Any, tree: dict) -> Any:
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    projected = {}
+    for key, subtree in tree.items():
+        if key in value:
+            projected[key] = _apply(value[key], subtree) if subtree else value[key]
+    return projected
+
+
+def project(data: Any, fields: str | None) -> Any:
+    """Keep only the requested dotted field paths of a record or of every record in a list.
+
+    Lists met along a path are projected element by element; missing fields are left out.
+    The input is never modified, so cached responses can be projected safely.
+    """
+    if not fields or not fields.strip():
+        return data
+    tree = _field_tree(fields.strip())
+    if not tree:
+        return data
+    return _apply(data, tree)
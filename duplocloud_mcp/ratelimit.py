@@ -0,0 +1,156 @@
+import collections
+import threading
+import time
+from typing import Callable
+
+from duplocloud_mcp.config import env_float
+from duplocloud_mcp.meta import add_to_meta
+
+# Off unless configured: limits that suit one portal would throttle bulk tools on another.
+DEFAULT_READ_RATE = 0.0
+DEFAULT_WRITE_RATE = 0.0
+
+# Waits shorter than this are bookkeeping noise, not throttling.
+_MIN_WAIT = 0.001
+
+_limiter: "RateLimiter | None" = None
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``burst`` tokens."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        self._refill()
+        return max((1 - self._tokens) / self.rate, 0.0)
+
+
+class FairBucket:
+    """Token bucket shared by all tenants that hands out tokens round-robin between tenants.
+
+    Callers queue per tenant. Whenever a token is available it goes to the next tenant in turn, so
+    a tenant with a hundred queued calls gets one call through for every call of a tenant with one.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.bucket = TokenBucket(rate, burst, clock)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues: dict[str, collections.deque] = {}
+        self._turns: collections.deque[str] = collections.deque()
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def acquire(self, tenant: str) -> float:
+        """Block until a token is granted to this caller; return the seconds spent waiting."""
+        start = self._clock()
+        ticket = object()
+        with self._cond:
+            queue = self._queues.setdefault(tenant, collections.deque())
+            queue.append(ticket)
+            if len(queue) == 1:
+                self._turns.append(tenant)
+            while True:
+                my_turn = self._turns[0] == tenant and queue[0] is ticket
+                if my_turn and self.bucket.try_take():
+                    break
+                self._cond.wait(self.bucket.time_until_token() if my_turn else None)
+            queue.popleft()
+            self._turns.popleft()
+            if queue:
+                self._turns.append(tenant)
+            else:
+                del self._queues[tenant]
+            waited = self._clock() - start
+            self.acquired += 1
+            if waited >= _MIN_WAIT:
+                self.delayed += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+            self._cond.notify_all()
+        return waited
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "rate": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "queued": sum(len(q) for q in self._queues.values()),
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "wait_ms_avg": round(self.wait_total / self.delayed * 1000, 3) if self.delayed else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+
+
+class RateLimiter:
+    """Separate read and write budgets for portal calls. A rate of 0 disables that budget."""
+
+    def __init__(
+        self,
+        read_rate: float = DEFAULT_READ_RATE,
+        write_rate: float = DEFAULT_WRITE_RATE,
+        read_burst: float | None = None,
+        write_burst: float | None = None,
+    ):
+        self.buckets: dict[str, FairBucket] = {}
+        if read_rate > 0:
+            self.buckets["read"] = FairBucket(read_rate, read_burst or read_rate)
+        if write_rate > 0:
+            self.buckets["write"] = FairBucket(write_rate, write_burst or write_rate)
+
+    def acquire(self, method: str, tenant: str | None) -> float:
+        """Wait for a token for one HTTP request and record the wait in the current tool call's metadata."""
+        bucket = self.buckets.get("read" if method == "GET" else "write")
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire(tenant or "")
+        if waited >= _MIN_WAIT:
+            add_to_meta("duplocloud/rate_limit_wait_ms", waited * 1000)
+        return waited
+
+    def stats(self) -> dict:
+        return {kind: bucket.stats() for kind, bucket in self.buckets.items()}
+
+
+def get_limiter() -> RateLimiter:
+    """Return the shared rate limiter, configured from environment variables on first use."""
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                _limiter = RateLimiter(
+                    read_rate=env_float("DUPLO_RATE_READ", DEFAULT_READ_RATE),
+                    write_rate=env_float("DUPLO_RATE_WRITE", DEFAULT_WRITE_RATE),
+                    read_burst=env_float("DUPLO_RATE_READ_BURST", 0) or None,
+                    write_burst=env_float("DUPLO_RATE_WRITE_BURST", 0) or None,
+                )
+    return _limiter
+
+
+def reset_limiter() -> None:
+    """Discard the shared rate limiter. Used in testing."""
+    global _limiter
+    with _lock:
+        _limiter = None
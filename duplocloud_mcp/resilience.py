@@ -0,0 +1,217 @@
+import contextvars
+import email.utils
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Callable
+
+from duplocloud.errors import DuploError
+
+from duplocloud_mcp.config import env_float, env_int
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.25
+DEFAULT_BACKOFF_CAP = 8.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET = 30.0
+
+# Statuses worth retrying: throttling and gateway/availability errors that usually clear up.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+_idempotent: contextvars.ContextVar[bool] = contextvars.ContextVar("duplo_idempotent", default=False)
+_policy: "RetryPolicy | None" = None
+_breakers: dict[str, "CircuitBreaker"] = {}
+_lock = threading.Lock()
+
+
+def idempotent(func):
+    """Mark a tool as safe to repeat, so its writes are retried like reads.
+
+    Only for writes that set state (e.g. "image = X"), never for ones that act (restart, create).
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _idempotent.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _idempotent.reset(token)
+
+    return wrapper
+
+
+def is_retryable(method: str) -> bool:
+    """Reads are always retryable; other methods only inside an ``@idempotent`` tool."""
+    return method == "GET" or _idempotent.get()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds from a Retry-After header (seconds or HTTP date), if any."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter that honors Retry-After."""
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base: float = DEFAULT_BACKOFF_BASE,
+        cap: float = DEFAULT_BACKOFF_CAP,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float | None:
+        """Return how long to wait before retry number ``attempt + 1``, or None to give up.
+
+        A Retry-After longer than the backoff cap is not waited out; the error goes back to the caller.
+        """
+        requested = parse_retry_after(retry_after)
+        if attempt >= self.max_retries or (requested is not None and requested > self.cap):
+            with self._lock:
+                self.exhausted += 1
+            return None
+        with self._lock:
+            self.retries += 1
+        if requested is not None:
+            return requested
+        return random.uniform(0, min(self.cap, self.base * 2**attempt))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"max_retries": self.max_retries, "retries": self.retries, "exhausted": self.exhausted}
+
+
+class CircuitBreaker:
+    """Per-host breaker that fails fast after repeated upstream failures.
+
+    After ``threshold`` consecutive failures the breaker opens and calls are refused for ``reset``
+    seconds. Then a single trial call is let through (half open): success closes the breaker,
+    failure opens it again. A 429 on the trial call shows the portal is up, so it closes the breaker too.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        reset: float = DEFAULT_BREAKER_RESET,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.host = host
+        self.threshold = threshold
+        self.reset = reset
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+
+    def before_call(self) -> None:
+        """Raise a 503 DuploError instead of calling the portal while the breaker is open."""
+        with self._lock:
+            if self.state == OPEN and self._clock() - self.opened_at >= self.reset:
+                self.state = HALF_OPEN
+                return
+            if self.state == CLOSED:
+                return
+            self.rejected += 1
+            retry_in = max(self.reset - (self._clock() - self.opened_at), 0.0)
+        raise DuploError(f"DuploCloud portal is failing; not calling {self.host} for another {retry_in:.0f}s", 503)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_throttled(self) -> None:
+        """Record a 429. It is no failure, but on a half-open trial it proves the portal answers again."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                if self.state == CLOSED:
+                    logger.warning("Opening circuit breaker for %s after %d failures", self.host, self.failures)
+                self.state = OPEN
+                self.opened_at = self._clock()
+                self.trips += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the shared retry policy, configured from environment variables on first use."""
+    global _policy
+    if _policy is None:
+        with _lock:
+            if _policy is None:
+                _policy = RetryPolicy(
+                    max_retries=max(env_int("DUPLO_RETRY_MAX", DEFAULT_MAX_RETRIES), 0),
+                    base=env_float("DUPLO_RETRY_BACKOFF", DEFAULT_BACKOFF_BASE),
+                    cap=env_float("DUPLO_RETRY_BACKOFF_MAX", DEFAULT_BACKOFF_CAP),
+                )
+    return _policy
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Return the circuit breaker for a portal host, creating it on first use."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    threshold=max(env_int("DUPLO_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD), 1),
+                    reset=env_float("DUPLO_BREAKER_RESET", DEFAULT_BREAKER_RESET),
+                )
+                _breakers[host] = breaker
+    return breaker
+
+
+def resilience_stats() -> dict:
+    return {
+        "retry": get_retry_policy().stats(),
+        "breakers": {host: breaker.stats() for host, breaker in list(_breakers.items())},
+    }
+
+
+def reset_resilience() -> None:
+    """Discard the shared retry policy and circuit breakers. Used in testing."""
+    global _policy
+    with _lock:
+        _policy = None
+        _breakers.clear()
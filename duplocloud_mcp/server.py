@@ -1,5 +1,248 @@
+import asyncio
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import threading
+import weakref
+from pathlib import Path
+
 from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool as MCPTool
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from duplocloud_mcp.config import env_int
+from duplocloud_mcp.executor import get_pool
+from duplocloud_mcp.meta import collecting_meta, with_meta
+from duplocloud_mcp.metrics import error_code, get_metrics
+from duplocloud_mcp.sessions import get_session_limiter
+from duplocloud_mcp.subscriptions import get_subscriptions
+from duplocloud_mcp.tracing import span
+
+logger = logging.getLogger("duplocloud-mcp")
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+TOOL_MODULES = (
+    "containers",
+    "databases",
+    "hosts",
+    "inventory",
+    "jobs",
+    "resources",
+    "services",
+    "stats",
+    "storage",
+    "tenants",
+)
+TOOL_SCHEMA_PATH = Path(__file__).with_name("tool_schema.json")
+# The Docker MCP Toolkit manifest; only present in a source checkout.
+DOCKER_TOOLS_PATH = Path(__file__).parent.parent / "docker" / "tools.json"
+
+_tools_loaded = False
+_load_lock = threading.Lock()
+
+
+class DuploMCP(FastMCP):
+    """FastMCP server that imports its tool modules, and with them the DuploCloud SDK, on the first tool call.
+
+    Until then ``list_tools`` is answered from ``tool_schema.json``, the tool list precomputed by
+    :func:`write_tool_schema`, so a session can initialize and list tools without paying for the imports.
+    Resource reads and subscriptions load the modules first, since the resources are defined there.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._closing_hooked: weakref.WeakSet = weakref.WeakSet()
+        self._mcp_server.subscribe_resource()(self.subscribe_resource)
+        self._mcp_server.unsubscribe_resource()(self.unsubscribe_resource)
+        # The low-level server always advertises resources without subscribe support.
+        get_capabilities = self._mcp_server.get_capabilities
+
+        def capabilities(*args, **kwargs):
+            result = get_capabilities(*args, **kwargs)
+            if result.resources is not None:
+                result.resources.subscribe = True
+            return result
+
+        self._mcp_server.get_capabilities = capabilities
+
+    async def list_tools(self) -> list[MCPTool]:
+        if not _tools_loaded:
+            tools = _precomputed_tools()
+            if tools is not None:
+                return tools
+            load_tools()
+        return await super().list_tools()
+
+    async def call_tool(self, name, arguments):
+        if not _tools_loaded:
+            await get_pool().run(load_tools)
+        return await super().call_tool(name, arguments)
+
+    async def list_resource_templates(self):
+        if not _tools_loaded:
+            await get_pool().run(load_tools)
+        return await super().list_resource_templates()
+
+    async def read_resource(self, uri):
+        if not _tools_loaded:
+            await get_pool().run(load_tools)
+        return await super().read_resource(uri)
+
+    async def subscribe_resource(self, uri) -> None:
+        """Subscribe the requesting session to ``resources/updated`` notifications for ``uri``."""
+        if not _tools_loaded:
+            await get_pool().run(load_tools)
+        session = self._mcp_server.request_context.session
+        subscriptions = get_subscriptions()
+        subscriptions.subscribe(str(uri), session)
+        self._drop_on_close(session, subscriptions.drop_session)
+
+    async def unsubscribe_resource(self, uri) -> None:
+        get_subscriptions().unsubscribe(str(uri), self._mcp_server.request_context.session)
+
+    def _drop_on_close(self, session, drop) -> None:
+        """Call ``drop(session)`` when the session closes, so its pollers stop with it."""
+        if session in self._closing_hooked:
+            return
+        # The SDK has no public close hook. ServerSession closes _exit_stack when the connection ends;
+        # test_closed_session_stops_its_poller fails if that goes away. Without it, a closed session
+        # still loses its subscriptions on the first notification that cannot be sent.
+        exit_stack = getattr(session, "_exit_stack", None)
+        if exit_stack is None:
+            return
+        exit_stack.callback(drop, session)
+        self._closing_hooked.add(session)
+
+
+# Host and port only matter for the HTTP transports. They are passed to the constructor because
+# FastMCP turns on DNS-rebinding protection there when the server binds to a loopback address.
+mcp = DuploMCP(
+    "duplocloud",
+    host=os.environ.get("DUPLO_MCP_HOST", "127.0.0.1"),
+    port=env_int("DUPLO_MCP_PORT", 8000),
+)
+
+# Set by run() for the HTTP transports, where many agent sessions share one worker pool. Over stdio
+# there is only ever one session, so capping it would only reduce its concurrency.
+_limit_sessions = False
+
+
+def _current_session():
+    """Return the MCP session of the request being handled, or None when sessions are not capped."""
+    if not _limit_sessions:
+        return None
+    try:
+        return mcp.get_context().session
+    except ValueError:
+        return None
+
+
+def tool(**kwargs):
+    """Register a blocking tool function as an async MCP tool backed by the worker pool.
+
+    The function itself is returned unchanged so it can still be called directly. Metadata
+    gathered during the call (e.g. rate-limit queue wait) is returned as the result's ``_meta``,
+    and the call's latency, result size and error code are recorded in the tool metrics. With
+    tracing on, each call is the root span of a trace.
+    Over HTTP, calls are capped per MCP session and the session's limits are reported in ``_meta``.
+    Coroutine functions, which only wait, run on the event loop instead and take no worker or session slot.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def run_in_pool(*args, **kw):
+            session = _current_session()
+            with (
+                span(
+                    f"tool {func.__name__}", **{"mcp.tool": func.__name__, "duplo.tenant": kw.get("tenant_id")}
+                ) as root,
+                get_metrics().observing(func.__name__) as call,
+                collecting_meta() as meta,
+            ):
+                if inspect.iscoroutinefunction(func):
+                    result = await func(*args, **kw)
+                elif session is None:
+                    result = await get_pool().run(func, *args, **kw)
+                else:
+                    async with get_session_limiter().slot(session) as limits:
+                        meta["duplocloud/session"] = limits
+                        result = await get_pool().run(func, *args, **kw)
+                call["result"] = result
+                root.set("mcp.result_bytes", len(result) if isinstance(result, str) else None)
+                code = error_code(result)
+                if code is not None:
+                    root.set("duplo.error_code", code)
+                    root.set_error(f"Tool returned error {code}")
+            return with_meta(result, meta)
+
+        mcp.add_tool(run_in_pool, **kwargs)
+        return func
+
+    return decorator
+
+
+@mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Serve the tool metrics in the Prometheus text format (HTTP transports only)."""
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+
+def run(transport: str | None = None) -> None:
+    """Run the server on the transport named by ``transport`` or DUPLO_MCP_TRANSPORT (default stdio)."""
+    global _limit_sessions
+    transport = (transport or os.environ.get("DUPLO_MCP_TRANSPORT", "") or "stdio").strip().lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r}; expected one of {', '.join(TRANSPORTS)}")
+    _limit_sessions = transport != "stdio"
+    mcp.run(transport=transport)
+
+
+def load_tools() -> None:
+    """Import every tool module, registering its tools. Safe to call repeatedly and from any thread."""
+    global _tools_loaded
+    if _tools_loaded:
+        return
+    with _load_lock:
+        if not _tools_loaded:
+            for name in TOOL_MODULES:
+                importlib.import_module(f"duplocloud_mcp.tools.{name}")
+            _tools_loaded = True
+
+
+@functools.cache
+def _precomputed_tools() -> list[MCPTool] | None:
+    try:
+        with open(TOOL_SCHEMA_PATH) as f:
+            return [MCPTool.model_validate(tool) for tool in json.load(f)]
+    except (OSError, ValueError) as e:
+        logger.warning("Cannot read %s, importing the tool modules instead: %s", TOOL_SCHEMA_PATH.name, e)
+        return None
+
+
+async def tool_schema() -> list[dict]:
+    """Return the tool list as registered by the tool modules, in the form stored in ``tool_schema.json``."""
+    load_tools()
+    return [t.model_dump(mode="json", by_alias=True, exclude_none=True) for t in await FastMCP.list_tools(mcp)]
+
+
+def docker_tools(schema: list[dict]) -> list[dict]:
+    """Return the Docker MCP Toolkit manifest (``docker/tools.json``) for a tool list from :func:`tool_schema`."""
+    return [{"name": t["name"], "description": t.get("description"), "inputSchema": t["inputSchema"]} for t in schema]
+
 
-mcp = FastMCP("duplocloud")
+def write_tool_schema(path: Path = TOOL_SCHEMA_PATH, docker_path: Path | None = DOCKER_TOOLS_PATH) -> None:
+    """Regenerate ``tool_schema.json`` and ``docker/tools.json``; run after adding a tool or changing a
+    signature or docstring.
 
-from duplocloud_mcp.tools import containers, databases, hosts, services, storage, tenants  # noqa: E402, F401
+    Both files are built from the tool modules, never from the precomputed schema they replace.
+    """
+    schema = asyncio.run(tool_schema())
+    with open(path, "w") as f:
+        f.write(json.dumps(schema, indent=2) + "\n")
+    if docker_path is not None and docker_path.parent.is_dir():
+        with open(docker_path, "w") as f:
+            f.write(json.dumps(docker_tools(schema), indent=2) + "\n")
@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+
+from duplocloud_mcp.config import env_int
+
+DEFAULT_SESSION_CONCURRENCY = 4
+
+# Waits shorter than this are scheduling noise, not queueing behind the session's own calls.
+_MIN_WAIT = 0.001
+
+_limiter: "SessionLimiter | None" = None
+_lock = threading.Lock()
+
+
+class _SessionSlots:
+    __slots__ = ("semaphore", "in_flight", "queued", "calls")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.queued = 0
+        self.calls = 0
+
+
+class SessionLimiter:
+    """Caps how many tool calls a single MCP session runs at once.
+
+    Over HTTP many agents share one server and one worker pool. Without a per-session cap a single
+    agent firing dozens of parallel calls would occupy every worker and stall everyone else; with
+    it, extra calls from that agent queue behind its own earlier calls. Sessions are held weakly,
+    so their state goes away with the session.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("Session concurrency limit must be at least 1")
+        self.limit = limit
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.delayed = 0
+        self.wait_max = 0.0
+
+    @contextlib.asynccontextmanager
+    async def slot(self, session):
+        """Hold one of the session's call slots; yields the session's limits for the response metadata."""
+        with self._lock:
+            slots = self._sessions.get(session)
+            if slots is None:
+                slots = self._sessions[session] = _SessionSlots(self.limit)
+            slots.queued += 1
+        start = time.perf_counter()
+        try:
+            await slots.semaphore.acquire()
+        finally:
+            with self._lock:
+                slots.queued -= 1
+        waited = time.perf_counter() - start
+        with self._lock:
+            slots.in_flight += 1
+            slots.calls += 1
+            if waited >= _MIN_WAIT:
+                self.delayed += 1
+                self.wait_max = max(self.wait_max, waited)
+            info = {
+                "concurrency_limit": self.limit,
+                "in_flight": slots.in_flight,
+                "queued": slots.queued,
+                "queue_wait_ms": round(waited * 1000, 3),
+            }
+        try:
+            yield info
+        finally:
+            with self._lock:
+                slots.in_flight -= 1
+            slots.semaphore.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            return {
+                "concurrency_limit": self.limit,
+                "sessions": len(sessions),
+                "in_flight": sum(s.in_flight for s in sessions),
+                "queued": sum(s.queued for s in sessions),
+                "calls": sum(s.calls for s in sessions),
+                "delayed": self.delayed,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+
+
+def get_session_limiter() -> SessionLimiter:
+    """Return the shared per-session limiter, sized from DUPLO_MCP_SESSION_CONCURRENCY on first use."""
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                _limiter = SessionLimiter(max(env_int("DUPLO_MCP_SESSION_CONCURRENCY", DEFAULT_SESSION_CONCURRENCY), 1))
+    return _limiter
+
+
+def reset_session_limiter() -> None:
+    """Discard the shared per-session limiter. Used in testing."""
+    global _limiter
+    with _lock:
+        _limiter = None
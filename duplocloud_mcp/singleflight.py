@@ -0,0 +1,96 @@
+import threading
+from typing import Any, Callable
+
+_flight: "SingleFlight | None" = None
+_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls so only the first one runs.
+
+    Callers that arrive while a call with the same key is in flight block until it finishes and
+    share its result, or its exception. Keys start with ``(tenant, resource)``; :func:`duplocloud_mcp.cache.cached_read`
+    uses the cache key with the read's ``fresh`` flag appended.
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: tuple, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self, tenant: str, resource: str | None = None) -> None:
+        """Stop new callers from joining calls already in flight for a tenant (or one of its resources).
+
+        Used after a write, so reads that start after it never receive a response fetched before it.
+        """
+        with self._lock:
+            for key in [k for k in self._calls if k[0] == tenant and (resource is None or k[1] == resource)]:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.executed + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "coalesced_ratio": round(self.coalesced / calls, 3) if calls else 0.0,
+            }
+
+
+def get_flight() -> SingleFlight:
+    """Return the shared single-flight group for upstream reads."""
+    global _flight
+    if _flight is None:
+        with _lock:
+            if _flight is None:
+                _flight = SingleFlight()
+    return _flight
+
+
+def reset_flight() -> None:
+    """Discard the shared single-flight group. Used in testing."""
+    global _flight
+    with _lock:
+        _flight = None
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, NamedTuple
+from urllib.parse import quote, unquote
+
+from pydantic import AnyUrl
+
+from duplocloud_mcp.changes import get_tracker
+from duplocloud_mcp.config import env_float
+from duplocloud_mcp.executor import get_pool
+from duplocloud_mcp.metrics import count
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_MIN_INTERVAL = 5.0
+DEFAULT_MAX_INTERVAL = 60.0
+URI_PREFIX = "duplo://tenants/"
+
+_manager: "SubscriptionManager | None" = None
+_lock = threading.Lock()
+
+
+class Feed(NamedTuple):
+    """How to poll one kind of subscribable resource.
+
+    ``fetch(tenant_id, scope, fresh)`` is a blocking listing call; ``resource`` names its change feed.
+    """
+
+    fetch: Callable[[str, str | None, bool], Any]
+    resource: str
+    name_fields: tuple[str, ...]
+    scoped: bool = False
+
+
+# kind -> Feed, filled in by the resource module. Scoped kinds are listed per parent record
+# (ECS tasks per ECS service) and have no per-record URIs.
+FEEDS: dict[str, Feed] = {}
+
+
+class Watch(NamedTuple):
+    tenant: str
+    kind: str
+    scope: str | None = None
+
+    def uri(self, name: str | None = None) -> str:
+        if self.scope is not None:
+            return f"{URI_PREFIX}{quote(self.tenant, safe='')}/ecs-services/{quote(self.scope, safe='')}/tasks"
+        base = f"{URI_PREFIX}{quote(self.tenant, safe='')}/{self.kind}"
+        return base if name is None else f"{base}/{quote(name, safe='')}"
+
+
+def register_feed(kind: str, fetch: Callable, resource: str, name_fields: tuple[str, ...], scoped: bool = False):
+    FEEDS[kind] = Feed(fetch, resource, name_fields, scoped)
+
+
+def parse_uri(uri: str) -> tuple[Watch, str | None]:
+    """Split a resource URI into the listing that is polled for it and the record name, if any."""
+    if not uri.startswith(URI_PREFIX):
+        raise ValueError(f"Unknown resource: {uri}")
+    parts = [unquote(part) for part in uri[len(URI_PREFIX) :].split("/")]
+    if len(parts) == 4 and parts[1] == "ecs-services" and parts[3] == "tasks" and all(parts):
+        if "ecs-tasks" in FEEDS:
+            return Watch(parts[0], "ecs-tasks", parts[2]), None
+    elif len(parts) in (2, 3) and all(parts):
+        feed = FEEDS.get(parts[1])
+        if feed is not None and not feed.scoped:
+            return Watch(parts[0], parts[1]), parts[2] if len(parts) == 3 else None
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+class Poller:
+    """Polls one tenant's listing for every session subscribed to it, and notifies them of changes.
+
+    The interval starts at ``min_interval`` and doubles after each poll that finds no change, up to
+    ``max_interval``; a change or a new subscriber brings it back to ``min_interval``.
+    """
+
+    def __init__(self, manager: "SubscriptionManager", watch: Watch):
+        self.manager = manager
+        self.watch = watch
+        self.interval = manager.min_interval
+        self.polls = 0
+        self._feed = get_tracker().feed(watch.tenant, self._resource(), FEEDS[watch.kind].name_fields)
+        self._version: int | None = None
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=f"poll {watch.uri()}")
+
+    def _resource(self) -> str:
+        resource = FEEDS[self.watch.kind].resource
+        return resource if self.watch.scope is None else f"{resource}:{self.watch.scope}"
+
+    def wake(self) -> None:
+        """Poll now and at the shortest interval again, unless the poller is polling at that rate already."""
+        if self.interval > self.manager.min_interval:
+            self.interval = self.manager.min_interval
+            self._wake.set()
+
+    def stop(self) -> None:
+        if not self._task.done() and not self._task.get_loop().is_closed():
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            changed = await self.poll()
+            self.interval = self.manager.min_interval if changed else min(self.interval * 2, self.manager.max_interval)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except TimeoutError:
+                pass
+
+    async def poll(self) -> bool:
+        """Fetch the listing once and notify subscribers of what changed. Returns whether anything did."""
+        watch = self.watch
+        self.polls += 1
+        count("subscription_polls", kind=watch.kind)
+        try:
+            records = await get_pool().run(FEEDS[watch.kind].fetch, watch.tenant, watch.scope, True)
+        except Exception as e:
+            logger.warning("Polling %s failed: %s", watch.uri(), e)
+            return False
+        if not isinstance(records, list):
+            return False
+        self._feed.apply(records)
+        changes = self._feed.since(self._version)
+        first, self._version = self._version is None, changes["version"]
+        if first or not (changes["added"] or changes["modified"] or changes["removed"]):
+            return False
+        if changes["full"]:
+            uris = None
+        else:
+            names = [self._feed.name(r) for r in changes["added"] + changes["modified"]] + changes["removed"]
+            uris = [watch.uri()] + [watch.uri(name) for name in names]
+        await self.manager.notify(watch, uris)
+        return True
+
+
+class SubscriptionManager:
+    """Resource subscriptions of every session, with one shared poller per polled listing."""
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.notifications = 0
+        self._subscribers: dict[str, set] = {}
+        self._pollers: dict[Watch, Poller] = {}
+
+    def subscribe(self, uri: str, session: Any) -> str:
+        """Subscribe a session to a resource URI and start (or speed up) the poller behind it."""
+        watch, name = parse_uri(uri)
+        uri = watch.uri(name)
+        self._subscribers.setdefault(uri, set()).add(session)
+        poller = self._pollers.get(watch)
+        if poller is None:
+            self._pollers[watch] = Poller(self, watch)
+        else:
+            poller.wake()
+        return uri
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        watch, name = parse_uri(uri)
+        self._drop(watch.uri(name), session)
+
+    def _drop(self, uri: str, session: Any) -> None:
+        sessions = self._subscribers.get(uri)
+        if sessions is None:
+            return
+        sessions.discard(session)
+        if not sessions:
+            del self._subscribers[uri]
+            watch = parse_uri(uri)[0]
+            if not any(parse_uri(other)[0] == watch for other in self._subscribers):
+                poller = self._pollers.pop(watch, None)
+                if poller is not None:
+                    poller.stop()
+
+    async def notify(self, watch: Watch, uris: list[str] | None) -> None:
+        """Send ``resources/updated`` for each URI, or for every subscribed URI of the listing when None.
+
+        A session the notification cannot be sent to has gone away and loses all its subscriptions.
+        """
+        if uris is None:
+            uris = [uri for uri in self._subscribers if parse_uri(uri)[0] == watch]
+        for uri in dict.fromkeys(uris):
+            for session in list(self._subscribers.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception as e:
+                    logger.info("Dropping subscriptions of a closed session: %s", e)
+                    self.drop_session(session)
+                else:
+                    self.notifications += 1
+                    count("subscription_notifications", kind=watch.kind)
+
+    def drop_session(self, session: Any) -> None:
+        for uri in [uri for uri, sessions in self._subscribers.items() if session in sessions]:
+            self._drop(uri, session)
+
+    def stop(self) -> None:
+        for poller in self._pollers.values():
+            poller.stop()
+        self._pollers.clear()
+        self._subscribers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "subscriptions": sum(len(sessions) for sessions in self._subscribers.values()),
+            "pollers": len(self._pollers),
+            "polls": sum(p.polls for p in self._pollers.values()),
+            "notifications": self.notifications,
+            "intervals": sorted(p.interval for p in self._pollers.values()),
+        }
+
+
+def get_subscriptions() -> SubscriptionManager:
+    """Return the shared subscription manager, configured from environment variables on first use."""
+    global _manager
+    if _manager is None:
+        with _lock:
+            if _manager is None:
+                _manager = SubscriptionManager(
+                    min_interval=env_float("DUPLO_POLL_INTERVAL", DEFAULT_MIN_INTERVAL),
+                    max_interval=env_float("DUPLO_POLL_MAX_INTERVAL", DEFAULT_MAX_INTERVAL),
+                )
+    return _manager
+
+
+def reset_subscriptions() -> None:
+    """Stop every poller and discard the shared subscription manager. Used in testing."""
+    global _manager
+    with _lock:
+        if _manager is not None:
+            _manager.stop()
+        _manager = None
@@ -1,70 +1,167 @@
-from duplocloud_mcp.client import get_client
+import functools
+
+from duplocloud_mcp.batch import run_batch
+from duplocloud_mcp.cache import cache_key, cached_read, invalidating
+from duplocloud_mcp.client import get_tenant_client
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.jobs import PENDING, READY, start_job
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.resilience import idempotent
+from duplocloud_mcp.server import tool
 
 
 def _get_ecs_resource(tenant_id: str):
     """Get an ECS resource configured for the given tenant."""
     validate_required(tenant_id, "Tenant ID")
-    client = get_client()
-    client.tenantid = tenant_id.strip()
-    return client.load("ecs")
+    return get_tenant_client(tenant_id).load("ecs")
+
+
+def _task_arns(tasks) -> set:
+    return {task.get("TaskArn") or task.get("taskArn") for task in tasks or ()} - {None}
+
+
+def _tasks_settled(ecs, family_name: str, replicas: int, started: set, before: set):
+    """Readiness check for run tasks, matching the SDK's own wait: every task has reached its desired status.
+
+    Only the tasks this call started count: the ARNs in the run response or, failing that, tasks that were
+    not listed before the call.
+    """
+    tasks = ecs.list_tasks(ecs.prefixed_name(family_name)) or []
+    if started:
+        ours = [task for task in tasks if task.get("TaskArn") in started]
+    else:
+        ours = [task for task in tasks if task.get("TaskArn") not in before]
+    unsettled = sum(1 for task in ours if task.get("DesiredStatus") != task.get("LastStatus"))
+    ready = len(ours) >= (len(started) or replicas) and not unsettled
+    return (READY if ready else PENDING), {"tasks": len(ours), "unsettled": unsettled}
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def ecs_service_list(tenant_id: str) -> str:
+def ecs_service_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all ECS services in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list ECS services for.
+        fields: Comma-separated dotted field paths to return (e.g. ServiceName,TaskDefinition). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     ecs = _get_ecs_resource(tenant_id)
-    return ecs.list_services()
+    key = cache_key(tenant_id, "ecs", "list_services")
+    return paginate(
+        key,
+        lambda: cached_read(tenant_id, "ecs", "list_services", (), ecs.list_services, fresh=fresh),
+        limit,
+        cursor,
+        fields,
+    )
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def ecs_task_def_list(tenant_id: str) -> str:
+def ecs_task_def_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all ECS task definition families in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list task definitions for.
+        fields: Comma-separated dotted field paths to return (e.g. Family). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     ecs = _get_ecs_resource(tenant_id)
-    return ecs.list_task_def_family()
+    key = cache_key(tenant_id, "ecs", "list_task_def_family")
+    return paginate(
+        key,
+        lambda: cached_read(tenant_id, "ecs", "list_task_def_family", (), ecs.list_task_def_family, fresh=fresh),
+        limit,
+        cursor,
+        fields,
+    )
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def ecs_task_list(tenant_id: str, service_name: str) -> str:
+def ecs_task_list(
+    tenant_id: str,
+    service_name: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List running ECS tasks for a specific service.
 
     Args:
         tenant_id: The tenant ID containing the ECS service.
         service_name: The ECS service name to list tasks for.
+        fields: Comma-separated dotted field paths to return (e.g. TaskArn,LastStatus). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(service_name, "Service name")
     ecs = _get_ecs_resource(tenant_id)
-    return ecs.list_tasks(service_name)
-
-
-@mcp.tool()
+    key = cache_key(tenant_id, "ecs", "list_tasks", (service_name,))
+    return paginate(
+        key,
+        lambda: cached_read(
+            tenant_id, "ecs", "list_tasks", (service_name,), lambda: ecs.list_tasks(service_name), fresh=fresh
+        ),
+        limit,
+        cursor,
+        fields,
+    )
+
+
+@tool()
 @handle_duplo_errors
-def ecs_task_run(tenant_id: str, family_name: str, replicas: int = 1) -> str:
+def ecs_task_run(tenant_id: str, family_name: str, replicas: int = 1, job: bool = False) -> str:
     """Run an ECS task from a task definition family.
 
     Args:
         tenant_id: The tenant ID to run the task in.
         family_name: The task definition family name.
         replicas: Number of task instances to run. Defaults to 1.
+        job: Return a job_id to follow with job_status or job_wait until the tasks have settled. Defaults to False.
     """
     validate_required(family_name, "Task definition family name")
     ecs = _get_ecs_resource(tenant_id)
-    return ecs.run_task(family_name, replicas)
+    before = _task_arns(ecs.list_tasks(ecs.prefixed_name(family_name))) if job else set()
+    with invalidating(tenant_id, "ecs"):
+        result = ecs.run_task(family_name, replicas)
+    if not job:
+        return result
+    started = _task_arns(result.get("tasks") or result.get("Tasks")) if isinstance(result, dict) else set()
+    check = functools.partial(_tasks_settled, ecs, family_name, replicas or 1, started, before)
+    variant = (replicas or 1, frozenset(started), frozenset(before))
+    return start_job(result, "ecs_task_run", tenant_id, "ecs", family_name, check, variant)
+
+
+@idempotent
+def _update_ecs_service(tenant_id: str, name: str, image: str):
+    validate_required(name, "Task definition family name")
+    validate_required(image, "Docker image")
+    ecs = _get_ecs_resource(tenant_id)
+    with invalidating(tenant_id, "ecs"):
+        return ecs.update_image(name, image)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def ecs_service_update(tenant_id: str, name: str, image: str) -> str:
     """Update the image of an ECS service's task definition.
@@ -74,13 +171,29 @@ def ecs_service_update(tenant_id: str, name: str, image: str) -> str:
         name: The task definition family name.
         image: The new Docker image to deploy.
     """
-    validate_required(name, "Task definition family name")
+    return _update_ecs_service(tenant_id, name, image)
+
+
+@tool()
+@handle_duplo_errors
+def ecs_service_update_many(
+    tenant_id: str, names: list[str], image: str, concurrency: int | None = None, timeout: float | None = None
+) -> str:
+    """Update the image of several ECS services concurrently. A failing service does not stop the others.
+
+    Args:
+        tenant_id: The tenant ID containing the ECS services.
+        names: The task definition family names to update.
+        image: The new Docker image to deploy to every service.
+        concurrency: Maximum number of services to update at once. Defaults to DUPLO_BATCH_CONCURRENCY (4).
+        timeout: Seconds each update may take before it is reported as timed out. Defaults to DUPLO_BATCH_TIMEOUT (60).
+    """
     validate_required(image, "Docker image")
-    ecs = _get_ecs_resource(tenant_id)
-    return ecs.update_image(name, image)
+    _get_ecs_resource(tenant_id)
+    return run_batch(names, lambda name: _update_ecs_service(tenant_id, name, image), concurrency, timeout)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def ecs_service_delete(tenant_id: str, name: str) -> str:
     """Delete an ECS service from a DuploCloud tenant.
@@ -91,4 +204,5 @@ def ecs_service_delete(tenant_id: str, name: str) -> str:
     """
     validate_required(name, "ECS service name")
     ecs = _get_ecs_resource(tenant_id)
-    return ecs.delete_service(name)
+    with invalidating(tenant_id, "ecs"):
+        return ecs.delete_service(name)
@@ -1,43 +1,72 @@
-from duplocloud_mcp.client import get_client
+from duplocloud_mcp.cache import cache_key, indexed_get, indexed_list, invalidating
+from duplocloud_mcp.client import get_tenant_client
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.jobs import FAILED, PENDING, READY, start_job
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.projection import project
+from duplocloud_mcp.resilience import idempotent
+from duplocloud_mcp.server import tool
 
 
 def _get_rds_resource(tenant_id: str):
     """Get an RDS resource configured for the given tenant."""
     validate_required(tenant_id, "Tenant ID")
-    client = get_client()
-    client.tenantid = tenant_id.strip()
-    return client.load("rds")
+    return get_tenant_client(tenant_id).load("rds")
 
 
-@mcp.tool()
+# RDS instance states that will not become "available" without intervention.
+_FAILED_STATUSES = ("failed", "incompatible-network", "incompatible-parameters", "storage-full")
+
+
+def _database_ready(rds, identifier: str):
+    """Readiness check for a new RDS instance, matching the SDK's own wait: pending until available."""
+    status = rds.find(identifier).get("InstanceStatus")
+    if status == "available":
+        return READY, status
+    return (FAILED if status in _FAILED_STATUSES else PENDING), status
+
+
+@tool()
 @handle_duplo_errors
-def database_list(tenant_id: str) -> str:
+def database_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all RDS database instances in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list databases for.
+        fields: Comma-separated dotted field paths to return (e.g. Identifier,Engine,SizeEx). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     rds = _get_rds_resource(tenant_id)
-    return rds.list()
+    key = cache_key(tenant_id, "rds", "list")
+    return paginate(key, lambda: indexed_list(tenant_id, "rds", rds.list, fresh=fresh), limit, cursor, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def database_get(tenant_id: str, name: str) -> str:
+def database_get(tenant_id: str, name: str, fields: str | None = None, fresh: bool = False) -> str:
     """Get details of a specific RDS database instance.
 
     Args:
         tenant_id: The tenant ID containing the database.
         name: The database instance identifier.
+        fields: Comma-separated dotted field paths to return (e.g. Identifier,Engine,SizeEx). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(name, "Database name")
     rds = _get_rds_resource(tenant_id)
-    return rds.find(name)
+    result = indexed_get(tenant_id, "rds", name, lambda: rds.find(name), fresh=fresh)
+    return project(result, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def database_create(
     tenant_id: str,
@@ -46,6 +75,7 @@ def database_create(
     size: str,
     master_username: str = "master",
     master_password: str | None = None,
+    job: bool = False,
 ) -> str:
     """Create a new RDS database instance in a DuploCloud tenant.
 
@@ -56,6 +86,7 @@ def database_create(
         size: Instance class (e.g. db.t3.micro).
         master_username: Master database username. Defaults to 'master'.
         master_password: Master database password. Required for most engines.
+        job: Return a job_id to follow with job_status or job_wait until the database is available. Defaults to False.
     """
     validate_required(identifier, "Database identifier")
     validate_required(engine, "Database engine")
@@ -69,11 +100,17 @@ def database_create(
     }
     if master_password:
         body["MasterPassword"] = master_password
-    return rds.create(body)
+    with invalidating(tenant_id, "rds", identifier):
+        result = rds.create(body)
+    if not job:
+        return result
+    name = rds.name_from_body(body)
+    return start_job(result, "database_create", tenant_id, "rds", name, lambda: _database_ready(rds, name))
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
+@idempotent
 def database_update(tenant_id: str, name: str, size: str | None = None) -> str:
     """Update an RDS database instance. Currently supports resizing.
 
@@ -85,11 +122,12 @@ def database_update(tenant_id: str, name: str, size: str | None = None) -> str:
     validate_required(name, "Database name")
     rds = _get_rds_resource(tenant_id)
     if size:
-        return rds.set_instance_size(name, size)
+        with invalidating(tenant_id, "rds", name):
+            return rds.set_instance_size(name, size)
     return {"error": "Provide at least one field to update (size)", "code": 400}
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def database_delete(tenant_id: str, name: str) -> str:
     """Delete an RDS database instance from a DuploCloud tenant.
@@ -100,4 +138,5 @@ def database_delete(tenant_id: str, name: str) -> str:
     """
     validate_required(name, "Database name")
     rds = _get_rds_resource(tenant_id)
-    return rds.delete(name)
+    with invalidating(tenant_id, "rds", name):
+        return rds.delete(name)
@@ -1,45 +1,87 @@
-from duplocloud_mcp.client import get_client
+from duplocloud_mcp.batch import run_batch
+from duplocloud_mcp.cache import cache_key, indexed_get, indexed_list, invalidating
+from duplocloud_mcp.changes import changes_since
+from duplocloud_mcp.client import get_tenant_client
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.jobs import FAILED, PENDING, READY, start_job
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.projection import project
+from duplocloud_mcp.server import tool
 
 
 def _get_host_resource(tenant_id: str):
     """Get a hosts resource configured for the given tenant."""
     validate_required(tenant_id, "Tenant ID")
-    client = get_client()
-    client.tenantid = tenant_id.strip()
-    return client.load("hosts")
+    return get_tenant_client(tenant_id).load("hosts")
 
 
-@mcp.tool()
+def _host_ready(hosts, name: str):
+    """Readiness check for a new host, matching the SDK's own wait: pending until running."""
+    status = hosts.find(name).get("Status")
+    if status == "running":
+        return READY, status
+    return (PENDING if status == "pending" else FAILED), status
+
+
+@tool()
 @handle_duplo_errors
-def host_list(tenant_id: str) -> str:
+def host_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all hosts (virtual machines) in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list hosts for.
+        fields: Comma-separated dotted field paths to return (e.g. FriendlyName,Status). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     hosts = _get_host_resource(tenant_id)
-    return hosts.list()
+    key = cache_key(tenant_id, "hosts", "list")
+    return paginate(key, lambda: indexed_list(tenant_id, "hosts", hosts.list, fresh=fresh), limit, cursor, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def host_get(tenant_id: str, name: str) -> str:
+def host_changes(tenant_id: str, since: str | None = None, fields: str | None = None, fresh: bool = False) -> str:
+    """Return the hosts added, modified or removed in a tenant since an earlier host_changes call.
+
+    Args:
+        tenant_id: The tenant ID to watch hosts in.
+        since: The version value from a previous host_changes call. Omit to get every host and a first version.
+        fields: Comma-separated dotted field paths to return (e.g. FriendlyName,Status). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
+    """
+    hosts = _get_host_resource(tenant_id)
+    records = indexed_list(tenant_id, "hosts", hosts.list, fresh=fresh)
+    return changes_since(tenant_id, "hosts", records, since, fields)
+
+
+@tool()
+@handle_duplo_errors
+def host_get(tenant_id: str, name: str, fields: str | None = None, fresh: bool = False) -> str:
     """Get details of a specific host by name.
 
     Args:
         tenant_id: The tenant ID containing the host.
         name: The host name to look up.
+        fields: Comma-separated dotted field paths to return (e.g. FriendlyName,Status). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(name, "Host name")
     hosts = _get_host_resource(tenant_id)
-    return hosts.find(name)
+    result = indexed_get(tenant_id, "hosts", name, lambda: hosts.find(name), fresh=fresh)
+    return project(result, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def host_create(tenant_id: str, friendly_name: str, capacity: str, agent_platform: int = 0) -> str:
+def host_create(tenant_id: str, friendly_name: str, capacity: str, agent_platform: int = 0, job: bool = False) -> str:
     """Create a new host (VM) in a DuploCloud tenant.
 
     Args:
@@ -47,6 +89,7 @@ def host_create(tenant_id: str, friendly_name: str, capacity: str, agent_platfor
         friendly_name: A friendly name for the host.
         capacity: The instance type/size (e.g. t3.medium).
         agent_platform: The agent platform type. 0=Linux Docker, 7=EKS Linux. Defaults to 0.
+        job: Return a job_id to follow with job_status or job_wait until the host is running. Defaults to False.
     """
     validate_required(friendly_name, "Friendly name")
     validate_required(capacity, "Instance capacity/type")
@@ -56,10 +99,15 @@ def host_create(tenant_id: str, friendly_name: str, capacity: str, agent_platfor
         "Capacity": capacity,
         "AgentPlatform": agent_platform,
     }
-    return hosts.create(body)
+    with invalidating(tenant_id, "hosts", friendly_name):
+        result = hosts.create(body)
+    if not job:
+        return result
+    name = hosts.name_from_body(body)
+    return start_job(result, "host_create", tenant_id, "hosts", name, lambda: _host_ready(hosts, name))
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def host_delete(tenant_id: str, name: str) -> str:
     """Terminate a host in a DuploCloud tenant.
@@ -70,10 +118,18 @@ def host_delete(tenant_id: str, name: str) -> str:
     """
     validate_required(name, "Host name")
     hosts = _get_host_resource(tenant_id)
-    return hosts.delete(name)
+    with invalidating(tenant_id, "hosts", name):
+        return hosts.delete(name)
 
 
-@mcp.tool()
+def _reboot_host(tenant_id: str, name: str):
+    validate_required(name, "Host name")
+    hosts = _get_host_resource(tenant_id)
+    with invalidating(tenant_id, "hosts", name):
+        return hosts.reboot(name)
+
+
+@tool()
 @handle_duplo_errors
 def host_reboot(tenant_id: str, name: str) -> str:
     """Reboot a host in a DuploCloud tenant.
@@ -82,6 +138,21 @@ def host_reboot(tenant_id: str, name: str) -> str:
         tenant_id: The tenant ID containing the host.
         name: The host name to reboot.
     """
-    validate_required(name, "Host name")
-    hosts = _get_host_resource(tenant_id)
-    return hosts.reboot(name)
+    return _reboot_host(tenant_id, name)
+
+
+@tool()
+@handle_duplo_errors
+def host_reboot_many(
+    tenant_id: str, names: list[str], concurrency: int | None = None, timeout: float | None = None
+) -> str:
+    """Reboot several hosts in a tenant concurrently. A failing host does not stop the others.
+
+    Args:
+        tenant_id: The tenant ID containing the hosts.
+        names: The host names to reboot.
+        concurrency: Maximum number of hosts to reboot at once. Defaults to DUPLO_BATCH_CONCURRENCY (4).
+        timeout: Seconds each reboot may take before it is reported as timed out. Defaults to DUPLO_BATCH_TIMEOUT (60).
+    """
+    _get_host_resource(tenant_id)
+    return run_batch(names, lambda name: _reboot_host(tenant_id, name), concurrency, timeout)
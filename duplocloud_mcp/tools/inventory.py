@@ -0,0 +1,142 @@
+from duplocloud_mcp.batch import run_batch
+from duplocloud_mcp.cache import PORTAL, cache_key, cached_read, indexed_list
+from duplocloud_mcp.client import get_portal_resource, get_tenant_client
+from duplocloud_mcp.errors import handle_duplo_errors
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.server import tool
+
+
+def _list_services(tenant_id: str, fresh: bool):
+    svc = get_tenant_client(tenant_id).load("service")
+    return indexed_list(tenant_id, "service", svc.list, fresh=fresh)
+
+
+def _list_ecs_services(tenant_id: str, fresh: bool):
+    ecs = get_tenant_client(tenant_id).load("ecs")
+    return cached_read(tenant_id, "ecs", "list_services", (), ecs.list_services, fresh=fresh)
+
+
+def _service_terms(tenant_id: str, record: dict) -> tuple:
+    # Service records keep the image under Template.Containers; the SDK knows where to look.
+    svc = get_tenant_client(tenant_id).load("service")
+    try:
+        image = svc.image_from_body(record)
+    except (KeyError, TypeError):
+        image = None
+    return record.get("Name"), image
+
+
+def _ecs_terms(tenant_id: str, record: dict) -> tuple:
+    return record.get("Name"), record.get("TaskDefinition")
+
+
+# kind -> (per-tenant listing, values of a record a query is matched against). Listings share
+# their cache entries with service_list / ecs_service_list.
+SOURCES = {
+    "service": (_list_services, _service_terms),
+    "ecs": (_list_ecs_services, _ecs_terms),
+}
+
+
+def _matches(terms: tuple, query: str) -> bool:
+    return any(query in str(term or "").lower() for term in terms)
+
+
+def _select_tenants(records: list, wanted: list[str] | None) -> dict[str, str]:
+    """Map tenant ID to tenant name, keeping only tenants whose name or ID is in ``wanted``."""
+    wanted_set = {w.strip() for w in wanted or [] if w and w.strip()}
+    selected = {}
+    for record in records or []:
+        tenant_id, name = record.get("TenantId"), record.get("AccountName")
+        if not tenant_id:
+            continue
+        if wanted_set and tenant_id not in wanted_set and name not in wanted_set:
+            continue
+        selected[tenant_id] = name
+    return selected
+
+
+@tool()
+@handle_duplo_errors
+def inventory_search(
+    query: str | None = None,
+    kind: str = "service",
+    tenants: list[str] | None = None,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+    concurrency: int | None = None,
+) -> str:
+    """Search services across all tenants at once, e.g. to find where an image is running.
+
+    Tenants are listed in parallel and the matching records are merged, each tagged with
+    TenantId and TenantName. Tenants that fail are reported under "failed_tenants".
+
+    Args:
+        query: Case-insensitive text matched against service names and images (task definitions for ECS).
+            Omit to return every service.
+        kind: What to search: "service" (DuploCloud services) or "ecs" (ECS services). Defaults to "service".
+        tenants: Tenant names or IDs to search. Defaults to all tenants.
+        fields: Comma-separated dotted field paths to return (e.g. TenantName,Name,Image). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return all matches.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
+        concurrency: Maximum number of tenants to query at once. Defaults to DUPLO_BATCH_CONCURRENCY (4).
+    """
+    if kind not in SOURCES:
+        raise ValueError(f"Unknown kind '{kind}'; expected one of: {', '.join(SOURCES)}")
+    list_fn, terms = SOURCES[kind]
+    needle = (query or "").strip().lower()
+    key = cache_key(PORTAL, "inventory", kind, (needle, tuple(sorted(tenants or []))))
+    failed: list[dict] = []
+    searched: list[int] = []
+
+    def fan_out():
+        tenant_records = indexed_list(PORTAL, "tenant", get_portal_resource("tenant").list, fresh=fresh)
+        names = _select_tenants(tenant_records, tenants)
+        searched.append(len(names))
+        if not names:
+            return []
+        batch = run_batch(list(names), lambda tenant_id: list_fn(tenant_id, fresh), concurrency)
+        merged = []
+        for row in batch["results"]:
+            tenant_id = row["target"]
+            if row["status"] != "ok":
+                # Timed-out rows carry a detail instead of an error.
+                error = row.get("error") or row.get("detail")
+                failed.append(
+                    {"TenantId": tenant_id, "TenantName": names[tenant_id], "status": row["status"], "error": error}
+                )
+                continue
+            for record in row["result"] or []:
+                if isinstance(record, dict) and (not needle or _matches(terms(tenant_id, record), needle)):
+                    merged.append({"TenantId": tenant_id, "TenantName": names[tenant_id], **record})
+        return merged
+
+    result = paginate(key, fan_out, limit, cursor, fields)
+    if isinstance(result, list):
+        result = {"items": result, "next_cursor": None, "total": len(result)}
+    if searched:
+        result["tenants_searched"] = searched[0]
+        result["failed_tenants"] = failed
+    return result
+
+
+@tool()
+@handle_duplo_errors
+def service_list_all_tenants(
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
+    """List the services of every tenant in one call, querying tenants in parallel.
+
+    Args:
+        fields: Comma-separated dotted field paths to return (e.g. TenantName,Name,Image). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
+    """
+    return inventory_search(fields=fields, limit=limit, cursor=cursor, fresh=fresh)
@@ -0,0 +1,41 @@
+from mcp.server.fastmcp import Context
+
+from duplocloud_mcp.errors import handle_duplo_errors, validate_required
+from duplocloud_mcp.jobs import get_jobs
+from duplocloud_mcp.server import tool
+
+
+@tool()
+@handle_duplo_errors
+def job_status(job_id: str) -> str:
+    """Report whether the resource behind a job is ready yet, without waiting.
+
+    Args:
+        job_id: The job_id returned by a provisioning tool called with job=true.
+    """
+    validate_required(job_id, "Job ID")
+    return get_jobs().status(job_id)
+
+
+@tool()
+@handle_duplo_errors
+async def job_wait(job_id: str, timeout: float = 60, ctx: Context | None = None) -> str:
+    """Wait until the resource behind a job is ready or failed, reporting progress after every poll.
+
+    Args:
+        job_id: The job_id returned by a provisioning tool called with job=true.
+        timeout: Seconds to wait at most. Defaults to 60. The job keeps polling after a timeout; call again to
+            wait longer.
+    """
+    validate_required(job_id, "Job ID")
+    if timeout <= 0:
+        raise ValueError("timeout must be greater than 0")
+
+    async def progress(status: dict) -> None:
+        if ctx is not None:
+            message = f"{status['resource']} {status['name']}: {status['state']}"
+            if status["detail"] is not None:
+                message += f" ({status['detail']})"
+            await ctx.report_progress(status["polls"], message=message)
+
+    return await get_jobs().wait(job_id, timeout, progress)
@@ -0,0 +1,92 @@
+from duplocloud_mcp.cache import cached_read, indexed_get, indexed_list
+from duplocloud_mcp.client import get_tenant_client
+from duplocloud_mcp.encoding import dumps
+from duplocloud_mcp.errors import validate_required
+from duplocloud_mcp.executor import get_pool
+from duplocloud_mcp.server import mcp
+from duplocloud_mcp.subscriptions import register_feed
+
+JSON = "application/json"
+
+
+def _list_services(tenant_id: str, scope: str | None, fresh: bool):
+    svc = get_tenant_client(tenant_id).load("service")
+    return indexed_list(tenant_id, "service", svc.list, fresh=fresh)
+
+
+def _list_hosts(tenant_id: str, scope: str | None, fresh: bool):
+    hosts = get_tenant_client(tenant_id).load("hosts")
+    return indexed_list(tenant_id, "hosts", hosts.list, fresh=fresh)
+
+
+def _list_databases(tenant_id: str, scope: str | None, fresh: bool):
+    rds = get_tenant_client(tenant_id).load("rds")
+    return indexed_list(tenant_id, "rds", rds.list, fresh=fresh)
+
+
+def _list_ecs_tasks(tenant_id: str, service_name: str, fresh: bool):
+    ecs = get_tenant_client(tenant_id).load("ecs")
+    return cached_read(
+        tenant_id, "ecs", "list_tasks", (service_name,), lambda: ecs.list_tasks(service_name), fresh=fresh
+    )
+
+
+# URI kind -> listing polled for subscribers. Listings share their cache entries, and their
+# change feeds, with the list tools and *_changes tools.
+register_feed("services", _list_services, "service", ("Name",))
+register_feed("hosts", _list_hosts, "hosts", ("FriendlyName",))
+register_feed("databases", _list_databases, "rds", ("Identifier",))
+register_feed("ecs-tasks", _list_ecs_tasks, "ecs_tasks", ("TaskArn",), scoped=True)
+
+
+def _get(tenant_id: str, resource: str, name: str, label: str):
+    validate_required(tenant_id, "Tenant ID")
+    validate_required(name, label)
+    loaded = get_tenant_client(tenant_id).load(resource)
+    return indexed_get(tenant_id, resource, name, lambda: loaded.find(name))
+
+
+async def _read(func, *args) -> str:
+    return dumps(await get_pool().run(func, *args))
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/services", mime_type=JSON)
+async def services_resource(tenant_id: str) -> str:
+    """Services in a tenant. Subscribe to be notified when one is added, changed or removed."""
+    return await _read(_list_services, tenant_id, None, False)
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/services/{name}", mime_type=JSON)
+async def service_resource(tenant_id: str, name: str) -> str:
+    """One service in a tenant. Subscribe to be notified when it changes."""
+    return await _read(_get, tenant_id, "service", name, "Service name")
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/hosts", mime_type=JSON)
+async def hosts_resource(tenant_id: str) -> str:
+    """Hosts in a tenant. Subscribe to be notified when one is added, changed or removed."""
+    return await _read(_list_hosts, tenant_id, None, False)
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/hosts/{name}", mime_type=JSON)
+async def host_resource(tenant_id: str, name: str) -> str:
+    """One host in a tenant. Subscribe to be notified when it changes."""
+    return await _read(_get, tenant_id, "hosts", name, "Host name")
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/databases", mime_type=JSON)
+async def databases_resource(tenant_id: str) -> str:
+    """RDS instances in a tenant. Subscribe to be notified when one is added, changed or removed."""
+    return await _read(_list_databases, tenant_id, None, False)
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/databases/{identifier}", mime_type=JSON)
+async def database_resource(tenant_id: str, identifier: str) -> str:
+    """One RDS instance in a tenant. Subscribe to be notified when it changes."""
+    return await _read(_get, tenant_id, "rds", identifier, "Database identifier")
+
+
+@mcp.resource("duplo://tenants/{tenant_id}/ecs-services/{service_name}/tasks", mime_type=JSON)
+async def ecs_tasks_resource(tenant_id: str, service_name: str) -> str:
+    """Running tasks of an ECS service. Subscribe to be notified when a task starts, changes or stops."""
+    return await _read(_list_ecs_tasks, tenant_id, service_name, False)
@@ -1,45 +1,98 @@
-from duplocloud_mcp.client import get_client
+import functools
+
+from duplocloud_mcp.batch import run_batch
+from duplocloud_mcp.cache import cache_key, indexed_get, indexed_list, invalidating
+from duplocloud_mcp.changes import changes_since
+from duplocloud_mcp.client import get_tenant_client
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.jobs import PENDING, READY, start_job
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.projection import project
+from duplocloud_mcp.resilience import idempotent
+from duplocloud_mcp.server import tool
 
 
 def _get_service_resource(tenant_id: str):
     """Get a service resource configured for the given tenant."""
     validate_required(tenant_id, "Tenant ID")
-    client = get_client()
-    client.tenantid = tenant_id.strip()
-    return client.load("service")
+    return get_tenant_client(tenant_id).load("service")
+
+
+def _pod_names(svc, name: str) -> frozenset:
+    return frozenset(pod.get("InstanceId") for pod in svc.pods(name) or ())
 
 
-@mcp.tool()
+def _service_ready(svc, name: str, old_pods: frozenset = frozenset()):
+    """Readiness check for a service: every replica has a new pod whose current status is its desired status.
+
+    Pods named in ``old_pods`` were running before the call and do not count, so a restart is only ready
+    once the rollover has replaced them.
+    """
+    replicas = svc.find(name).get("Replicas") or 0
+    pods = [pod for pod in svc.pods(name) or () if pod.get("InstanceId") not in old_pods]
+    running = sum(1 for pod in pods if pod.get("CurrentStatus") == pod.get("DesiredStatus") == 1)
+    return (READY if running >= replicas else PENDING), {"running": running, "replicas": replicas}
+
+
+@tool()
 @handle_duplo_errors
-def service_list(tenant_id: str) -> str:
+def service_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all services in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list services for.
+        fields: Comma-separated dotted field paths to return (e.g. Name,Image,Replicas). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
+    """
+    svc = _get_service_resource(tenant_id)
+    key = cache_key(tenant_id, "service", "list")
+    return paginate(key, lambda: indexed_list(tenant_id, "service", svc.list, fresh=fresh), limit, cursor, fields)
+
+
+@tool()
+@handle_duplo_errors
+def service_changes(tenant_id: str, since: str | None = None, fields: str | None = None, fresh: bool = False) -> str:
+    """Return the services added, modified or removed in a tenant since an earlier service_changes call.
+
+    Args:
+        tenant_id: The tenant ID to watch services in.
+        since: The version value from a previous service_changes call. Omit to get every service and a first version.
+        fields: Comma-separated dotted field paths to return (e.g. Name,Image,Replicas). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     svc = _get_service_resource(tenant_id)
-    return svc.list()
+    records = indexed_list(tenant_id, "service", svc.list, fresh=fresh)
+    return changes_since(tenant_id, "service", records, since, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def service_get(tenant_id: str, name: str) -> str:
+def service_get(tenant_id: str, name: str, fields: str | None = None, fresh: bool = False) -> str:
     """Get details of a specific service by name.
 
     Args:
         tenant_id: The tenant ID containing the service.
         name: The service name to look up.
+        fields: Comma-separated dotted field paths to return (e.g. Name,Image,Replicas). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(name, "Service name")
     svc = _get_service_resource(tenant_id)
-    return svc.find(name)
+    result = indexed_get(tenant_id, "service", name, lambda: svc.find(name), fresh=fresh)
+    return project(result, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def service_create(tenant_id: str, name: str, image: str, replicas: int = 1) -> str:
+def service_create(tenant_id: str, name: str, image: str, replicas: int = 1, job: bool = False) -> str:
     """Create a new service in a DuploCloud tenant.
 
     Args:
@@ -47,6 +100,7 @@ def service_create(tenant_id: str, name: str, image: str, replicas: int = 1) ->
         name: Name for the new service.
         image: Docker image to deploy (e.g. nginx:latest).
         replicas: Number of replicas to run. Defaults to 1.
+        job: Return a job_id to follow with job_status or job_wait until the replicas are running. Defaults to False.
     """
     validate_required(name, "Service name")
     validate_required(image, "Docker image")
@@ -56,10 +110,35 @@ def service_create(tenant_id: str, name: str, image: str, replicas: int = 1) ->
         "Image": image,
         "Replicas": replicas,
     }
-    return svc.create(body)
+    with invalidating(tenant_id, "service", name):
+        result = svc.create(body)
+    if not job:
+        return result
+    return start_job(result, "service_create", tenant_id, "service", name, lambda: _service_ready(svc, name))
 
 
-@mcp.tool()
+@idempotent
+def _update_service(tenant_id: str, name: str, image: str | None, replicas: int | None) -> dict:
+    validate_required(name, "Service name")
+    svc = _get_service_resource(tenant_id)
+    if not image and replicas is None:
+        raise ValueError("Provide at least one field to update (image or replicas)")
+    with invalidating(tenant_id, "service", name):
+        if image:
+            svc.update_image(name, image)
+        if replicas is not None:
+            svc.update_replicas(name, replicas)
+    return {"message": f"Service '{name}' updated"}
+
+
+def _restart_service(tenant_id: str, name: str):
+    validate_required(name, "Service name")
+    svc = _get_service_resource(tenant_id)
+    with invalidating(tenant_id, "service", name):
+        return svc.restart(name)
+
+
+@tool()
 @handle_duplo_errors
 def service_update(tenant_id: str, name: str, image: str | None = None, replicas: int | None = None) -> str:
     """Update an existing service. Provide only the fields to change.
@@ -70,18 +149,10 @@ def service_update(tenant_id: str, name: str, image: str | None = None, replicas
         image: New Docker image (optional).
         replicas: New replica count (optional).
     """
-    validate_required(name, "Service name")
-    svc = _get_service_resource(tenant_id)
-    if image:
-        svc.update_image(name, image)
-    if replicas is not None:
-        svc.update_replicas(name, replicas)
-    if not image and replicas is None:
-        return {"error": "Provide at least one field to update (image or replicas)", "code": 400}
-    return {"message": f"Service '{name}' updated"}
+    return _update_service(tenant_id, name, image, replicas)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def service_delete(tenant_id: str, name: str) -> str:
     """Delete a service from a DuploCloud tenant.
@@ -92,18 +163,68 @@ def service_delete(tenant_id: str, name: str) -> str:
     """
     validate_required(name, "Service name")
     svc = _get_service_resource(tenant_id)
-    return svc.delete(name)
+    with invalidating(tenant_id, "service", name):
+        return svc.delete(name)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def service_restart(tenant_id: str, name: str) -> str:
+def service_restart(tenant_id: str, name: str, job: bool = False) -> str:
     """Restart a service, triggering a rolling redeployment.
 
     Args:
         tenant_id: The tenant ID containing the service.
         name: The service name to restart.
+        job: Return a job_id to follow with job_status or job_wait until the replicas are running. Defaults to False.
     """
+    if not job:
+        return _restart_service(tenant_id, name)
     validate_required(name, "Service name")
     svc = _get_service_resource(tenant_id)
-    return svc.restart(name)
+    old_pods = _pod_names(svc, name)
+    result = _restart_service(tenant_id, name)
+    check = functools.partial(_service_ready, svc, name, old_pods)
+    return start_job(result, "service_restart", tenant_id, "service", name, check, old_pods)
+
+
+@tool()
+@handle_duplo_errors
+def service_update_many(
+    tenant_id: str,
+    names: list[str],
+    image: str | None = None,
+    replicas: int | None = None,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+) -> str:
+    """Update several services in a tenant concurrently. A failing service does not stop the others.
+
+    Args:
+        tenant_id: The tenant ID containing the services.
+        names: The service names to update.
+        image: New Docker image for every service (optional).
+        replicas: New replica count for every service (optional).
+        concurrency: Maximum number of services to update at once. Defaults to DUPLO_BATCH_CONCURRENCY (4).
+        timeout: Seconds each update may take before it is reported as timed out. Defaults to DUPLO_BATCH_TIMEOUT (60).
+    """
+    _get_service_resource(tenant_id)
+    if not image and replicas is None:
+        return {"error": "Provide at least one field to update (image or replicas)", "code": 400}
+    return run_batch(names, lambda name: _update_service(tenant_id, name, image, replicas), concurrency, timeout)
+
+
+@tool()
+@handle_duplo_errors
+def service_restart_many(
+    tenant_id: str, names: list[str], concurrency: int | None = None, timeout: float | None = None
+) -> str:
+    """Restart several services in a tenant concurrently. A failing service does not stop the others.
+
+    Args:
+        tenant_id: The tenant ID containing the services.
+        names: The service names to restart.
+        concurrency: Maximum number of services to restart at once. Defaults to DUPLO_BATCH_CONCURRENCY (4).
+        timeout: Seconds each restart may take before it is reported as timed out. Defaults to DUPLO_BATCH_TIMEOUT (60).
+    """
+    _get_service_resource(tenant_id)
+    return run_batch(names, lambda name: _restart_service(tenant_id, name), concurrency, timeout)
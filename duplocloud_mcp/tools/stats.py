@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+
+from duplocloud_mcp.cache import get_cache, get_index
+from duplocloud_mcp.changes import get_tracker
+from duplocloud_mcp.client import get_http_stats
+from duplocloud_mcp.errors import handle_duplo_errors
+from duplocloud_mcp.executor import get_pool
+from duplocloud_mcp.jobs import get_jobs
+from duplocloud_mcp.metrics import get_metrics
+from duplocloud_mcp.pagination import get_store
+from duplocloud_mcp.persist import get_persistent_store
+from duplocloud_mcp.ratelimit import get_limiter
+from duplocloud_mcp.resilience import resilience_stats
+from duplocloud_mcp.server import tool
+from duplocloud_mcp.sessions import get_session_limiter
+from duplocloud_mcp.singleflight import get_flight
+from duplocloud_mcp.subscriptions import get_subscriptions
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _process_stats() -> dict:
+    """Resident memory of this process, now (Linux only) and at its peak, and its thread count."""
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        rss = None
+    peak = None
+    if resource is not None:
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {"rss_bytes": rss, "peak_rss_bytes": peak, "threads": threading.active_count()}
+
+
+@tool()
+@handle_duplo_errors
+def server_stats() -> str:
+    """Report runtime statistics for this MCP server (memory, workers, sessions, cache, HTTP, rate limits, retries)."""
+    store = get_persistent_store()
+    return {
+        "process": _process_stats(),
+        "workers": get_pool().stats(),
+        "sessions": get_session_limiter().stats(),
+        "cache": get_cache().stats(),
+        "index": get_index().stats(),
+        "persistent": store.stats() if store is not None else None,
+        "coalescing": get_flight().stats(),
+        "http": get_http_stats(),
+        "rate_limit": get_limiter().stats(),
+        "resilience": resilience_stats(),
+        "pages": get_store().stats(),
+        "changes": get_tracker().stats(),
+        "subscriptions": get_subscriptions().stats(),
+        "jobs": get_jobs().stats(),
+    }
+
+
+@tool()
+@handle_duplo_errors
+def metrics_dump(format: str = "json") -> str:
+    """Dump per-tool metrics: calls, error codes, latency percentiles, result sizes, cache and portal request counts.
+
+    Args:
+        format: "json" for a per-tool summary, or "prometheus" for the Prometheus text format
+            (the same data the /metrics endpoint serves over HTTP).
+    """
+    if format == "prometheus":
+        return get_metrics().render()
+    if format != "json":
+        raise ValueError('format must be "json" or "prometheus"')
+    return get_metrics().snapshot()
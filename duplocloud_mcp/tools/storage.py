@@ -1,43 +1,63 @@
-from duplocloud_mcp.client import get_client
+from duplocloud.errors import DuploError
+
+from duplocloud_mcp.cache import cache_key, indexed_get, indexed_list, invalidating
+from duplocloud_mcp.changes import record_etag
+from duplocloud_mcp.client import get_tenant_client
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.meta import set_meta
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.projection import project
+from duplocloud_mcp.resilience import idempotent
+from duplocloud_mcp.server import tool
 
 
 def _get_s3_resource(tenant_id: str):
     """Get an S3 resource configured for the given tenant."""
     validate_required(tenant_id, "Tenant ID")
-    client = get_client()
-    client.tenantid = tenant_id.strip()
-    return client.load("s3")
+    return get_tenant_client(tenant_id).load("s3")
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def bucket_list(tenant_id: str) -> str:
+def bucket_list(
+    tenant_id: str,
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
     """List all S3 buckets in a DuploCloud tenant.
 
     Args:
         tenant_id: The tenant ID to list buckets for.
+        fields: Comma-separated dotted field paths to return (e.g. Name,EnableVersioning). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     s3 = _get_s3_resource(tenant_id)
-    return s3.list()
+    key = cache_key(tenant_id, "s3", "list")
+    return paginate(key, lambda: indexed_list(tenant_id, "s3", s3.list, fresh=fresh), limit, cursor, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def bucket_get(tenant_id: str, name: str) -> str:
+def bucket_get(tenant_id: str, name: str, fields: str | None = None, fresh: bool = False) -> str:
     """Get details of a specific S3 bucket.
 
     Args:
         tenant_id: The tenant ID containing the bucket.
         name: The bucket name to look up.
+        fields: Comma-separated dotted field paths to return (e.g. Name,EnableVersioning). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(name, "Bucket name")
     s3 = _get_s3_resource(tenant_id)
-    return s3.find(name)
+    result = indexed_get(tenant_id, "s3", name, lambda: s3.find(name), fresh=fresh)
+    return project(result, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def bucket_create(tenant_id: str, name: str) -> str:
     """Create a new S3 bucket in a DuploCloud tenant.
@@ -49,28 +69,53 @@ def bucket_create(tenant_id: str, name: str) -> str:
     validate_required(name, "Bucket name")
     s3 = _get_s3_resource(tenant_id)
     body = {"Name": name}
-    return s3.create(body)
+    with invalidating(tenant_id, "s3", name):
+        return s3.create(body)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def bucket_update(tenant_id: str, name: str, versioning: bool | None = None) -> str:
+@idempotent
+def bucket_update(tenant_id: str, name: str, versioning: bool | None = None, etag: str | None = None) -> str:
     """Update an S3 bucket configuration.
 
+    Returns the portal's update response, or the bucket when nothing needed to change. The bucket's etag
+    and the changed fields are returned in the result metadata.
+
     Args:
         tenant_id: The tenant ID containing the bucket.
         name: The bucket name to update.
         versioning: Enable or disable versioning (optional).
+        etag: Only update if the bucket still matches this etag from an earlier bucket_update (optional). Call
+            without changes to get the current etag.
     """
     validate_required(name, "Bucket name")
     s3 = _get_s3_resource(tenant_id)
+    # Always compare and write against the portal's copy: a cached record may be up to a TTL old, and
+    # writing it back would revert fields changed in the meantime.
     current = s3.find(name)
-    if versioning is not None:
-        current["EnableVersioning"] = versioning
-    return s3.update(name=name, body=current)
-
-
-@mcp.tool()
+    if etag and record_etag(current) != etag.strip():
+        raise DuploError(
+            f"Bucket {name} was modified since etag {etag.strip()}; current etag is {record_etag(current)}", 412
+        )
+
+    changes = {}
+    if versioning is not None and current.get("EnableVersioning") != versioning:
+        changes["EnableVersioning"] = versioning
+    set_meta("duplocloud/changed", list(changes))
+    if not changes:
+        set_meta("duplocloud/etag", record_etag(current))
+        return current
+
+    with invalidating(tenant_id, "s3", name):
+        result = s3.update(name=name, body={**current, **changes})
+    # Only an update response that is the stored bucket gives its etag; reading it back would cost another call.
+    if isinstance(result, dict) and result.get("Name") == current.get("Name"):
+        set_meta("duplocloud/etag", record_etag(result))
+    return result
+
+
+@tool()
 @handle_duplo_errors
 def bucket_delete(tenant_id: str, name: str) -> str:
     """Delete an S3 bucket from a DuploCloud tenant.
@@ -81,4 +126,5 @@ def bucket_delete(tenant_id: str, name: str) -> str:
     """
     validate_required(name, "Bucket name")
     s3 = _get_s3_resource(tenant_id)
-    return s3.delete(name)
+    with invalidating(tenant_id, "s3", name):
+        return s3.delete(name)
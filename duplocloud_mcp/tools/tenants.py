@@ -1,32 +1,49 @@
-from duplocloud_mcp.client import get_client
+from duplocloud_mcp.cache import PORTAL, cache_key, indexed_get, indexed_list, invalidating
+from duplocloud_mcp.client import get_portal_resource
 from duplocloud_mcp.errors import handle_duplo_errors, validate_required
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.pagination import paginate
+from duplocloud_mcp.projection import project
+from duplocloud_mcp.server import tool
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def tenant_list() -> str:
-    """List all tenants accessible in the DuploCloud portal."""
-    client = get_client()
-    tenants = client.load("tenant")
-    return tenants.list()
+def tenant_list(
+    fields: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fresh: bool = False,
+) -> str:
+    """List all tenants accessible in the DuploCloud portal.
+
+    Args:
+        fields: Comma-separated dotted field paths to return (e.g. AccountName,TenantId). Defaults to all fields.
+        limit: Maximum number of records per page. Omit to return the whole list.
+        cursor: The next_cursor value from a previous page, to fetch the page after it.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
+    """
+    tenants = get_portal_resource("tenant")
+    key = cache_key(PORTAL, "tenant", "list")
+    return paginate(key, lambda: indexed_list(PORTAL, "tenant", tenants.list, fresh=fresh), limit, cursor, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
-def tenant_get(name: str) -> str:
+def tenant_get(name: str, fields: str | None = None, fresh: bool = False) -> str:
     """Get details of a specific DuploCloud tenant by name.
 
     Args:
         name: The tenant name to look up.
+        fields: Comma-separated dotted field paths to return (e.g. AccountName,TenantId). Defaults to all fields.
+        fresh: Bypass the response cache and fetch from the portal. Defaults to False.
     """
     validate_required(name, "Tenant name")
-    client = get_client()
-    tenants = client.load("tenant")
-    return tenants.find(name)
+    tenants = get_portal_resource("tenant")
+    result = indexed_get(PORTAL, "tenant", name, lambda: tenants.find(name), fresh=fresh)
+    return project(result, fields)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def tenant_create(account_name: str, plan_id: str) -> str:
     """Create a new DuploCloud tenant.
@@ -37,13 +54,13 @@ def tenant_create(account_name: str, plan_id: str) -> str:
     """
     validate_required(account_name, "Account name")
     validate_required(plan_id, "Plan ID")
-    client = get_client()
-    tenants = client.load("tenant")
+    tenants = get_portal_resource("tenant")
     body = {"AccountName": account_name, "PlanID": plan_id}
-    return tenants.create(body)
+    with invalidating(PORTAL, "tenant", account_name):
+        return tenants.create(body)
 
 
-@mcp.tool()
+@tool()
 @handle_duplo_errors
 def tenant_delete(name: str) -> str:
     """Delete a DuploCloud tenant by name.
@@ -52,6 +69,6 @@ def tenant_delete(name: str) -> str:
         name: The tenant name to delete.
     """
     validate_required(name, "Tenant name")
-    client = get_client()
-    tenants = client.load("tenant")
-    return tenants.delete(name)
+    tenants = get_portal_resource("tenant")
+    with invalidating(PORTAL, "tenant", name):
+        return tenants.delete(name)
@@ -0,0 +1,212 @@
+import contextlib
+import contextvars
+import importlib
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Any, Protocol
+
+from duplocloud_mcp.config import env_float, env_int
+from duplocloud_mcp.encoding import dumps
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_TRACE_FILE = os.path.join(tempfile.gettempdir(), "duplocloud-mcp-traces.jsonl")
+DEFAULT_TRACE_FILE_MAX_MB = 50
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("duplo_span", default=None)
+
+_tracer: "Tracer | None" = None
+_loaded = False
+_lock = threading.Lock()
+
+
+class SpanExporter(Protocol):
+    """Receives finished spans, as dicts using OpenTelemetry field names, once per trace."""
+
+    def export(self, spans: list[dict]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class FileExporter:
+    """Appends spans to a local JSON-lines file, one span per line. Works offline.
+
+    When the file grows past ``max_bytes`` it is moved to ``<path>.1`` (replacing the previous one)
+    and a new file is started, so at most about twice ``max_bytes`` is kept on disk.
+    """
+
+    def __init__(self, path: str = DEFAULT_TRACE_FILE, max_bytes: int = DEFAULT_TRACE_FILE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[dict]) -> None:
+        lines = "".join(dumps(span) + "\n" for span in spans)
+        with self._lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(lines) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            except OSError as e:
+                logger.warning("Cannot write traces to %s: %s", self.path, e)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class Span:
+    """One timed operation in a trace. Attributes are plain values keyed by dotted names."""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace: "_Trace", parent_id: str | None, attributes: dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = {k: v for k, v in attributes.items() if v is not None}
+        self.error: str | None = None
+
+    def set(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is off, so instrumented code needs no checks."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+
+_NOOP = contextlib.nullcontext(_NoopSpan())
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans", "exported", "lock")
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[dict] = []
+        self.exported = False
+        self.lock = threading.Lock()
+
+
+class Tracer:
+    """Creates spans and hands each finished trace to the exporter when its root span ends.
+
+    The current span lives in a context variable, so spans opened on worker threads (which run in
+    copies of the tool call's context) become children of the tool call's span. A child that ends
+    after its root, such as a timed-out batch item, is exported on its own.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any):
+        parent = _current.get()
+        trace = parent.trace if parent is not None else _Trace()
+        span = Span(name, trace, parent.span_id if parent is not None else None, attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            with trace.lock:
+                if trace.exported:
+                    batch = [span.to_dict()]
+                else:
+                    trace.spans.append(span.to_dict())
+                    batch = trace.spans if parent is None else None
+                    trace.exported = parent is None
+            if batch is not None:
+                self._export(batch)
+
+    def _export(self, spans: list[dict]) -> None:
+        try:
+            self.exporter.export(spans)
+        except Exception:
+            logger.exception("Trace exporter %s failed", type(self.exporter).__name__)
+
+
+def span(name: str, **attributes: Any):
+    """Open a span named ``name`` under the current one; a no-op context while tracing is off.
+
+    Attributes whose value is None are left out.
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, **attributes)
+
+
+def _build_exporter(name: str) -> SpanExporter:
+    """Build the exporter named by DUPLO_TRACE_EXPORTER: ``file`` or ``package.module:factory``."""
+    if name == "file":
+        return FileExporter(
+            os.environ.get("DUPLO_TRACE_FILE", "").strip() or DEFAULT_TRACE_FILE,
+            int(env_float("DUPLO_TRACE_FILE_MAX_MB", DEFAULT_TRACE_FILE_MAX_MB) * 1024 * 1024),
+        )
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown trace exporter {name!r}; use 'file' or 'package.module:factory'")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def get_tracer() -> Tracer | None:
+    """Return the shared tracer, or None unless DUPLO_TRACING is set."""
+    global _tracer, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                if env_int("DUPLO_TRACING", 0):
+                    name = os.environ.get("DUPLO_TRACE_EXPORTER", "").strip() or "file"
+                    try:
+                        _tracer = Tracer(_build_exporter(name))
+                    except (ImportError, AttributeError, TypeError, ValueError) as e:
+                        logger.warning("Cannot load trace exporter %r, tracing is off: %s", name, e)
+                _loaded = True
+    return _tracer
+
+
+def reset_tracer() -> None:
+    """Shut down and discard the shared tracer. Used in testing."""
+    global _tracer, _loaded
+    with _lock:
+        if _tracer is not None:
+            _tracer.exporter.shutdown()
+        _tracer = None
+        _loaded = False
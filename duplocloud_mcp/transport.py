@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from duplocloud_mcp.config import env_float, env_int
+
+logger = logging.getLogger("duplocloud-mcp")
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_KEEPALIVE = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+
+class HttpSettings(NamedTuple):
+    pool_size: int = DEFAULT_POOL_SIZE
+    keepalive: float = DEFAULT_KEEPALIVE
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+def http_settings() -> HttpSettings:
+    """Read the portal transport settings from environment variables."""
+    if env_int("DUPLO_HTTP2", 0):
+        logger.warning("DUPLO_HTTP2 is set, but the portal session only speaks HTTP/1.1; ignoring it")
+    return HttpSettings(
+        pool_size=max(env_int("DUPLO_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE), 1),
+        keepalive=env_float("DUPLO_HTTP_KEEPALIVE", DEFAULT_KEEPALIVE),
+        connect_timeout=env_float("DUPLO_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=env_float("DUPLO_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+    )
+
+
+class PoolStats:
+    """Counters for connection checkouts across every connection pool of a session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reused = 0
+        self.expired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, reused: bool, expired: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.reused += reused
+            self.expired += expired
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "reused": self.reused,
+                "new_connections": self.requests - self.reused,
+                "expired_idle": self.expired,
+                "reuse_ratio": round(self.reused / self.requests, 3) if self.requests else 0.0,
+                "wait_ms_avg": round(self.wait_total / self.requests * 1000, 3) if self.requests else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+
+
+class _TrackedPoolMixin:
+    """Times connection checkouts and closes connections that sat idle longer than the keep-alive."""
+
+    pool_stats: PoolStats
+    keepalive: float
+
+    def _get_conn(self, timeout=None):
+        start = time.monotonic()
+        conn = super()._get_conn(timeout)
+        waited = time.monotonic() - start
+        connected = getattr(conn, "sock", None) is not None
+        idle_since = getattr(conn, "_duplo_idle_since", None)
+        expired = connected and idle_since is not None and time.monotonic() - idle_since > self.keepalive
+        if expired:
+            conn.close()
+        self.pool_stats.record(waited, connected and not expired, expired)
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._duplo_idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with a blocking, fixed-size connection pool per host and checkout statistics.
+
+    The pool blocks instead of opening throwaway connections when every connection is busy, so
+    connection count (and TLS handshakes) stay bounded under load; the time spent waiting shows
+    up in the stats instead.
+    """
+
+    def __init__(self, settings: HttpSettings):
+        self.settings = settings
+        self.pool_stats = PoolStats()
+        super().__init__(pool_connections=4, pool_maxsize=settings.pool_size, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"pool_stats": self.pool_stats, "keepalive": self.settings.keepalive}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("TrackedHTTPConnectionPool", (_TrackedPoolMixin, HTTPConnectionPool), attrs),
+            "https": type("TrackedHTTPSConnectionPool", (_TrackedPoolMixin, HTTPSConnectionPool), attrs),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.settings.pool_size,
+            "keepalive": self.settings.keepalive,
+            **self.pool_stats.snapshot(),
+        }
+
+
+def build_session(settings: HttpSettings) -> requests.Session:
+    """Create the portal HTTP session with a pooled adapter mounted for both schemes."""
+    session = requests.Session()
+    adapter = PooledAdapter(settings)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def session_stats(session: requests.Session) -> dict:
+    """Return the pool statistics of a session built by :func:`build_session`."""
+    adapter = session.get_adapter("https://")
+    return adapter.stats() if isinstance(adapter, PooledAdapter) else {}
@@ -1,4 +1,4 @@
-from duplocloud_mcp.server import mcp
+from duplocloud_mcp.server import run
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    run()
@@ -2,15 +2,64 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from duplocloud_mcp.cache import reset_cache
+from duplocloud_mcp.changes import reset_tracker
 from duplocloud_mcp.client import reset_client
+from duplocloud_mcp.executor import reset_pool
+from duplocloud_mcp.jobs import reset_jobs
+from duplocloud_mcp.metrics import reset_metrics
+from duplocloud_mcp.pagination import reset_store
+from duplocloud_mcp.persist import reset_persistent_store
+from duplocloud_mcp.ratelimit import reset_limiter
+from duplocloud_mcp.resilience import reset_resilience
+from duplocloud_mcp.sessions import reset_session_limiter
+from duplocloud_mcp.singleflight import reset_flight
+from duplocloud_mcp.subscriptions import reset_subscriptions
+from duplocloud_mcp.tracing import reset_tracer
 
 
 @pytest.fixture(autouse=True)
 def _reset_client():
-    """Reset the singleton client before each test."""
+    """Reset the singleton client, retry policy, circuit breakers and rate limiter before each test."""
     reset_client()
+    reset_resilience()
+    reset_limiter()
     yield
     reset_client()
+    reset_resilience()
+    reset_limiter()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    """Start each test with an empty response cache, no persistent store and no in-flight reads."""
+    reset_cache()
+    reset_flight()
+    reset_persistent_store()
+    yield
+    reset_cache()
+    reset_flight()
+    reset_persistent_store()
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool():
+    """Discard the shared worker pool, per-session limits, tool metrics and tracer after each test."""
+    yield
+    reset_pool()
+    reset_session_limiter()
+    reset_metrics()
+    reset_tracer()
+
+
+@pytest.fixture(autouse=True)
+def _reset_store():
+    """Drop page snapshots, change feeds, resource subscriptions and jobs left over from a previous test."""
+    yield
+    reset_store()
+    reset_tracker()
+    reset_subscriptions()
+    reset_jobs()
 
 
 @pytest.fixture
@@ -112,3 +161,39 @@ def mock_ecs_resource():
     resource.update_image.return_value = {"message": "Updating a task definition and its corresponding service."}
     resource.delete_service.return_value = {"message": "ECS service deleted"}
     return resource
+
+
+@pytest.fixture(scope="session")
+def large_inventory():
+    """Realistic portal payloads for a big tenant: 1,000 hosts and 5,000 services."""
+    hosts = [
+        {
+            "FriendlyName": f"duploservices-prod-host{i:04d}",
+            "InstanceId": f"i-{i:017x}",
+            "Capacity": "t3.large",
+            "Status": "running",
+            "PrivateIpAddress": f"10.{i // 250}.{i % 250}.{i % 7 + 10}",
+            "Zone": i % 3,
+            "AgentPlatform": 0,
+            "IsMinion": True,
+            "Tags": [{"Key": "Team", "Value": "platform"}, {"Key": "CostCenter", "Value": f"cc-{i % 12}"}],
+            "MetaData": [{"Key": "OsDiskSize", "Value": "80"}],
+        }
+        for i in range(1000)
+    ]
+    services = [
+        {
+            "Name": f"svc-{i:04d}",
+            "Image": f"123456789012.dkr.ecr.us-west-2.amazonaws.com/app-{i % 40}:v1.{i % 17}.{i % 5}",
+            "Replicas": i % 4 + 1,
+            "AgentPlatform": 7,
+            "Cloud": 0,
+            "Volumes": "",
+            "OtherDockerConfig": '{"Env":[{"Name":"LOG_LEVEL","Value":"info"}]}',
+            "ExtraConfig": None,
+            "Tags": [{"Key": "Owner", "Value": f"team-{i % 9}"}],
+            "Template": {"Containers": [{"Name": f"svc-{i:04d}", "Ports": [80, 443], "Cpu": 0.25, "Memory": "512Mi"}]},
+        }
+        for i in range(5000)
+    ]
+    return {"hosts": hosts, "services": services}
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+from duplocloud.errors import DuploError
+
+from duplocloud_mcp.batch import run_batch
+
+
+def test_results_keep_input_order():
+    result = run_batch(["a", "b", "c"], lambda name: {"message": name.upper()})
+    assert [row["target"] for row in result["results"]] == ["a", "b", "c"]
+    assert [row["result"]["message"] for row in result["results"]] == ["A", "B", "C"]
+    assert result["succeeded"] == 3
+    assert result["failed"] == 0
+
+
+def test_names_are_stripped_and_deduplicated():
+    result = run_batch([" a ", "a", "", "b"], lambda name: name)
+    assert [row["target"] for row in result["results"]] == ["a", "b"]
+
+
+def test_empty_names_rejected():
+    with pytest.raises(ValueError, match="At least one name"):
+        run_batch([], lambda name: name)
+
+
+def test_invalid_limits_rejected():
+    with pytest.raises(ValueError, match="concurrency"):
+        run_batch(["a"], lambda name: name, concurrency=0)
+    with pytest.raises(ValueError, match="timeout"):
+        run_batch(["a"], lambda name: name, timeout=0)
+
+
+def test_errors_do_not_abort_others():
+    def func(name):
+        if name == "bad":
+            raise DuploError("not found", 404)
+        if name == "boom":
+            raise RuntimeError("boom")
+        return {"message": "ok"}
+
+    result = run_batch(["good", "bad", "boom", "also-good"], func)
+    statuses = {row["target"]: row for row in result["results"]}
+    assert statuses["good"]["status"] == "ok"
+    assert statuses["bad"] == {**statuses["bad"], "status": "error", "error": "not found", "code": 404}
+    assert statuses["boom"]["status"] == "error"
+    assert statuses["boom"]["code"] == 500
+    assert statuses["also-good"] == {**statuses["also-good"], "status": "ok", "result": {"message": "ok"}}
+    assert result["failed"] == 2
+
+
+def test_validation_errors_map_to_400():
+    def func(name):
+        raise ValueError("Service name is required and cannot be empty")
+
+    row = run_batch(["a"], func)["results"][0]
+    assert (row["status"], row["code"]) == ("error", 400)
+
+
+def test_slow_item_times_out_without_blocking_the_rest():
+    release = threading.Event()
+
+    def func(name):
+        if name == "slow":
+            release.wait(5)
+        return name
+
+    start = time.monotonic()
+    result = run_batch(["slow", "a", "b"], func, concurrency=2, timeout=0.2)
+    release.set()
+    assert time.monotonic() - start < 2
+    rows = {row["target"]: row for row in result["results"]}
+    assert rows["slow"]["status"] == "timeout"
+    assert "outcome unknown" in rows["slow"]["detail"]
+    assert "error" not in rows["slow"]
+    assert rows["a"]["status"] == rows["b"]["status"] == "ok"
+    assert (result["succeeded"], result["failed"], result["timed_out"]) == (2, 0, 1)
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    running = peak = 0
+
+    def func(name):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return name
+
+    run_batch([str(i) for i in range(8)], func, concurrency=3)
+    assert peak == 3
+
+
+def test_defaults_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_BATCH_CONCURRENCY", "1")
+    lock = threading.Lock()
+    running = peak = 0
+
+    def func(name):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    run_batch(["a", "b", "c"], func)
+    assert peak == 1
@@ -0,0 +1,110 @@
+"""Micro-benchmarks for per-call overhead. Run with ``pytest tests/test_benchmarks.py -s`` to see the numbers."""
+
+import json
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from duplocloud.client import DuploClient
+
+from bench.harness import format_report, run_benchmark
+from bench.mock_portal import PortalSettings
+from duplocloud_mcp import encoding
+from duplocloud_mcp.client import get_tenant_client
+from duplocloud_mcp.encoding import dumps_orjson, dumps_stdlib
+
+
+def _per_call_us(func, iterations: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def test_bench_resource_load_memoized(mock_env):
+    client = get_tenant_client("tid-001")
+    with patch.object(client.session, "request") as mock_request:
+        for kind in ("service", "hosts", "rds", "s3", "ecs"):
+            uncached = _per_call_us(lambda: DuploClient.load(client, kind), 200)
+            memoized = _per_call_us(lambda: client.load(kind), 200)
+            print(f"\nload({kind!r}): {uncached:.1f}us -> {memoized:.2f}us per call ({uncached / memoized:.0f}x)")
+            assert memoized < uncached
+        mock_request.assert_not_called()
+
+
+def test_bench_json_encoding(large_inventory):
+    def reference(data):
+        return json.dumps(data, default=str)
+
+    encoders = {"reference": reference, "stdlib compact": dumps_stdlib}
+    if encoding.orjson is not None:
+        encoders["orjson"] = dumps_orjson
+    for name, records in large_inventory.items():
+        baseline = _per_call_us(lambda: reference(records), 5)
+        for label, encoder in encoders.items():
+            elapsed = _per_call_us(lambda: encoder(records), 5)
+            size = len(encoder(records))
+            print(
+                f"\n{len(records)} {name} via {label}: {elapsed / 1000:.1f}ms, {size} bytes, {baseline / elapsed:.1f}x"
+            )
+        assert len(dumps_stdlib(records)) < len(reference(records))
+        if encoding.orjson is not None:
+            assert _per_call_us(lambda: dumps_orjson(records), 5) < baseline
+
+
+_STARTUP_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from duplocloud_mcp.server import load_tools, mcp
+imported = time.perf_counter()
+if sys.argv[1] == "eager":
+    load_tools()
+tools = asyncio.run(mcp.list_tools())
+listed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "list_tools_ms": (listed - start) * 1000,
+    "tools": len(tools),
+    "sdk_imported": "duplocloud.client" in sys.modules,
+}))
+"""
+
+
+def _startup(mode: str) -> dict:
+    runs = []
+    for _ in range(2):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _STARTUP_SCRIPT, mode], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(out.stdout))
+    return min(runs, key=lambda r: r["list_tools_ms"])
+
+
+def test_bench_startup_time():
+    lazy = _startup("lazy")
+    eager = _startup("eager")
+    for label, run in (("lazy", lazy), ("eager", eager)):
+        print(f"\nstartup ({label}): import {run['import_ms']:.0f}ms, first list_tools {run['list_tools_ms']:.0f}ms")
+    assert not lazy["sdk_imported"]
+    assert eager["sdk_imported"]
+    assert lazy["tools"] == eager["tools"]
+    assert lazy["list_tools_ms"] < eager["list_tools_ms"]
+
+
+async def test_bench_tools_against_mock_portal():
+    report = await run_benchmark(
+        ["service_list", "service_get", "host_get", "service_update"],
+        calls=60,
+        concurrency=4,
+        settings=PortalSettings(tenants=2, services=200, latency_ms=5),
+    )
+    print("\n" + format_report(report))
+    for name, result in report["tools"].items():
+        latency = result["latency_ms"]
+        assert result["errors"] == {}, name
+        assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    # Cached reads stay off the portal after the warm-up round; each update reads and then writes.
+    assert report["tools"]["service_list"]["portal_requests_per_call"] == 0
+    assert report["tools"]["service_update"]["portal_requests_per_call"] == 2
@@ -0,0 +1,257 @@
+import threading
+
+import pytest
+
+from duplocloud_mcp.cache import (
+    PORTAL,
+    RESOURCE_TTLS,
+    NameIndex,
+    ResponseCache,
+    cache_key,
+    cached_read,
+    get_cache,
+    get_index,
+    indexed_get,
+    indexed_list,
+    invalidating,
+    reset_cache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_miss_then_hit():
+    cache = ResponseCache()
+    key = cache_key("tid-001", "service", "list")
+    assert cache.get(key) == (False, None)
+    cache.set(key, [{"Name": "web-app"}])
+    assert cache.get(key) == (True, [{"Name": "web-app"}])
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_resource_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(default_ttl=30, ttls={"service": 5}, clock=clock)
+    svc_key = cache_key("tid-001", "service", "list")
+    host_key = cache_key("tid-001", "hosts", "list")
+    cache.set(svc_key, [])
+    cache.set(host_key, [])
+
+    clock.now = 6
+    assert cache.get(svc_key) == (False, None)
+    assert cache.get(host_key) == (True, [])
+    assert cache.stats()["entries"] == 1
+
+
+def test_zero_ttl_disables_caching():
+    cache = ResponseCache(ttls={"service": 0})
+    key = cache_key("tid-001", "service", "list")
+    cache.set(key, [])
+    assert cache.get(key) == (False, None)
+
+
+def test_lru_eviction_by_entry_count():
+    cache = ResponseCache(max_entries=2)
+    a, b, c = (cache_key("tid-001", "service", "get", (n,)) for n in "abc")
+    cache.set(a, 1)
+    cache.set(b, 2)
+    cache.get(a)
+    cache.set(c, 3)
+
+    assert cache.get(b) == (False, None)
+    assert cache.get(a) == (True, 1)
+    assert cache.get(c) == (True, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cap_evicts_oldest():
+    cache = ResponseCache(max_bytes=100)
+    first = cache_key("tid-001", "service", "list")
+    second = cache_key("tid-002", "service", "list")
+    cache.set(first, "x" * 60)
+    cache.set(second, "y" * 50)
+    assert cache.get(first) == (False, None)
+    assert cache.get(second) == (True, "y" * 50)
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_oversized_value_not_cached():
+    cache = ResponseCache(max_bytes=10)
+    key = cache_key("tid-001", "service", "list")
+    cache.set(key, "z" * 50)
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_resource_only():
+    cache = ResponseCache()
+    cache.set(cache_key("tid-001", "service", "list"), [])
+    cache.set(cache_key("tid-001", "service", "get", ("web-app",)), {})
+    cache.set(cache_key("tid-001", "hosts", "list"), [])
+    cache.set(cache_key("tid-002", "service", "list"), [])
+
+    assert cache.invalidate("tid-001", "service") == 2
+    assert cache.get(cache_key("tid-001", "hosts", "list"))[0]
+    assert cache.get(cache_key("tid-002", "service", "list"))[0]
+
+
+def test_invalidate_whole_tenant():
+    cache = ResponseCache()
+    cache.set(cache_key("tid-001", "service", "list"), [])
+    cache.set(cache_key("tid-001", "hosts", "list"), [])
+    assert cache.invalidate("tid-001") == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_read_fetches_once():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return ["a"]
+
+    assert cached_read("tid-001", "service", "list", (), fetch) == ["a"]
+    assert cached_read(" tid-001 ", "service", "list", (), fetch) == ["a"]
+    assert len(calls) == 1
+
+
+def test_cached_read_fresh_bypasses_and_refreshes():
+    values = iter([["old"], ["new"]])
+    cached_read("tid-001", "service", "list", (), lambda: next(values))
+    assert cached_read("tid-001", "service", "list", (), lambda: next(values), fresh=True) == ["new"]
+    assert cached_read("tid-001", "service", "list", (), lambda: ["unused"]) == ["new"]
+
+
+def test_cached_read_does_not_cache_errors():
+    def fail():
+        raise RuntimeError("portal down")
+
+    with pytest.raises(RuntimeError):
+        cached_read("tid-001", "service", "list", (), fail)
+    assert cached_read("tid-001", "service", "list", (), lambda: ["ok"]) == ["ok"]
+
+
+def test_invalidating_runs_even_when_write_fails():
+    cached_read("tid-001", "service", "list", (), lambda: ["a"])
+    with pytest.raises(RuntimeError):
+        with invalidating("tid-001", "service"):
+            raise RuntimeError("write failed")
+    assert get_cache().stats()["entries"] == 0
+
+
+def test_cache_configured_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_CACHE_TTL", "12")
+    monkeypatch.setenv("DUPLO_CACHE_TTL_SERVICE", "3")
+    monkeypatch.setenv("DUPLO_CACHE_MAX_ENTRIES", "50")
+    monkeypatch.setenv("DUPLO_CACHE_MAX_MB", "2")
+    reset_cache()
+    cache = get_cache()
+    assert cache.default_ttl == 12
+    assert cache.ttl_for("service") == 3
+    assert cache.ttl_for("hosts") == RESOURCE_TTLS["hosts"]
+    assert cache.ttl_for("unknown") == 12
+    assert cache.max_entries == 50
+    assert cache.max_bytes == 2 * 1024 * 1024
+
+
+def test_index_lookup_by_resource_name_field():
+    index = NameIndex(lambda resource: 30)
+    index.rebuild("tid-001", "hosts", [{"FriendlyName": "host-1"}, {"FriendlyName": "host-2"}, "junk"])
+    assert index.lookup("tid-001", "hosts", "host-2") == {"FriendlyName": "host-2"}
+    assert index.lookup("tid-001", "hosts", "host-3") is None
+    assert index.lookup("tid-002", "hosts", "host-1") is None
+    assert index.stats() == {"tables": 1, "names": 2, "hits": 1, "misses": 2}
+
+
+def test_index_ignores_unindexed_resources():
+    index = NameIndex(lambda resource: 30)
+    index.rebuild("tid-001", "ecs", [{"Name": "svc"}])
+    assert index.lookup("tid-001", "ecs", "svc") is None
+
+
+def test_index_table_expires_with_resource_ttl():
+    clock = FakeClock()
+    index = NameIndex(lambda resource: 10, clock=clock)
+    index.rebuild("tid-001", "service", [{"Name": "web-app"}])
+    clock.now = 10
+    assert index.lookup("tid-001", "service", "web-app") is None
+    assert index.stats()["tables"] == 0
+
+
+def test_index_discard_name_and_table():
+    index = NameIndex(lambda resource: 30)
+    index.rebuild("tid-001", "service", [{"Name": "web-app"}, {"Name": "api"}])
+    index.discard("tid-001", "service", "web-app")
+    assert index.lookup("tid-001", "service", "web-app") is None
+    assert index.lookup("tid-001", "service", "api") == {"Name": "api"}
+    index.discard("tid-001", "service")
+    assert index.lookup("tid-001", "service", "api") is None
+
+
+def test_indexed_get_uses_last_list_response():
+    indexed_list("tid-001", "service", lambda: [{"Name": "web-app", "Replicas": 2}])
+
+    def find():
+        raise AssertionError("should be served from the index")
+
+    assert indexed_get("tid-001", "service", "web-app", find) == {"Name": "web-app", "Replicas": 2}
+
+
+def test_indexed_get_falls_back_to_find():
+    calls = []
+    indexed_list("tid-001", "service", lambda: [{"Name": "web-app"}])
+    record = indexed_get("tid-001", "service", "api", lambda: calls.append(1) or {"Name": "api"})
+    assert record == {"Name": "api"}
+    indexed_get("tid-001", "service", "api", lambda: calls.append(1) or {"Name": "api"})
+    assert len(calls) == 1
+
+
+def test_indexed_list_cache_hit_keeps_index():
+    indexed_list(PORTAL, "tenant", lambda: [{"AccountName": "dev"}])
+    indexed_list(PORTAL, "tenant", lambda: [])
+    assert get_index().lookup(PORTAL, "tenant", "dev") == {"AccountName": "dev"}
+
+
+def test_invalidating_with_name_keeps_other_index_entries():
+    indexed_list("tid-001", "s3", lambda: [{"Name": "a"}, {"Name": "b"}])
+    with invalidating("tid-001", "s3", "a"):
+        pass
+    assert get_index().lookup("tid-001", "s3", "a") is None
+    assert get_index().lookup("tid-001", "s3", "b") == {"Name": "b"}
+    assert get_cache().stats()["entries"] == 0
+
+
+def test_list_in_flight_during_write_does_not_rebuild_index():
+    fetching, release = threading.Event(), threading.Event()
+
+    def slow_list():
+        fetching.set()
+        release.wait(5)
+        return [{"Name": "web-app", "Image": "old"}]
+
+    reader = threading.Thread(target=indexed_list, args=("tid-001", "service", slow_list))
+    reader.start()
+    assert fetching.wait(5)
+    with invalidating("tid-001", "service", "web-app"):
+        pass
+    release.set()
+    reader.join(5)
+    assert get_index().lookup("tid-001", "service", "web-app") is None
+    assert indexed_get("tid-001", "service", "web-app", lambda: {"Name": "web-app", "Image": "new"})["Image"] == "new"
+
+
+def test_set_skips_values_fetched_before_invalidation():
+    cache = ResponseCache()
+    key = cache_key("tid-001", "service", "list")
+    before = cache.generation("tid-001", "service")
+    cache.invalidate("tid-001")
+    cache.set(key, ["stale"], before)
+    assert cache.get(key) == (False, None)
+    cache.set(key, ["fresh"], cache.generation("tid-001", "service"))
+    assert cache.get(key) == (True, ["fresh"])
@@ -0,0 +1,110 @@
+import pytest
+
+from duplocloud_mcp.changes import ChangeFeed, ChangeTracker, changes_since, decode_version, encode_version, get_tracker
+
+RECORDS = [{"Name": f"svc-{i}", "Image": "img:1"} for i in range(4)]
+
+
+def _names(records):
+    return [r["Name"] for r in records]
+
+
+def test_first_call_returns_everything():
+    result = changes_since("tid-001", "service", RECORDS)
+    assert result["full"] is True
+    assert result["added"] == RECORDS
+    assert result["modified"] == result["removed"] == []
+    assert decode_version(result["version"])[1] == 1
+
+
+def test_changes_since_token():
+    first = changes_since("tid-001", "service", RECORDS)
+    updated = [RECORDS[0], {"Name": "svc-1", "Image": "img:2"}, RECORDS[3], {"Name": "svc-9", "Image": "img:1"}]
+    result = changes_since("tid-001", "service", updated, first["version"])
+    assert result["full"] is False
+    assert _names(result["added"]) == ["svc-9"]
+    assert result["modified"] == [{"Name": "svc-1", "Image": "img:2"}]
+    assert result["removed"] == ["svc-2"]
+
+
+def test_unchanged_listing_keeps_version():
+    first = changes_since("tid-001", "service", RECORDS)
+    result = changes_since("tid-001", "service", [dict(r) for r in RECORDS], first["version"])
+    assert result["version"] == first["version"]
+    assert result["added"] == result["modified"] == result["removed"] == []
+
+
+def test_changes_accumulate_across_versions():
+    first = changes_since("tid-001", "service", RECORDS)
+    changes_since("tid-001", "service", RECORDS[:3] + [{"Name": "svc-3", "Image": "img:2"}])
+    changes_since("tid-001", "service", RECORDS[1:3] + [{"Name": "svc-3", "Image": "img:3"}, {"Name": "new"}])
+    # Added and removed again in between: not reported to a client that never saw it.
+    changes_since("tid-001", "service", RECORDS[1:3] + [{"Name": "svc-3", "Image": "img:3"}])
+    result = changes_since("tid-001", "service", RECORDS[1:3] + [{"Name": "svc-3", "Image": "img:3"}], first["version"])
+    assert result["added"] == []
+    assert result["modified"] == [{"Name": "svc-3", "Image": "img:3"}]
+    assert result["removed"] == ["svc-0"]
+
+
+def test_removed_then_readded_is_added():
+    first = changes_since("tid-001", "service", RECORDS)
+    changes_since("tid-001", "service", RECORDS[1:])
+    result = changes_since("tid-001", "service", RECORDS, first["version"])
+    assert _names(result["added"]) == ["svc-0"]
+    assert result["removed"] == []
+
+
+def test_token_from_another_feed_gets_full_listing():
+    services = changes_since("tid-001", "service", RECORDS)
+    result = changes_since("tid-002", "service", RECORDS[:1], services["version"])
+    assert result["full"] is True
+    assert result["added"] == RECORDS[:1]
+
+
+def test_invalid_token():
+    with pytest.raises(ValueError, match="version token"):
+        changes_since("tid-001", "service", RECORDS, "not-a-token!")
+    with pytest.raises(ValueError, match="version token"):
+        decode_version(encode_version("abc", -1))
+
+
+def test_projection_applies_to_records():
+    result = changes_since("tid-001", "service", RECORDS, fields="Name")
+    assert result["added"][0] == {"Name": "svc-0"}
+
+
+def test_same_list_object_is_not_rehashed():
+    feed = ChangeFeed(("Name",))
+    feed.apply(RECORDS)
+    RECORDS[0]["Image"] = "mutated"
+    try:
+        feed.apply(RECORDS)
+        assert feed.version == 1
+    finally:
+        RECORDS[0]["Image"] = "img:1"
+
+
+def test_trimmed_log_falls_back_to_full_listing():
+    feed = ChangeFeed(("Name",), max_log=3)
+    feed.apply(RECORDS[:2])
+    feed.apply([{"Name": "svc-0", "Image": "img:2"}, RECORDS[1]])
+    feed.apply([{"Name": "svc-0", "Image": "img:3"}, {"Name": "svc-1", "Image": "img:3"}])
+    assert feed.floor == 1
+    assert feed.since(0)["full"] is True
+    assert _names(feed.since(1)["modified"]) == ["svc-0", "svc-1"]
+
+
+def test_tracker_evicts_least_recently_used_feed():
+    tracker = ChangeTracker(max_feeds=2)
+    first = tracker.feed("tid-001", "service")
+    tracker.feed("tid-002", "service")
+    assert tracker.feed("tid-001", "service") is first
+    tracker.feed("tid-003", "hosts")
+    assert tracker.stats()["feeds"] == 2
+    assert tracker.feed("tid-002", "service") is not None
+    assert tracker.feed("tid-001", "service") is not first
+
+
+def test_tracker_configured_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_CHANGES_MAX_FEEDS", "7")
+    assert get_tracker().stats() == {"feeds": 0, "max_feeds": 7, "log_entries": 0}
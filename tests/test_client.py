@@ -1,9 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
+from duplocloud.client import DuploClient
 from duplocloud.errors import DuploError
 
-from duplocloud_mcp.client import get_client, reset_client
+from duplocloud_mcp.client import (
+    get_client,
+    get_http_stats,
+    get_portal_resource,
+    get_session,
+    get_tenant_client,
+    reset_client,
+)
+from duplocloud_mcp.metrics import ToolMetrics
+from duplocloud_mcp.ratelimit import get_limiter
+from duplocloud_mcp.resilience import CLOSED, get_breaker, get_retry_policy, idempotent, reset_resilience
 
 
 def test_get_client_missing_host(monkeypatch):
@@ -20,52 +33,274 @@ def test_get_client_missing_token(monkeypatch):
         get_client()
 
 
-@patch("duplocloud_mcp.client.DuploClient.from_creds")
-def test_get_client_success(mock_from_creds, mock_env):
-    mock_client = MagicMock()
-    mock_from_creds.return_value = mock_client
-
+def test_get_client_success(mock_env):
     client = get_client()
-    assert client is mock_client
-    mock_from_creds.assert_called_once_with(
-        host="https://test.duplocloud.net",
-        token="test-token-123",
-        tenant="default",
-    )
+    assert client.host == "https://test.duplocloud.net"
+    assert client.token == "test-token-123"
+    assert client.tenant == "default"
+    assert client.session is get_session()
+
+
+def test_get_client_singleton(mock_env):
+    assert get_client() is get_client()
+
 
+def test_get_client_no_tenant(monkeypatch, mock_env):
+    monkeypatch.delenv("DUPLO_TENANT", raising=False)
+    assert get_client().tenant is None
 
-@patch("duplocloud_mcp.client.DuploClient.from_creds")
-def test_get_client_singleton(mock_from_creds, mock_env):
-    mock_client = MagicMock()
-    mock_from_creds.return_value = mock_client
 
+def test_reset_client(mock_env):
     client1 = get_client()
+    reset_client()
     client2 = get_client()
-    assert client1 is client2
-    assert mock_from_creds.call_count == 1
+    assert client1 is not client2
 
 
-def test_get_client_no_tenant(monkeypatch, mock_env):
-    monkeypatch.delenv("DUPLO_TENANT", raising=False)
-    mock_client = MagicMock()
+def test_get_tenant_client_missing_host(monkeypatch):
+    monkeypatch.delenv("DUPLO_HOST", raising=False)
+    with pytest.raises(DuploError, match="DUPLO_HOST"):
+        get_tenant_client("tid-001")
 
-    with patch("duplocloud_mcp.client.DuploClient.from_creds", return_value=mock_client) as mock_creds:
-        get_client()
-        mock_creds.assert_called_once_with(
-            host="https://test.duplocloud.net",
-            token="test-token-123",
-            tenant=None,
-        )
 
+def test_get_tenant_client_pinned_to_tenant(mock_env):
+    client = get_tenant_client(" tid-001 ")
+    assert client.tenantid == "tid-001"
+    assert client.host == "https://test.duplocloud.net"
+    assert client.token == "test-token-123"
 
-def test_reset_client(mock_env):
-    mock_client_1 = MagicMock()
-    mock_client_2 = MagicMock()
-
-    with patch("duplocloud_mcp.client.DuploClient.from_creds", side_effect=[mock_client_1, mock_client_2]):
-        client1 = get_client()
-        reset_client()
-        client2 = get_client()
-        assert client1 is not client2
-        assert client1 is mock_client_1
-        assert client2 is mock_client_2
+
+def test_get_tenant_client_pooled_per_tenant(mock_env):
+    dev = get_tenant_client("tid-001")
+    staging = get_tenant_client("tid-002")
+    assert get_tenant_client("tid-001") is dev
+    assert dev is not staging
+    assert staging.tenantid == "tid-002"
+    assert dev.tenantid == "tid-001"
+
+
+def test_tenant_clients_share_session(mock_env):
+    dev = get_tenant_client("tid-001")
+    staging = get_tenant_client("tid-002")
+    assert dev.session is staging.session is get_session()
+
+
+def test_get_tenant_client_concurrent_creation(mock_env):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(get_tenant_client, ["tid-001"] * 16))
+    assert all(c is clients[0] for c in clients)
+
+
+def test_tenant_client_sends_through_session(mock_env):
+    client = get_tenant_client("tid-001")
+    response = MagicMock(status_code=200)
+    with patch.object(client.session, "request", return_value=response) as mock_request:
+        assert client.get("subscriptions/tid-001/GetReplicationControllers") is response
+    mock_request.assert_called_once()
+    args, kwargs = mock_request.call_args
+    assert args == ("GET", "https://test.duplocloud.net/subscriptions/tid-001/GetReplicationControllers")
+    assert kwargs["headers"]["Authorization"] == "Bearer test-token-123"
+
+
+def test_tenant_client_maps_error_status(mock_env):
+    client = get_tenant_client("tid-001")
+    response = MagicMock(status_code=404)
+    with patch.object(client.session, "request", return_value=response):
+        with pytest.raises(DuploError, match="Resource not found"):
+            client.delete("v3/subscriptions/tid-001/aws/s3bucket/missing")
+
+
+def test_reset_client_clears_tenant_pool(mock_env):
+    client = get_tenant_client("tid-001")
+    reset_client()
+    assert get_tenant_client("tid-001") is not client
+
+
+def test_tenant_client_load_memoized(mock_env):
+    client = get_tenant_client("tid-001")
+    service = client.load("service")
+    assert client.load("service") is service
+    assert client.load("hosts") is not service
+    assert get_tenant_client("tid-002").load("service") is not service
+
+
+def test_tenant_client_load_memoized_concurrently(mock_env):
+    client = get_tenant_client("tid-001")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        handles = list(pool.map(client.load, ["s3"] * 16))
+    assert all(h is handles[0] for h in handles)
+
+
+def test_memoized_resource_bound_to_its_tenant(mock_env):
+    s3 = get_tenant_client("tid-002").load("s3")
+    assert s3.duplo.tenantid == "tid-002"
+    assert s3.tenant_id == "tid-002"
+
+
+def test_get_portal_resource_memoized(mock_env):
+    with patch("duplocloud_mcp.client.SessionClient.load", return_value=MagicMock()) as mock_load:
+        tenants = get_portal_resource("tenant")
+        assert get_portal_resource("tenant") is tenants
+    mock_load.assert_called_once_with("tenant")
+
+
+def test_clients_use_configured_timeouts(monkeypatch, mock_env):
+    monkeypatch.setenv("DUPLO_HTTP_CONNECT_TIMEOUT", "2")
+    monkeypatch.setenv("DUPLO_HTTP_READ_TIMEOUT", "30")
+    assert get_tenant_client("tid-001").timeout == (2.0, 30.0)
+    assert get_client().timeout == (2.0, 30.0)
+
+
+def test_get_http_stats(mock_env):
+    assert get_http_stats() == {}
+    get_session()
+    assert get_http_stats()["requests"] == 0
+
+
+def _response(status, headers=None):
+    return MagicMock(status_code=status, headers=headers or {})
+
+
+@pytest.fixture
+def no_sleep():
+    with patch.object(get_retry_policy(), "sleep") as sleep:
+        yield sleep
+
+
+def test_reads_retry_transient_errors(mock_env, no_sleep):
+    client = get_tenant_client("tid-001")
+    ok = _response(200)
+    with patch.object(
+        client.session, "request", side_effect=[_response(502), _response(429, {"Retry-After": "1"}), ok]
+    ):
+        assert client.get("subscriptions/tid-001/GetReplicationControllers") is ok
+    assert no_sleep.call_count == 2
+    assert no_sleep.call_args_list[1].args == (1.0,)
+
+
+def test_reads_retry_connection_errors(mock_env, no_sleep):
+    client = get_tenant_client("tid-001")
+    ok = _response(200)
+    with patch.object(client.session, "request", side_effect=[requests.exceptions.ConnectionError(), ok]):
+        assert client.get("subscriptions/tid-001/GetReplicationControllers") is ok
+
+
+def test_reads_give_up_after_max_retries(monkeypatch, mock_env):
+    monkeypatch.setenv("DUPLO_RETRY_MAX", "2")
+    reset_resilience()
+    client = get_tenant_client("tid-001")
+    with patch.object(get_retry_policy(), "sleep"):
+        with patch.object(client.session, "request", return_value=_response(503)) as mock_request:
+            with pytest.raises(DuploError) as exc:
+                client.get("subscriptions/tid-001/GetReplicationControllers")
+    assert exc.value.code == 503
+    assert mock_request.call_count == 3
+
+
+def test_writes_are_not_retried(mock_env, no_sleep):
+    client = get_tenant_client("tid-001")
+    with patch.object(client.session, "request", return_value=_response(502)) as mock_request:
+        with pytest.raises(DuploError):
+            client.post("subscriptions/tid-001/ReplicationControllerChangeAll", {})
+    assert mock_request.call_count == 1
+    no_sleep.assert_not_called()
+
+
+def test_idempotent_writes_are_retried(mock_env, no_sleep):
+    client = get_tenant_client("tid-001")
+    ok = _response(200)
+    with patch.object(client.session, "request", side_effect=[_response(504), ok]):
+        assert idempotent(client.post)("subscriptions/tid-001/ReplicationControllerChangeAll", {}) is ok
+
+
+def test_breaker_fails_fast_when_portal_degraded(monkeypatch, mock_env, no_sleep):
+    monkeypatch.setenv("DUPLO_BREAKER_THRESHOLD", "2")
+    client = get_tenant_client("tid-001")
+    with patch.object(client.session, "request", return_value=_response(502)) as mock_request:
+        with pytest.raises(DuploError):
+            client.post("subscriptions/tid-001/ReplicationControllerChangeAll", {})
+        with pytest.raises(DuploError):
+            client.post("subscriptions/tid-001/ReplicationControllerChangeAll", {})
+        with pytest.raises(DuploError, match="portal is failing"):
+            client.get("subscriptions/tid-001/GetReplicationControllers")
+    assert mock_request.call_count == 2
+
+
+def test_breaker_closes_after_throttled_trial(monkeypatch, mock_env, no_sleep):
+    monkeypatch.setenv("DUPLO_BREAKER_THRESHOLD", "1")
+    monkeypatch.setenv("DUPLO_BREAKER_RESET", "0")
+    client = get_tenant_client("tid-001")
+    path = "subscriptions/tid-001/ReplicationControllerChangeAll"
+    with patch.object(client.session, "request", side_effect=[_response(502), _response(429), _response(200)]):
+        with pytest.raises(DuploError):
+            client.post(path, {})
+        with pytest.raises(DuploError):
+            client.post(path, {})
+        assert get_breaker(client.host).state == CLOSED
+        assert client.post(path, {}).status_code == 200
+
+
+def test_requests_take_rate_limit_tokens(monkeypatch, mock_env):
+    monkeypatch.setenv("DUPLO_RATE_READ", "100")
+    monkeypatch.setenv("DUPLO_RATE_WRITE", "100")
+    client = get_tenant_client("tid-001")
+    with patch.object(client.session, "request", return_value=_response(200)):
+        client.get("subscriptions/tid-001/GetReplicationControllers")
+        client.post("subscriptions/tid-001/ReplicationControllerChangeAll", {})
+    stats = get_limiter().stats()
+    assert stats["read"]["acquired"] == 1
+    assert stats["write"]["acquired"] == 1
+
+
+def test_upstream_requests_counted_per_attempt(mock_env, no_sleep):
+    metrics = ToolMetrics()
+    client = get_tenant_client("tid-001")
+    with metrics.observing("service_list") as call:
+        with patch.object(
+            client.session,
+            "request",
+            side_effect=[requests.exceptions.ConnectionError(), _response(503), _response(200)],
+        ):
+            client.get("subscriptions/tid-001/GetReplicationControllers")
+        call["result"] = "[]"
+    assert metrics.snapshot()["service_list"]["counters"] == {
+        "upstream_requests{method=GET,status=200}": 1,
+        "upstream_requests{method=GET,status=503}": 1,
+        "upstream_requests{method=GET,status=error}": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("http://127.0.0.1:8080", "http://127.0.0.1:8080"),
+        ("http://localhost:8080/", "http://localhost:8080"),
+        ("http://portal.example.com", "https://portal.example.com"),
+        ("https://test.duplocloud.net", "https://test.duplocloud.net"),
+    ],
+)
+def test_plain_http_only_for_loopback_hosts(monkeypatch, host, expected):
+    monkeypatch.setenv("DUPLO_HOST", host)
+    monkeypatch.setenv("DUPLO_TOKEN", "test-token-123")
+    client = get_tenant_client("tid-001")
+    with patch.object(client.session, "request", return_value=_response(200)) as mock_request:
+        client.get("subscriptions/tid-001/GetReplicationControllers")
+    assert mock_request.call_args[0][1] == f"{expected}/subscriptions/tid-001/GetReplicationControllers"
+
+
+def test_sdk_private_api_present():
+    """SessionClient._send calls these private DuploClient methods; an SDK upgrade that drops them must fail here."""
+    for attr in ("_DuploClient__headers", "_DuploClient__validate_response"):
+        assert callable(getattr(DuploClient, attr, None)), f"duplocloud-client no longer has {attr}; update _send"
+
+
+def test_session_client_calls_sdk_private_api(mock_env):
+    client = get_tenant_client("tid-001")
+    ok = _response(200)
+    with (
+        patch.object(client.session, "request", return_value=ok) as mock_request,
+        patch.object(DuploClient, "_DuploClient__validate_response", return_value=ok) as mock_validate,
+    ):
+        assert client.get("subscriptions/tid-001/GetReplicationControllers") is ok
+    assert mock_request.call_args.kwargs["headers"] == client._DuploClient__headers()
+    mock_validate.assert_called_once_with(ok)
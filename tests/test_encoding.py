@@ -0,0 +1,66 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+
+from duplocloud_mcp import encoding
+from duplocloud_mcp.encoding import dumps, dumps_orjson, dumps_stdlib
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+PAYLOADS = [
+    None,
+    "plain",
+    [1, 2.5, True, None, "x"],
+    {"Name": "web", "Replicas": 2, "Nested": {"Tags": [{"Key": "a", "Value": "b"}]}},
+    {"Unicode": "café ☁ 日本", "Escapes": 'quote " backslash \\ newline \n tab \t'},
+    {"When": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc), "Day": datetime.date(2024, 5, 1)},
+    {"Amount": decimal.Decimal("1.50"), "Id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    {"Point": Point(1, 2), "Set": {1}},
+    {2: "int key", False: "bool key", None: "none key"},
+    {"Big": 2**70, "Negative": -(2**63)},
+]
+
+
+def _reference(data):
+    """The encoder handle_duplo_errors used before the fast path."""
+    return json.dumps(data, default=str)
+
+
+@pytest.mark.parametrize("data", PAYLOADS)
+def test_stdlib_backend_matches_reference(data):
+    assert json.loads(dumps_stdlib(data)) == json.loads(_reference(data))
+
+
+@pytest.mark.parametrize("data", PAYLOADS)
+def test_orjson_backend_matches_reference(data):
+    pytest.importorskip("orjson")
+    assert json.loads(dumps_orjson(data)) == json.loads(_reference(data))
+
+
+def test_backends_identical_on_portal_payloads(large_inventory):
+    pytest.importorskip("orjson")
+    for records in large_inventory.values():
+        assert dumps_orjson(records) == dumps_stdlib(records)
+        assert json.loads(dumps_stdlib(records)) == json.loads(_reference(records))
+
+
+def test_output_is_compact():
+    assert dumps_stdlib({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setenv("DUPLO_JSON_ENCODER", "stdlib")
+    assert encoding._select_backend() is dumps_stdlib
+    monkeypatch.delenv("DUPLO_JSON_ENCODER")
+    expected = dumps_orjson if encoding.orjson is not None else dumps_stdlib
+    assert encoding._select_backend() is expected
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from duplocloud_mcp.executor import DEFAULT_WORKERS, WorkerPool, get_pool, reset_pool
+
+
+async def test_run_returns_result_from_worker_thread():
+    pool = WorkerPool(2)
+    thread_name = await pool.run(lambda: threading.current_thread().name)
+    assert thread_name.startswith("duplo-worker")
+    pool.shutdown()
+
+
+async def test_run_passes_arguments():
+    pool = WorkerPool(1)
+    assert await pool.run(lambda a, b=0: a + b, 2, b=3) == 5
+    pool.shutdown()
+
+
+async def test_run_propagates_exceptions():
+    pool = WorkerPool(1)
+    with pytest.raises(RuntimeError, match="boom"):
+        await pool.run(lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
+
+
+async def test_blocking_calls_run_concurrently():
+    pool = WorkerPool(4)
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.run(time.sleep, 0.2) for _ in range(4)))
+    assert time.perf_counter() - start < 0.6
+    pool.shutdown()
+
+
+async def test_stats_report_queue_depth_and_wait():
+    pool = WorkerPool(1)
+    release = threading.Event()
+    blocked = asyncio.ensure_future(pool.run(release.wait))
+    queued = asyncio.ensure_future(pool.run(lambda: "done"))
+    await asyncio.sleep(0.05)
+
+    stats = pool.stats()
+    assert stats["max_workers"] == 1
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+
+    release.set()
+    assert await queued == "done"
+    await blocked
+    stats = pool.stats()
+    assert stats["queued"] == 0
+    assert stats["completed"] == 2
+    assert stats["wait_ms_max"] >= 40
+    pool.shutdown()
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        WorkerPool(0)
+
+
+def test_get_pool_size_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_MCP_WORKERS", "3")
+    reset_pool()
+    assert get_pool().max_workers == 3
+    assert get_pool() is get_pool()
+
+
+def test_get_pool_invalid_env_falls_back(monkeypatch):
+    monkeypatch.setenv("DUPLO_MCP_WORKERS", "lots")
+    reset_pool()
+    assert get_pool().max_workers == DEFAULT_WORKERS
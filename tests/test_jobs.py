@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+import pytest
+
+from duplocloud_mcp.jobs import FAILED, PENDING, READY, TIMED_OUT, JobTracker, get_jobs, start_job
+
+
+class Steps:
+    """A readiness check that walks through a fixed list of results, repeating the last one."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            result = self.results[min(self.calls, len(self.results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _tracker(**kwargs):
+    return JobTracker(**{"interval": 0.01, "max_interval": 0.02, **kwargs})
+
+
+async def test_job_becomes_ready():
+    tracker = _tracker()
+    check = Steps((PENDING, "pending"), (PENDING, "pending"), (READY, "running"))
+    job_id = tracker.start("host_create", "tid-001", "hosts", "host-1", check)
+    status = await tracker.wait(job_id, timeout=2)
+    assert status["state"] == READY
+    assert status["done"] is True
+    assert status["detail"] == "running"
+    assert status["polls"] == 3
+    assert (status["tool"], status["tenant_id"], status["resource"], status["name"]) == (
+        "host_create",
+        "tid-001",
+        "hosts",
+        "host-1",
+    )
+    assert tracker.stats()["polling"] == 0
+
+
+async def test_jobs_on_one_resource_share_a_poll_loop():
+    tracker = _tracker()
+    check = Steps((PENDING, None), (PENDING, None), (PENDING, None), (READY, None))
+    first = tracker.start("service_create", "tid-001", "service", "web", check)
+    second = tracker.start("service_restart", "tid-001", "service", "web", Steps((READY, None)))
+    results = await asyncio.gather(*(tracker.wait(job_id, timeout=2) for job_id in (first, second, first)))
+    assert {r["state"] for r in results} == {READY}
+    assert check.calls == 4
+    assert tracker.stats()["shared_polls"] == 1
+
+
+async def test_jobs_with_different_variants_poll_separately():
+    tracker = _tracker()
+    first_check = Steps((PENDING, "old rollover"))
+    first = tracker.start("service_restart", "tid-001", "service", "web", first_check, frozenset({"pod-a"}))
+    second_check = Steps((READY, "new rollover"))
+    second = tracker.start("service_restart", "tid-001", "service", "web", second_check, frozenset({"pod-b"}))
+    status = await tracker.wait(second, timeout=2)
+    assert (status["state"], status["detail"]) == (READY, "new rollover")
+    assert tracker.status(first)["state"] == PENDING
+    assert tracker.stats()["shared_polls"] == 0
+    tracker.stop()
+
+
+async def test_finished_resource_gets_a_new_poll_loop():
+    tracker = _tracker()
+    first = tracker.start("service_create", "tid-001", "service", "web", Steps((READY, None)))
+    await tracker.wait(first, timeout=2)
+    check = Steps((FAILED, "crashloop"))
+    second = tracker.start("service_restart", "tid-001", "service", "web", check)
+    assert (await tracker.wait(second, timeout=2))["state"] == FAILED
+    assert check.calls == 1
+
+
+async def test_check_errors_count_as_pending():
+    tracker = _tracker()
+    job_id = tracker.start("host_create", "tid-001", "hosts", "h", Steps(ValueError("404"), (READY, "running")))
+    status = await tracker.wait(job_id, timeout=2)
+    assert status["state"] == READY
+    assert status["error"] is None
+
+
+async def test_job_times_out():
+    tracker = _tracker(timeout=0.05)
+    job_id = tracker.start("host_create", "tid-001", "hosts", "h", Steps(RuntimeError("portal down")))
+    status = await tracker.wait(job_id, timeout=2)
+    assert status["state"] == TIMED_OUT
+    assert status["error"] == "portal down"
+
+
+async def test_wait_timeout_returns_pending_status_and_reports_progress():
+    tracker = _tracker(max_interval=0.01)
+    job_id = tracker.start("host_create", "tid-001", "hosts", "h", Steps((PENDING, "pending")))
+    seen = []
+
+    async def progress(status):
+        seen.append(status["polls"])
+
+    status = await tracker.wait(job_id, timeout=0.1, progress=progress)
+    assert status["state"] == PENDING
+    assert status["done"] is False
+    assert len(seen) >= 3
+    assert seen == sorted(seen)
+    tracker.stop()
+
+
+def test_unknown_job():
+    with pytest.raises(ValueError, match="Unknown or expired job"):
+        _tracker().status("job-nope")
+
+
+async def test_finished_jobs_expire():
+    now = [0.0]
+    tracker = _tracker(ttl=10, clock=lambda: now[0])
+    job_id = tracker.start("host_create", "tid-001", "hosts", "h", Steps((READY, None)))
+    await tracker.wait(job_id, timeout=2)
+    now[0] = 11
+    tracker.start("host_create", "tid-001", "hosts", "other", Steps((READY, None)))
+    with pytest.raises(ValueError):
+        tracker.status(job_id)
+
+
+def test_start_job_wraps_result(monkeypatch):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    result = start_job({"message": "created"}, "host_create", "tid-001", "hosts", "h", Steps((READY, None)))
+    assert result["result"] == {"message": "created"}
+    assert result["job_id"].startswith("job-")
+    assert get_jobs().interval == 0.01
@@ -0,0 +1,52 @@
+import pytest
+
+from bench.load import LoadSettings, format_load_report, run_load
+from bench.mock_portal import PortalSettings
+
+
+def test_stage_sizes_ramp_up_to_agents():
+    assert LoadSettings(agents=50).stage_sizes() == [1, 5, 10, 25, 50]
+    assert LoadSettings(agents=8).stage_sizes() == [1, 5, 8]
+    assert LoadSettings(agents=20, stages=(20, 4, 40)).stage_sizes() == [4, 20]
+
+
+async def test_run_load_rejects_bad_settings():
+    with pytest.raises(ValueError, match="transport"):
+        await run_load(LoadSettings(transport="websocket"))
+    with pytest.raises(ValueError, match="tenant_create"):
+        await run_load(LoadSettings(tools=("tenant_create",)))
+    with pytest.raises(ValueError, match="writes"):
+        await run_load(LoadSettings(tools=("service_get",), write_ratio=0.5))
+
+
+@pytest.mark.parametrize("transport", ["stdio", "http"])
+async def test_load_against_server_process(transport):
+    settings = LoadSettings(
+        transport=transport,
+        agents=3,
+        stages=(1, 3),
+        duration=0.5,
+        write_ratio=0.2,
+        tools=("service_get", "host_list", "service_update"),
+    )
+    report = await run_load(settings, PortalSettings(tenants=2, services=20, hosts=5))
+    print("\n" + format_load_report(report))
+    assert [s["agents"] for s in report["stages"]] == [1, 3]
+    for stage in report["stages"]:
+        assert stage["calls"] > 0
+        assert stage["calls"] == stage["reads"] + stage["writes"]
+        assert stage["errors"] == {}
+    assert report["error_rate"] == 0
+    assert report["saturation"]["agents"] in (1, 3)
+    assert report["memory"]["peak_bytes"] > 0
+    sessions = report["server"]["sessions"]
+    # Over HTTP every agent opens its own session and calls are capped per session; stdio is uncapped.
+    assert sessions["calls"] > 0 if transport == "http" else sessions["calls"] == 0
+
+
+async def test_load_counts_portal_errors():
+    settings = LoadSettings(transport="stdio", agents=2, stages=(2,), duration=0.5, write_ratio=0, tools=("host_get",))
+    report = await run_load(settings, PortalSettings(tenants=1, hosts=5, error_rate=1.0, error_status=500))
+    stage = report["stages"][0]
+    assert stage["error_rate"] == 1.0
+    assert set(stage["errors"]) == {"500"}
@@ -0,0 +1,69 @@
+import pytest
+
+from duplocloud_mcp.metrics import LATENCY_BUCKETS, Histogram, ToolMetrics, count
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram((1, 5, 10))
+    for value in (0.5, 1, 3, 7, 20):
+        hist.observe(value)
+    assert hist.cumulative() == [("1", 2), ("5", 3), ("10", 4), ("+Inf", 5)]
+    assert hist.sum == 31.5
+    assert hist.count == 5
+
+
+def test_histogram_quantile_interpolates():
+    hist = Histogram((0.1, 0.2, 0.4))
+    for _ in range(10):
+        hist.observe(0.15)
+    assert 0.1 < hist.quantile(0.5) <= 0.2
+    assert hist.quantile(0.99) <= 0.2
+    assert Histogram(LATENCY_BUCKETS).quantile(0.5) == 0.0
+
+
+def test_observing_records_outcome_latency_and_size():
+    metrics = ToolMetrics()
+    with metrics.observing("service_list") as call:
+        call["result"] = '[{"Name":"web"}]'
+    with metrics.observing("service_list") as call:
+        call["result"] = '{"error":"Not found","code":404}'
+    summary = metrics.snapshot()["service_list"]
+    assert summary["calls"] == {"ok": 1, "error": 1}
+    assert summary["errors"] == {"404": 1}
+    assert summary["latency_ms"]["p50"] > 0
+    assert summary["result_bytes"]["avg"] > 0
+
+
+def test_observing_records_exceptions():
+    metrics = ToolMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.observing("service_list"):
+            raise RuntimeError("boom")
+    assert metrics.snapshot()["service_list"]["calls"] == {"exception": 1}
+
+
+def test_counts_attributed_to_current_call():
+    metrics = ToolMetrics()
+    count("upstream_requests", method="GET", status="200")
+    with metrics.observing("service_list") as call:
+        count("upstream_requests", method="GET", status="200")
+        count("upstream_requests", method="GET", status="200")
+        count("cache_lookups", layer="memory", result="miss")
+        call["result"] = "[]"
+    counters = metrics.snapshot()["service_list"]["counters"]
+    assert counters == {"cache_lookups{layer=memory,result=miss}": 1, "upstream_requests{method=GET,status=200}": 2}
+
+
+def test_render_prometheus_text():
+    metrics = ToolMetrics()
+    with metrics.observing("service_get") as call:
+        count("upstream_requests", method="GET", status="404")
+        call["result"] = '{"error":"say \\"hi\\"","code":404}'
+    text = metrics.render()
+    assert "# TYPE duplo_mcp_tool_duration_seconds histogram" in text
+    assert 'duplo_mcp_tool_calls_total{tool="service_get",outcome="error"} 1' in text
+    assert 'duplo_mcp_tool_errors_total{tool="service_get",code="404"} 1' in text
+    assert 'duplo_mcp_tool_duration_seconds_bucket{tool="service_get",le="+Inf"} 1' in text
+    assert 'duplo_mcp_tool_result_bytes_count{tool="service_get"} 1' in text
+    assert 'duplo_mcp_upstream_requests_total{tool="service_get",method="GET",status="404"} 1' in text
+    assert text.endswith("\n")
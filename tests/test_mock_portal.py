@@ -0,0 +1,97 @@
+import json
+import time
+
+import pytest
+import requests
+
+from bench.harness import Dataset, percentile, portal_environment, run_benchmark
+from bench.mock_portal import MockPortal, PortalSettings, PortalState
+from duplocloud_mcp.server import load_tools, mcp
+
+
+@pytest.fixture
+def portal():
+    with MockPortal(PortalSettings(tenants=2, services=5, hosts=3)) as portal:
+        yield portal
+
+
+def test_dataset_size_follows_settings(portal):
+    tenants = requests.get(f"{portal.url}/adminproxy/GetTenantNames").json()
+    assert [t["TenantId"] for t in tenants] == ["tid-000", "tid-001"]
+    services = requests.get(f"{portal.url}/subscriptions/tid-001/GetReplicationControllers").json()
+    assert [s["Name"] for s in services] == ["svc-0000", "svc-0001", "svc-0002", "svc-0003", "svc-0004"]
+    assert len(requests.get(f"{portal.url}/subscriptions/tid-001/GetNativeHosts").json()) == 3
+
+
+def test_unknown_route_and_record_are_404(portal):
+    assert requests.get(f"{portal.url}/subscriptions/tid-000/Nope").status_code == 404
+    assert requests.get(f"{portal.url}/v3/subscriptions/tid-000/replicationcontroller/nope").status_code == 404
+    assert requests.get(f"{portal.url}/subscriptions/tid-999/GetNativeHosts").status_code == 404
+
+
+def test_writes_change_the_dataset(portal):
+    url = f"{portal.url}/v3/subscriptions/tid-000/aws/s3bucket"
+    assert requests.post(url, json={"Name": "reports"}).status_code == 200
+    assert requests.get(f"{url}/reports").json()["Name"] == "reports"
+    assert requests.delete(f"{url}/reports").status_code == 200
+    assert requests.get(f"{url}/reports").status_code == 404
+
+
+def test_request_counts_by_route(portal):
+    requests.get(f"{portal.url}/subscriptions/tid-000/GetNativeHosts")
+    requests.get(f"{portal.url}/subscriptions/tid-001/GetNativeHosts")
+    stats = requests.get(f"{portal.url}/_mock/requests").json()
+    assert stats == {"total": 2, "by_route": {"GET subscriptions/{tid}/GetNativeHosts 200": 2}}
+
+
+def test_latency_is_injected():
+    with MockPortal(PortalSettings(tenants=1, latency_ms=50)) as portal:
+        start = time.perf_counter()
+        requests.get(f"{portal.url}/adminproxy/GetTenantNames")
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_errors_are_injected():
+    with MockPortal(PortalSettings(tenants=1, error_rate=1.0, error_status=503)) as portal:
+        response = requests.get(f"{portal.url}/adminproxy/GetTenantNames")
+    assert response.status_code == 503
+    assert portal.request_stats()["by_route"] == {"GET adminproxy/GetTenantNames 503": 1}
+
+
+async def test_tools_run_against_portal(portal):
+    with portal_environment(portal.url):
+        load_tools()
+        content, _ = await mcp.call_tool("service_get", {"tenant_id": "tid-001", "name": "svc-0003"})
+        assert json.loads(content[0].text)["Name"] == "svc-0003"
+        content, _ = await mcp.call_tool("inventory_search", {"query": "/app-3:v1.3.3", "fields": "TenantId,Name"})
+        assert json.loads(content[0].text)["items"] == [
+            {"TenantId": "tid-000", "Name": "svc-0003"},
+            {"TenantId": "tid-001", "Name": "svc-0003"},
+        ]
+        content, _ = await mcp.call_tool("ecs_service_update", {"tenant_id": "tid-000", "name": "app01", "image": "x"})
+        assert "error" not in json.loads(content[0].text)
+    definitions = portal.state.tenants["tid-000"].task_defs["duploservices-tenant00-app01"]
+    assert [d["ContainerDefinitions"][0]["Image"] for d in definitions] == ["nginx:1.1", "x"]
+
+
+def test_dataset_walks_tenants_then_records():
+    dataset = Dataset(PortalState(PortalSettings(tenants=2, services=3)))
+    picks = [(dataset.tenant_id(i), dataset.record(i, "services")) for i in range(4)]
+    assert picks == [
+        ("tid-000", "svc-0000"),
+        ("tid-001", "svc-0000"),
+        ("tid-000", "svc-0001"),
+        ("tid-001", "svc-0001"),
+    ]
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 0.5) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+async def test_run_benchmark_rejects_unknown_tool():
+    with pytest.raises(ValueError, match="tenant_create"):
+        await run_benchmark(["tenant_create"])
@@ -0,0 +1,107 @@
+import pytest
+
+from duplocloud_mcp.pagination import SnapshotStore, decode_cursor, encode_cursor, get_store, paginate
+
+KEY = ("tid-001", "service", "list", ())
+RECORDS = [{"Name": f"svc-{i}", "Image": f"img:{i}"} for i in range(5)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_no_limit_returns_whole_list():
+    assert paginate(KEY, lambda: RECORDS) == RECORDS
+
+
+def test_no_limit_applies_projection():
+    assert paginate(KEY, lambda: RECORDS, fields="Name")[0] == {"Name": "svc-0"}
+
+
+def test_pages_walk_the_snapshot():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return RECORDS
+
+    page = paginate(KEY, fetch, limit=2)
+    names = [r["Name"] for r in page["items"]]
+    assert page["total"] == 5
+    while page["next_cursor"]:
+        page = paginate(KEY, fetch, limit=2, cursor=page["next_cursor"])
+        names += [r["Name"] for r in page["items"]]
+    assert names == [r["Name"] for r in RECORDS]
+    assert len(calls) == 1
+
+
+def test_last_page_has_no_cursor():
+    page = paginate(KEY, lambda: RECORDS, limit=10)
+    assert len(page["items"]) == 5
+    assert page["next_cursor"] is None
+
+
+def test_cursor_without_limit_returns_rest():
+    first = paginate(KEY, lambda: RECORDS, limit=2)
+    rest = paginate(KEY, lambda: [], cursor=first["next_cursor"])
+    assert [r["Name"] for r in rest["items"]] == ["svc-2", "svc-3", "svc-4"]
+
+
+def test_pages_are_projected():
+    page = paginate(KEY, lambda: RECORDS, limit=1, fields="Image")
+    assert page["items"] == [{"Image": "img:0"}]
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError, match="limit"):
+        paginate(KEY, lambda: RECORDS, limit=0)
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        paginate(KEY, lambda: RECORDS, cursor="not a cursor!")
+
+
+def test_cursor_from_other_listing_rejected():
+    page = paginate(KEY, lambda: RECORDS, limit=2)
+    with pytest.raises(ValueError, match="different listing"):
+        paginate(("tid-002", "service", "list", ()), lambda: RECORDS, cursor=page["next_cursor"])
+
+
+def test_unknown_snapshot_rejected():
+    with pytest.raises(ValueError, match="expired"):
+        paginate(KEY, lambda: RECORDS, cursor=encode_cursor("missing", 2))
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("abc", 7)) == ("abc", 7)
+
+
+def test_snapshot_expires():
+    clock = FakeClock()
+    store = SnapshotStore(ttl=10, clock=clock)
+    snapshot_id = store.put(KEY, RECORDS)
+    assert store.get(snapshot_id).items == RECORDS
+    clock.now += 10
+    assert store.get(snapshot_id) is None
+
+
+def test_snapshot_store_bounded():
+    store = SnapshotStore(max_snapshots=2)
+    first = store.put(KEY, RECORDS)
+    store.put(KEY, RECORDS)
+    store.put(KEY, RECORDS)
+    assert store.get(first) is None
+    assert store.stats()["snapshots"] == 2
+
+
+def test_get_store_reads_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_PAGE_TTL", "60")
+    monkeypatch.setenv("DUPLO_PAGE_MAX_SNAPSHOTS", "3")
+    store = get_store()
+    assert store.ttl == 60
+    assert store.max_snapshots == 3
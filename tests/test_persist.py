@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import stat
+import threading
+
+import pytest
+
+from duplocloud_mcp.cache import cache_key, cached_read, get_cache, get_index, indexed_list, invalidating
+from duplocloud_mcp.persist import PersistentStore, get_persistent_store, reset_persistent_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+@pytest.fixture
+def persistent(db_path, monkeypatch):
+    monkeypatch.setenv("DUPLO_CACHE_DB", db_path)
+    monkeypatch.setenv("DUPLO_HOST", "https://test.duplocloud.net")
+    return get_persistent_store()
+
+
+def test_put_then_get(db_path):
+    store = PersistentStore(db_path)
+    key = cache_key("tid-001", "service", "list")
+    store.put(key, [{"Name": "web-app"}], ttl=60)
+    hit, value, ttl_left = store.get(key)
+    assert hit
+    assert value == [{"Name": "web-app"}]
+    assert 0 < ttl_left <= 60
+    assert store.stats()["rows"] == 1
+
+
+def test_rows_expire(db_path):
+    clock = FakeClock()
+    store = PersistentStore(db_path, clock=clock)
+    key = cache_key("tid-001", "service", "list")
+    store.put(key, [], ttl=10)
+    clock.now += 11
+    assert store.get(key) == (False, None, 0.0)
+
+
+def test_database_uses_wal(db_path):
+    PersistentStore(db_path)
+    assert sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_oldest_rows_evicted_over_size_cap(db_path):
+    clock = FakeClock()
+    store = PersistentStore(db_path, max_bytes=250, clock=clock)
+    keys = [cache_key("tid-001", "service", "get", (str(n),)) for n in range(4)]
+    for key in keys:
+        clock.now += 1
+        store.put(key, {"Name": "x" * 80}, ttl=60)
+    assert store.get(keys[0])[0] is False
+    assert store.get(keys[3])[0] is True
+    assert store.stats()["bytes"] <= 250
+    assert store.stats()["evictions"] == 2
+
+
+def test_invalidate_by_tenant_and_resource(db_path):
+    store = PersistentStore(db_path)
+    service = cache_key("tid-001", "service", "list")
+    hosts = cache_key("tid-001", "hosts", "list")
+    other = cache_key("tid-002", "service", "list")
+    for key in (service, hosts, other):
+        store.put(key, [], ttl=60)
+    store.invalidate("tid-001", "service")
+    assert [store.get(k)[0] for k in (service, hosts, other)] == [False, True, True]
+    store.invalidate("tid-001")
+    assert store.get(hosts)[0] is False
+
+
+def test_scopes_are_kept_apart(db_path):
+    key = cache_key("tid-001", "service", "list")
+    PersistentStore(db_path, scope="https://a.example").put(key, ["a"], ttl=60)
+    assert PersistentStore(db_path, scope="https://b.example").get(key)[0] is False
+
+
+def test_scope_includes_token(db_path, monkeypatch):
+    monkeypatch.setenv("DUPLO_CACHE_DB", db_path)
+    monkeypatch.setenv("DUPLO_HOST", "https://test.duplocloud.net/")
+    monkeypatch.setenv("DUPLO_TOKEN", "token-a")
+    key = cache_key("tid-001", "service", "list")
+    get_persistent_store().put(key, ["a"], ttl=60)
+    assert "token-a" not in get_persistent_store().scope
+    reset_persistent_store()
+    monkeypatch.setenv("DUPLO_TOKEN", "token-b")
+    assert get_persistent_store().get(key)[0] is False
+    assert get_persistent_store().scope.startswith("https://test.duplocloud.net ")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_database_file_is_private(db_path):
+    PersistentStore(db_path).put(cache_key("tid-001", "service", "list"), ["a"], ttl=60)
+    for path in (db_path, db_path + "-wal"):
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_shared_between_store_instances(db_path):
+    key = cache_key("tid-001", "service", "list")
+    PersistentStore(db_path).put(key, ["warm"], ttl=60)
+    assert PersistentStore(db_path).get(key)[1] == ["warm"]
+
+
+def test_concurrent_threads(db_path):
+    store = PersistentStore(db_path)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                key = cache_key(f"tid-{n}", "service", "get", (str(i),))
+                store.put(key, {"n": n, "i": i}, ttl=60)
+                assert store.get(key)[1] == {"n": n, "i": i}
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert store.stats()["rows"] == 80
+
+
+def test_sqlite_errors_are_misses(db_path):
+    store = PersistentStore(db_path)
+    store._connect().execute("DROP TABLE responses")
+    key = cache_key("tid-001", "service", "list")
+    store.put(key, [], ttl=60)
+    assert store.get(key) == (False, None, 0.0)
+    assert store.stats()["errors"] >= 2
+
+
+def test_disabled_without_env(monkeypatch):
+    monkeypatch.delenv("DUPLO_CACHE_DB", raising=False)
+    assert get_persistent_store() is None
+
+
+def test_cached_read_restores_from_store_after_restart(persistent):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [{"Name": "web-app"}]
+
+    assert cached_read("tid-001", "service", "list", (), fetch) == [{"Name": "web-app"}]
+    get_cache().clear()
+    reset_persistent_store()
+
+    assert cached_read("tid-001", "service", "list", (), fetch) == [{"Name": "web-app"}]
+    assert len(calls) == 1
+    assert get_persistent_store().stats()["hits"] == 1
+    assert get_cache().get(cache_key("tid-001", "service", "list"))[0]
+
+
+def test_fresh_skips_store(persistent):
+    cached_read("tid-001", "service", "list", (), lambda: ["old"])
+    get_cache().clear()
+    assert cached_read("tid-001", "service", "list", (), lambda: ["new"], fresh=True) == ["new"]
+
+
+def test_restored_list_rebuilds_name_index(persistent):
+    indexed_list("tid-001", "service", lambda: [{"Name": "web-app"}])
+    get_cache().clear()
+    get_index().clear()
+    indexed_list("tid-001", "service", lambda: pytest.fail("should be restored from the store"))
+    assert get_index().lookup("tid-001", "service", "web-app") == {"Name": "web-app"}
+
+
+def test_write_invalidates_store(persistent):
+    cached_read("tid-001", "service", "list", (), lambda: ["before"])
+    with invalidating("tid-001", "service"):
+        pass
+    assert persistent.get(cache_key("tid-001", "service", "list"))[0] is False
+    assert cached_read("tid-001", "service", "list", (), lambda: ["after"]) == ["after"]
+
+
+def test_uncacheable_resources_not_persisted(persistent, monkeypatch):
+    monkeypatch.setitem(get_cache().ttls, "service", 0)
+    cached_read("tid-001", "service", "list", (), lambda: ["x"])
+    assert persistent.stats()["rows"] == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from duplocloud_mcp.projection import project
+
+HOSTS = [
+    {"FriendlyName": "host-1", "Status": "running", "Tags": [{"Key": "env", "Value": "dev"}], "Meta": {"a": 1, "b": 2}},
+    {"FriendlyName": "host-2", "Status": "stopped", "Meta": {"a": 3}},
+]
+
+
+def test_no_fields_returns_data_unchanged():
+    assert project(HOSTS, None) is HOSTS
+    assert project(HOSTS, "  ") is HOSTS
+
+
+def test_top_level_fields_on_list():
+    assert project(HOSTS, "FriendlyName, Status") == [
+        {"FriendlyName": "host-1", "Status": "running"},
+        {"FriendlyName": "host-2", "Status": "stopped"},
+    ]
+
+
+def test_dotted_path_into_nested_dict():
+    assert project(HOSTS, "FriendlyName,Meta.a") == [
+        {"FriendlyName": "host-1", "Meta": {"a": 1}},
+        {"FriendlyName": "host-2", "Meta": {"a": 3}},
+    ]
+
+
+def test_dotted_path_through_list():
+    assert project(HOSTS[0], "Tags.Key") == {"Tags": [{"Key": "env"}]}
+
+
+def test_missing_fields_omitted():
+    assert project(HOSTS, "Tags") == [{"Tags": HOSTS[0]["Tags"]}, {}]
+
+
+def test_parent_path_wins_over_child():
+    assert project(HOSTS[0], "Meta.a,Meta") == {"Meta": {"a": 1, "b": 2}}
+    assert project(HOSTS[0], "Meta,Meta.a") == {"Meta": {"a": 1, "b": 2}}
+
+
+def test_input_not_modified():
+    record = {"Name": "web-app", "Image": "nginx", "Spec": {"Replicas": 2}}
+    project(record, "Spec.Replicas")
+    assert record == {"Name": "web-app", "Image": "nginx", "Spec": {"Replicas": 2}}
+
+
+def test_scalar_passthrough():
+    assert project("plain text", "Name") == "plain text"
+
+
+def test_invalid_path():
+    with pytest.raises(ValueError, match="Invalid field path"):
+        project(HOSTS, "Meta..a")
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from duplocloud_mcp.meta import collecting_meta, with_meta
+from duplocloud_mcp.ratelimit import FairBucket, RateLimiter, TokenBucket, get_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_burst_then_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+    assert bucket.time_until_token() == 0.5
+    clock.now = 0.5
+    assert bucket.try_take()
+
+
+def test_token_bucket_never_exceeds_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+    clock.now = 100
+    assert [bucket.try_take() for _ in range(3)] == [True, True, False]
+
+
+def test_fair_bucket_queues_instead_of_failing():
+    bucket = FairBucket(rate=20, burst=1)
+    start = time.monotonic()
+    waits = [bucket.acquire("tid-001") for _ in range(3)]
+    assert time.monotonic() - start >= 0.09
+    assert waits[0] < 0.01
+    assert bucket.stats()["delayed"] == 2
+
+
+def test_fair_bucket_round_robins_between_tenants():
+    bucket = FairBucket(rate=50, burst=1)
+    bucket.acquire("warmup")
+    order = []
+    lock = threading.Lock()
+
+    def call(tenant):
+        bucket.acquire(tenant)
+        with lock:
+            order.append(tenant)
+
+    noisy = [threading.Thread(target=call, args=("noisy",)) for _ in range(6)]
+    for t in noisy:
+        t.start()
+    time.sleep(0.01)
+    quiet = threading.Thread(target=call, args=("quiet",))
+    quiet.start()
+    for t in [*noisy, quiet]:
+        t.join()
+    assert order.index("quiet") <= 2
+
+
+def test_limiter_separate_read_and_write_budgets():
+    limiter = RateLimiter(read_rate=100, write_rate=0)
+    assert set(limiter.stats()) == {"read"}
+    assert limiter.acquire("POST", "tid-001") == 0.0
+    limiter.acquire("GET", "tid-001")
+    assert limiter.stats()["read"]["acquired"] == 1
+
+
+def test_limiter_wait_recorded_in_call_meta():
+    limiter = RateLimiter(read_rate=20, read_burst=1)
+    with collecting_meta() as meta:
+        limiter.acquire("GET", "tid-001")
+        limiter.acquire("GET", "tid-001")
+    assert meta["duplocloud/rate_limit_wait_ms"] > 10
+
+
+def test_with_meta():
+    assert with_meta("[]", {}) == "[]"
+    result = with_meta("[]", {"duplocloud/rate_limit_wait_ms": 12.5})
+    assert result.meta == {"duplocloud/rate_limit_wait_ms": 12.5}
+    assert result.content[0].text == "[]"
+    assert result.structuredContent == {"result": "[]"}
+
+
+def test_limiter_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_RATE_READ", "7")
+    monkeypatch.setenv("DUPLO_RATE_WRITE", "0")
+    monkeypatch.setenv("DUPLO_RATE_READ_BURST", "14")
+    limiter = get_limiter()
+    assert limiter.stats()["read"]["rate"] == 7
+    assert limiter.stats()["read"]["burst"] == 14
+    assert "write" not in limiter.stats()
+
+
+def test_limiter_off_by_default(monkeypatch):
+    monkeypatch.delenv("DUPLO_RATE_READ", raising=False)
+    monkeypatch.delenv("DUPLO_RATE_WRITE", raising=False)
+    limiter = get_limiter()
+    assert limiter.stats() == {}
+    assert limiter.acquire("POST", "tid-001") == 0
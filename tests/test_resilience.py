@@ -0,0 +1,128 @@
+import email.utils
+import time
+
+import pytest
+from duplocloud.errors import DuploError
+
+from duplocloud_mcp.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+    get_breaker,
+    get_retry_policy,
+    idempotent,
+    is_retryable,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    future = email.utils.formatdate(time.time() + 5, usegmt=True)
+    assert 3 < parse_retry_after(future) <= 5
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(max_retries=10, base=1, cap=4)
+    delays = [policy.delay(attempt) for attempt in range(8)]
+    assert all(0 <= d <= 4 for d in delays)
+    assert policy.stats()["retries"] == 8
+
+
+def test_retries_are_exhausted():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.delay(1) is not None
+    assert policy.delay(2) is None
+    assert policy.stats()["exhausted"] == 1
+
+
+def test_retry_after_is_honored_up_to_the_cap():
+    policy = RetryPolicy(cap=5)
+    assert policy.delay(0, "2") == 2.0
+    assert policy.delay(0, "30") is None
+
+
+def test_only_reads_retry_outside_idempotent_tools():
+    assert is_retryable("GET")
+    assert not is_retryable("POST")
+
+    @idempotent
+    def update():
+        return is_retryable("POST")
+
+    assert update()
+    assert not is_retryable("POST")
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("https://portal", threshold=2, reset=10, clock=clock)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(DuploError) as exc:
+        breaker.before_call()
+    assert exc.value.code == 503
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_half_open_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker("https://portal", threshold=1, reset=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(DuploError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["trips"] == 2
+
+
+def test_breaker_half_open_trial_throttled():
+    clock = FakeClock()
+    breaker = CircuitBreaker("https://portal", threshold=1, reset=10, clock=clock)
+    breaker.record_throttled()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    clock.now = 10
+    breaker.before_call()
+    breaker.record_throttled()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("https://portal", threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_shared_instances_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_RETRY_MAX", "5")
+    monkeypatch.setenv("DUPLO_BREAKER_THRESHOLD", "7")
+    assert get_retry_policy().max_retries == 5
+    breaker = get_breaker("https://portal")
+    assert breaker.threshold == 7
+    assert get_breaker("https://portal") is breaker
+    assert get_breaker("https://other") is not breaker
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from duplocloud_mcp import server
+from duplocloud_mcp.metrics import get_metrics
+from duplocloud_mcp.ratelimit import get_limiter
+from duplocloud_mcp.server import (
+    DOCKER_TOOLS_PATH,
+    TOOL_SCHEMA_PATH,
+    docker_tools,
+    load_tools,
+    mcp,
+    run,
+    tool_schema,
+    write_tool_schema,
+)
+
+
+async def test_tools_registered_as_async():
+    load_tools()
+    tools = mcp._tool_manager.list_tools()
+    assert len(tools) == 43
+    assert all(t.is_async for t in tools)
+
+
+async def test_tool_schema_uses_original_signature():
+    tools = {t.name: t for t in await mcp.list_tools()}
+    schema = tools["service_update"].inputSchema
+    assert set(schema["properties"]) == {"tenant_id", "name", "image", "replicas"}
+    assert schema["required"] == ["tenant_id", "name"]
+
+
+async def test_precomputed_tool_schema_is_current():
+    with open(TOOL_SCHEMA_PATH) as f:
+        precomputed = json.load(f)
+    assert precomputed == await tool_schema(), "tool_schema.json is stale; regenerate it with `task tools:json`"
+
+
+async def test_docker_tools_manifest_is_current():
+    with open(DOCKER_TOOLS_PATH) as f:
+        manifest = json.load(f)
+    assert manifest == docker_tools(await tool_schema()), (
+        "docker/tools.json is stale; regenerate it with `task tools:json`"
+    )
+
+
+def test_write_tool_schema_ignores_precomputed_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "_precomputed_tools", lambda: [])
+    write_tool_schema(tmp_path / "tool_schema.json", tmp_path / "tools.json")
+    schema = json.loads((tmp_path / "tool_schema.json").read_text())
+    assert len(schema) == 43
+    assert json.loads((tmp_path / "tools.json").read_text()) == docker_tools(schema)
+
+
+async def test_list_tools_served_from_schema_before_tools_load(monkeypatch):
+    monkeypatch.setattr(server, "_tools_loaded", False)
+    with patch.object(server, "load_tools") as mock_load:
+        tools = await mcp.list_tools()
+    mock_load.assert_not_called()
+    assert len(tools) == 43
+    assert tools[0].outputSchema is not None
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_first_call_loads_tools(mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+    monkeypatch.setattr(server, "_tools_loaded", False)
+
+    content, _ = await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    assert server._tools_loaded
+    assert json.loads(content[0].text)[0]["Name"] == "web-app"
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_tool_call_runs_on_worker_pool(mock_get_client, mock_duplo_client, mock_service_resource):
+    threads = []
+
+    def record_list():
+        threads.append(threading.current_thread().name)
+        return [{"Name": "web-app"}]
+
+    mock_service_resource.list.side_effect = record_list
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    content, _ = await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    assert json.loads(content[0].text) == [{"Name": "web-app"}]
+    assert threads[0].startswith("duplo-worker")
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_slow_tool_does_not_block_event_loop(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_service_resource.list.side_effect = lambda: time.sleep(0.3) or []
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(mcp.call_tool("service_list", {"tenant_id": f"tid-{i}"}) for i in range(4)))
+    elapsed = time.perf_counter() - start
+    ticking.cancel()
+
+    assert elapsed < 0.9
+    assert ticks > 10
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_rate_limit_wait_reported_in_meta(mock_get_client, mock_duplo_client, mock_service_resource):
+    def throttled_list():
+        get_limiter().acquire("GET", "tid-001")
+        get_limiter().acquire("GET", "tid-001")
+        return []
+
+    mock_service_resource.list.side_effect = throttled_list
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    with patch.dict("os.environ", {"DUPLO_RATE_READ": "20", "DUPLO_RATE_READ_BURST": "1"}):
+        result = await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    assert result.meta["duplocloud/rate_limit_wait_ms"] > 10
+    assert json.loads(result.content[0].text) == []
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_session_limits_reported_in_meta(mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch):
+    monkeypatch.setattr(server, "_limit_sessions", True)
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        result = await client.call_tool("service_list", {"tenant_id": "tid-001"})
+    assert not result.isError
+    assert result.meta["duplocloud/session"]["concurrency_limit"] == 4
+    assert result.meta["duplocloud/session"]["in_flight"] == 1
+    assert json.loads(result.content[0].text)[0]["Name"] == "web-app"
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_session_concurrency_capped_per_session(
+    mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch
+):
+    monkeypatch.setattr(server, "_limit_sessions", True)
+    monkeypatch.setenv("DUPLO_MCP_SESSION_CONCURRENCY", "2")
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def slow_list():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return []
+
+    mock_service_resource.list.side_effect = slow_list
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        results = await asyncio.gather(*(client.call_tool("service_list", {"tenant_id": f"tid-{i}"}) for i in range(6)))
+    assert peak == 2
+    assert max(r.meta["duplocloud/session"]["queue_wait_ms"] for r in results) > 10
+
+
+@pytest.mark.parametrize("value, expected", [(None, "stdio"), ("streamable-http", "streamable-http"), ("SSE", "sse")])
+def test_run_selects_transport_from_env(monkeypatch, value, expected):
+    monkeypatch.setattr(server, "_limit_sessions", False)
+    if value is None:
+        monkeypatch.delenv("DUPLO_MCP_TRANSPORT", raising=False)
+    else:
+        monkeypatch.setenv("DUPLO_MCP_TRANSPORT", value)
+    with patch.object(mcp, "run") as mock_run:
+        run()
+    mock_run.assert_called_once_with(transport=expected)
+    assert server._limit_sessions == (expected != "stdio")
+
+
+def test_run_rejects_unknown_transport():
+    with patch.object(mcp, "run") as mock_run, pytest.raises(ValueError, match="Unknown transport"):
+        run("websocket")
+    mock_run.assert_not_called()
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_stdio_sessions_not_capped(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        result = await client.call_tool("service_list", {"tenant_id": "tid-001"})
+    assert result.meta is None
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_tool_calls_recorded_in_metrics(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    await mcp.call_tool("service_get", {"tenant_id": "tid-001", "name": ""})
+
+    summary = get_metrics().snapshot()
+    assert summary["service_list"]["calls"] == {"ok": 2}
+    assert summary["service_list"]["counters"] == {
+        "cache_lookups{layer=memory,result=hit}": 1,
+        "cache_lookups{layer=memory,result=miss}": 1,
+    }
+    assert summary["service_get"]["errors"] == {"400": 1}
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from starlette.testclient import TestClient
+
+    with get_metrics().observing("tenant_list") as call:
+        call["result"] = "[]"
+    response = TestClient(mcp.streamable_http_app()).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'duplo_mcp_tool_calls_total{tool="tenant_list",outcome="ok"} 1' in response.text
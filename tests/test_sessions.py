@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from duplocloud_mcp.sessions import DEFAULT_SESSION_CONCURRENCY, SessionLimiter, get_session_limiter
+
+
+class FakeSession:
+    pass
+
+
+async def test_calls_beyond_limit_wait_for_a_slot():
+    limiter = SessionLimiter(2)
+    session = FakeSession()
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot(session):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+    assert limiter.stats()["delayed"] == 4
+
+
+async def test_sessions_do_not_share_slots():
+    limiter = SessionLimiter(1)
+    first, second = FakeSession(), FakeSession()
+    async with limiter.slot(first) as held:
+        async with limiter.slot(second) as other:
+            assert held["in_flight"] == 1
+            assert other["in_flight"] == 1
+            assert other["queue_wait_ms"] < 1
+        assert limiter.stats()["sessions"] == 2
+
+
+async def test_slot_reports_limits():
+    limiter = SessionLimiter(3)
+    async with limiter.slot(FakeSession()) as info:
+        assert info["concurrency_limit"] == 3
+        assert info["in_flight"] == 1
+        assert info["queued"] == 0
+        assert limiter.stats()["in_flight"] == 1
+    assert limiter.stats()["in_flight"] == 0
+
+
+async def test_slot_released_on_error():
+    limiter = SessionLimiter(1)
+    session = FakeSession()
+    with pytest.raises(RuntimeError):
+        async with limiter.slot(session):
+            raise RuntimeError("boom")
+    async with asyncio.timeout(1):
+        async with limiter.slot(session) as info:
+            assert info["in_flight"] == 1
+
+
+async def test_closed_sessions_are_forgotten():
+    limiter = SessionLimiter(1)
+    session = FakeSession()
+    async with limiter.slot(session):
+        pass
+    assert limiter.stats()["sessions"] == 1
+    del session
+    assert limiter.stats()["sessions"] == 0
+
+
+def test_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        SessionLimiter(0)
+
+
+def test_get_session_limiter_reads_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_MCP_SESSION_CONCURRENCY", "2")
+    assert get_session_limiter().limit == 2
+
+
+def test_get_session_limiter_default():
+    assert get_session_limiter().limit == DEFAULT_SESSION_CONCURRENCY
@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from duplocloud_mcp.cache import cached_read, get_cache, invalidating
+from duplocloud_mcp.singleflight import SingleFlight, get_flight
+
+KEY = ("tid-001", "service", "list", ())
+
+
+def _slow(calls, value, delay=0.2):
+    def fetch():
+        calls.append(1)
+        time.sleep(delay)
+        return value
+
+    return fetch
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: flight.do(KEY, _slow(calls, ["a"])), range(8)))
+    assert results == [["a"]] * 8
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert stats["executed"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(lambda t: flight.do((t, "service", "list", ()), _slow(calls, t, 0.05)), ["a", "b"]))
+    assert len(calls) == 2
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("portal down")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, KEY, fail)
+        started.wait()
+        follower = pool.submit(flight.do, KEY, lambda: "unused")
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="portal down"):
+                future.result()
+    assert flight.stats()["coalesced"] == 1
+
+
+def test_sequential_calls_run_again():
+    flight = SingleFlight()
+    assert flight.do(KEY, lambda: 1) == 1
+    assert flight.do(KEY, lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_forget_starts_a_new_flight():
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(flight.do, KEY, _slow(calls, "before"))
+        time.sleep(0.05)
+        flight.forget("tid-001", "service")
+        second = pool.submit(flight.do, KEY, _slow(calls, "after", 0))
+        assert second.result() == "after"
+        assert first.result() == "before"
+    assert len(calls) == 2
+
+
+def test_cached_read_coalesces_concurrent_misses():
+    calls = []
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(lambda _: cached_read("tid-001", "service", "list", (), _slow(calls, ["a"])), range(6)))
+    assert results == [["a"]] * 6
+    assert len(calls) == 1
+    assert get_flight().stats()["coalesced"] == 5
+    assert get_cache().get(KEY) == (True, ["a"])
+
+
+def test_fresh_read_does_not_join_a_cached_read():
+    calls = []
+    with ThreadPoolExecutor(2) as pool:
+        cached = pool.submit(cached_read, "tid-001", "service", "list", (), _slow(calls, ["cached"]))
+        time.sleep(0.05)
+        fresh = pool.submit(cached_read, "tid-001", "service", "list", (), _slow(calls, ["fresh"], 0), fresh=True)
+        assert cached.result() == ["cached"]
+        assert fresh.result() == ["fresh"]
+    assert len(calls) == 2
+    assert get_flight().stats()["coalesced"] == 0
+
+
+def test_write_detaches_in_flight_reads():
+    calls = []
+    with ThreadPoolExecutor(2) as pool:
+        pool.submit(cached_read, "tid-001", "service", "list", (), _slow(calls, ["old"]))
+        time.sleep(0.05)
+        with invalidating("tid-001", "service"):
+            pass
+        assert get_flight().stats()["in_flight"] == 0
+
+
+def test_read_finishing_after_a_write_is_not_cached():
+    calls = []
+    with ThreadPoolExecutor(1) as pool:
+        read = pool.submit(cached_read, "tid-001", "service", "list", (), _slow(calls, ["old"]))
+        time.sleep(0.05)
+        with invalidating("tid-001", "service"):
+            pass
+        assert read.result() == ["old"]
+    assert get_cache().get(KEY) == (False, None)
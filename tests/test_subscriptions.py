@@ -0,0 +1,195 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import mcp.types as types
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from duplocloud_mcp.server import load_tools, mcp
+from duplocloud_mcp.subscriptions import SubscriptionManager, Watch, get_subscriptions, parse_uri
+
+SERVICES = "duplo://tenants/tid-001/services"
+
+
+@pytest.fixture(autouse=True)
+def _resources():
+    load_tools()
+
+
+class FakeListing:
+    """A blocking listing call whose records the test changes between polls."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return [dict(r) for r in self.records]
+
+
+@pytest.fixture
+def listing(monkeypatch):
+    fake = FakeListing([{"Name": "web-app", "Image": "nginx:1"}, {"Name": "api", "Image": "node:18"}])
+    from duplocloud_mcp import subscriptions
+
+    monkeypatch.setitem(subscriptions.FEEDS, "services", subscriptions.FEEDS["services"]._replace(fetch=fake))
+    return fake
+
+
+def _session():
+    session = AsyncMock()
+    session.sent = []
+    session.send_resource_updated.side_effect = lambda uri: session.sent.append(str(uri))
+    return session
+
+
+async def _until(condition, timeout=2.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+def test_parse_uri():
+    assert parse_uri(SERVICES) == (Watch("tid-001", "services"), None)
+    assert parse_uri("duplo://tenants/tid-001/hosts/host%201") == (Watch("tid-001", "hosts"), "host 1")
+    assert parse_uri("duplo://tenants/tid-001/ecs-services/web/tasks") == (Watch("tid-001", "ecs-tasks", "web"), None)
+    assert Watch("tid-001", "hosts").uri("host 1") == "duplo://tenants/tid-001/hosts/host%201"
+    for uri in ("duplo://tenants/tid-001/buckets", "duplo://tenants/tid-001", "file:///etc/passwd", SERVICES + "/a/b"):
+        with pytest.raises(ValueError, match="Unknown resource"):
+            parse_uri(uri)
+
+
+async def test_subscribers_share_one_poller(listing):
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.01)
+    sessions = [_session() for _ in range(5)]
+    for session in sessions:
+        manager.subscribe(SERVICES, session)
+    manager.subscribe(SERVICES + "/api", sessions[0])
+    await _until(lambda: listing.calls >= 2)
+    assert manager.stats()["pollers"] == 1
+    assert manager.stats()["subscriptions"] == 6
+
+    listing.records = [{"Name": "web-app", "Image": "nginx:1"}, {"Name": "api", "Image": "node:20"}]
+    calls = listing.calls
+    await _until(lambda: all(s.sent for s in sessions))
+    assert listing.calls - calls <= 2
+    assert sessions[0].sent == [SERVICES, SERVICES + "/api"]
+    assert all(s.sent == [SERVICES] for s in sessions[1:])
+    manager.stop()
+
+
+async def test_record_subscribers_only_hear_about_their_record(listing):
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.01)
+    web, api = _session(), _session()
+    manager.subscribe(SERVICES + "/web-app", web)
+    manager.subscribe(SERVICES + "/api", api)
+    await _until(lambda: listing.calls >= 1)
+    listing.records = listing.records[:1]
+    await _until(lambda: api.sent)
+    assert api.sent == [SERVICES + "/api"]
+    assert web.sent == []
+    manager.stop()
+
+
+async def test_interval_backs_off_until_something_changes(listing):
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.08)
+    session = _session()
+    manager.subscribe(SERVICES, session)
+    await _until(lambda: manager.stats()["intervals"] == [0.08])
+    listing.records = []
+    await _until(lambda: session.sent)
+    assert manager.stats()["intervals"] == [0.01]
+    manager.stop()
+
+
+async def test_last_unsubscribe_stops_the_poller(listing):
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.01)
+    first, second = _session(), _session()
+    manager.subscribe(SERVICES, first)
+    manager.subscribe(SERVICES + "/api", second)
+    manager.unsubscribe(SERVICES, first)
+    assert manager.stats()["pollers"] == 1
+    manager.unsubscribe(SERVICES + "/api", second)
+    assert manager.stats() == {"subscriptions": 0, "pollers": 0, "polls": 0, "notifications": 0, "intervals": []}
+    await asyncio.sleep(0.03)
+    calls = listing.calls
+    await asyncio.sleep(0.03)
+    assert listing.calls == calls
+
+
+async def test_closed_session_loses_its_subscriptions(listing):
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.01)
+    closed, open_ = _session(), _session()
+    closed.send_resource_updated.side_effect = ConnectionError("closed")
+    manager.subscribe(SERVICES, closed)
+    manager.subscribe(SERVICES + "/api", closed)
+    manager.subscribe(SERVICES, open_)
+    await _until(lambda: listing.calls >= 1)
+    listing.records = []
+    await _until(lambda: open_.sent)
+    assert manager.stats()["subscriptions"] == 1
+    manager.stop()
+
+
+async def test_failed_poll_backs_off(listing):
+    listing.records = None
+    manager = SubscriptionManager(min_interval=0.01, max_interval=0.04)
+    manager.subscribe(SERVICES, _session())
+    await _until(lambda: manager.stats()["intervals"] == [0.04])
+    manager.stop()
+
+
+@patch("duplocloud_mcp.tools.resources.get_tenant_client")
+async def test_subscribe_over_mcp(mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+    updates = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            if isinstance(message.root, types.ResourceUpdatedNotification):
+                updates.append(str(message.root.params.uri))
+
+    async with create_connected_server_and_client_session(mcp._mcp_server, message_handler=on_message) as client:
+        assert (await client.initialize()).capabilities.resources.subscribe is True
+        result = await client.read_resource(AnyUrl(SERVICES))
+        assert [s["Name"] for s in json.loads(result.contents[0].text)] == ["web-app", "api"]
+
+        await client.subscribe_resource(AnyUrl(SERVICES + "/api"))
+        await _until(lambda: mock_service_resource.list.call_count >= 2)
+        mock_service_resource.list.return_value = [{"Name": "api", "Image": "node:20", "Replicas": 3}]
+        await _until(lambda: updates)
+        assert updates[0] == SERVICES + "/api"
+        assert get_subscriptions().stats()["subscriptions"] == 1
+
+        await client.unsubscribe_resource(AnyUrl(SERVICES + "/api"))
+        assert get_subscriptions().stats()["pollers"] == 0
+
+
+@patch("duplocloud_mcp.tools.resources.get_tenant_client")
+async def test_closed_session_stops_its_poller(mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        await client.subscribe_resource(AnyUrl(SERVICES))
+        await client.subscribe_resource(AnyUrl(SERVICES + "/api"))
+        await _until(lambda: mock_service_resource.list.call_count >= 2)
+        assert get_subscriptions().stats()["pollers"] == 1
+
+    assert get_subscriptions().stats()["subscriptions"] == 0
+    assert get_subscriptions().stats()["pollers"] == 0
+    calls = mock_service_resource.list.call_count
+    await asyncio.sleep(0.05)
+    assert mock_service_resource.list.call_count == calls
+
+
+async def test_resource_templates_listed():
+    templates = {t.uriTemplate for t in await mcp.list_resource_templates()}
+    assert "duplo://tenants/{tenant_id}/services/{name}" in templates
+    assert "duplo://tenants/{tenant_id}/ecs-services/{service_name}/tasks" in templates
@@ -5,13 +5,14 @@ from duplocloud_mcp.tools.containers import (
     ecs_service_delete,
     ecs_service_list,
     ecs_service_update,
+    ecs_service_update_many,
     ecs_task_def_list,
     ecs_task_list,
     ecs_task_run,
 )
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_service_list(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -21,7 +22,7 @@ def test_ecs_service_list(mock_get_client, mock_duplo_client, mock_ecs_resource)
     assert result[0]["ServiceName"] == "my-ecs-svc"
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_task_def_list(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -31,7 +32,7 @@ def test_ecs_task_def_list(mock_get_client, mock_duplo_client, mock_ecs_resource
     assert result[0]["Family"] == "my-task-def"
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_task_list(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -41,7 +42,7 @@ def test_ecs_task_list(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_ecs_resource.list_tasks.assert_called_once_with("my-ecs-svc")
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_task_run(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -51,7 +52,7 @@ def test_ecs_task_run(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_ecs_resource.run_task.assert_called_once_with("my-task-def", 3)
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_service_update(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -61,7 +62,7 @@ def test_ecs_service_update(mock_get_client, mock_duplo_client, mock_ecs_resourc
     mock_ecs_resource.update_image.assert_called_once_with("my-task-def", "myimage:v2")
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_service_delete(mock_get_client, mock_duplo_client, mock_ecs_resource):
     mock_duplo_client.load.return_value = mock_ecs_resource
     mock_get_client.return_value = mock_duplo_client
@@ -71,8 +72,27 @@ def test_ecs_service_delete(mock_get_client, mock_duplo_client, mock_ecs_resourc
     mock_ecs_resource.delete_service.assert_called_once_with("my-ecs-svc")
 
 
-@patch("duplocloud_mcp.tools.containers.get_client")
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
 def test_ecs_task_list_empty_name(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(ecs_task_list("tid-001", ""))
     assert "error" in result
+
+
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
+def test_ecs_task_list_fields(mock_get_client, mock_duplo_client, mock_ecs_resource):
+    mock_duplo_client.load.return_value = mock_ecs_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(ecs_task_list("tid-001", "my-ecs-svc", fields="TaskArn,Missing"))
+    assert result == [{"TaskArn": "arn:aws:ecs:task/abc123"}]
+
+
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
+def test_ecs_service_update_many(mock_get_client, mock_duplo_client, mock_ecs_resource):
+    mock_duplo_client.load.return_value = mock_ecs_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(ecs_service_update_many("tid-001", ["web", "worker"], "app:v2"))
+    assert result["succeeded"] == 2
+    mock_ecs_resource.update_image.assert_any_call("worker", "app:v2")
@@ -10,7 +10,7 @@ from duplocloud_mcp.tools.databases import (
 )
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_list(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -20,7 +20,7 @@ def test_database_list(mock_get_client, mock_duplo_client, mock_rds_resource):
     assert result[0]["Engine"] == "postgres"
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_get(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -30,7 +30,7 @@ def test_database_get(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_rds_resource.find.assert_called_once_with("mydb")
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_create(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -48,7 +48,7 @@ def test_database_create(mock_get_client, mock_duplo_client, mock_rds_resource):
     )
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_update_size(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -58,7 +58,7 @@ def test_database_update_size(mock_get_client, mock_duplo_client, mock_rds_resou
     mock_rds_resource.set_instance_size.assert_called_once_with("mydb", "db.t3.small")
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_update_nothing(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -67,7 +67,7 @@ def test_database_update_nothing(mock_get_client, mock_duplo_client, mock_rds_re
     assert "error" in result
 
 
-@patch("duplocloud_mcp.tools.databases.get_client")
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
 def test_database_delete(mock_get_client, mock_duplo_client, mock_rds_resource):
     mock_duplo_client.load.return_value = mock_rds_resource
     mock_get_client.return_value = mock_duplo_client
@@ -1,10 +1,18 @@
 import json
 from unittest.mock import patch
 
-from duplocloud_mcp.tools.hosts import host_create, host_delete, host_get, host_list, host_reboot
-
-
-@patch("duplocloud_mcp.tools.hosts.get_client")
+from duplocloud_mcp.tools.hosts import (
+    host_changes,
+    host_create,
+    host_delete,
+    host_get,
+    host_list,
+    host_reboot,
+    host_reboot_many,
+)
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_list(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_duplo_client.load.return_value = mock_host_resource
     mock_get_client.return_value = mock_duplo_client
@@ -14,7 +22,7 @@ def test_host_list(mock_get_client, mock_duplo_client, mock_host_resource):
     assert result[0]["FriendlyName"] == "host-1"
 
 
-@patch("duplocloud_mcp.tools.hosts.get_client")
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_get(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_duplo_client.load.return_value = mock_host_resource
     mock_get_client.return_value = mock_duplo_client
@@ -25,14 +33,14 @@ def test_host_get(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_host_resource.find.assert_called_once_with("host-1")
 
 
-@patch("duplocloud_mcp.tools.hosts.get_client")
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_get_empty_name(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(host_get("tid-001", ""))
     assert "error" in result
 
 
-@patch("duplocloud_mcp.tools.hosts.get_client")
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_create(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_duplo_client.load.return_value = mock_host_resource
     mock_get_client.return_value = mock_duplo_client
@@ -44,7 +52,7 @@ def test_host_create(mock_get_client, mock_duplo_client, mock_host_resource):
     )
 
 
-@patch("duplocloud_mcp.tools.hosts.get_client")
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_delete(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_duplo_client.load.return_value = mock_host_resource
     mock_get_client.return_value = mock_duplo_client
@@ -54,7 +62,7 @@ def test_host_delete(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_host_resource.delete.assert_called_once_with("host-1")
 
 
-@patch("duplocloud_mcp.tools.hosts.get_client")
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
 def test_host_reboot(mock_get_client, mock_duplo_client, mock_host_resource):
     mock_duplo_client.load.return_value = mock_host_resource
     mock_get_client.return_value = mock_duplo_client
@@ -62,3 +70,70 @@ def test_host_reboot(mock_get_client, mock_duplo_client, mock_host_resource):
     result = json.loads(host_reboot("tid-001", "host-1"))
     assert "message" in result
     mock_host_resource.reboot.assert_called_once_with("host-1")
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_delete_invalidates_cache(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    host_list("tid-001")
+    host_list("tid-001")
+    assert mock_host_resource.list.call_count == 1
+    host_delete("tid-001", "host-1")
+    host_list("tid-001")
+    assert mock_host_resource.list.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_list_fields(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(host_list("tid-001", fields="FriendlyName,Status"))
+    assert result == [{"FriendlyName": "host-1", "Status": "running"}]
+    full = json.loads(host_list("tid-001"))
+    assert full[0]["InstanceId"] == "i-abc123"
+    mock_host_resource.list.assert_called_once()
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_get_invalid_fields(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(host_get("tid-001", "host-1", fields="."))
+    assert result["code"] == 400
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_reboot_many(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(host_reboot_many("tid-001", ["host-1", "host-2"]))
+    assert result["succeeded"] == 2
+    assert [row["target"] for row in result["results"]] == ["host-1", "host-2"]
+    assert mock_host_resource.reboot.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_reboot_many_empty_names(mock_get_client, mock_duplo_client):
+    mock_get_client.return_value = mock_duplo_client
+    result = json.loads(host_reboot_many("tid-001", []))
+    assert result["code"] == 400
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_changes_after_reboot(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    first = json.loads(host_changes("tid-001"))
+    assert [r["FriendlyName"] for r in first["added"]] == ["host-1"]
+
+    host_reboot("tid-001", "host-1")
+    mock_host_resource.list.return_value = [{"FriendlyName": "host-1", "InstanceId": "i-abc123", "Status": "rebooting"}]
+    result = json.loads(host_changes("tid-001", since=first["version"], fields="FriendlyName,Status"))
+    assert result["modified"] == [{"FriendlyName": "host-1", "Status": "rebooting"}]
+    assert result["added"] == result["removed"] == []
@@ -0,0 +1,108 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from duplo_resource.service import DuploService
+from duplocloud.errors import DuploError
+
+from duplocloud_mcp.tools.inventory import inventory_search, service_list_all_tenants
+
+
+def _service(name, image):
+    return {"Name": name, "Template": {"Containers": [{"Name": name, "Image": image}]}}
+
+
+SERVICES = {
+    "tid-001": [_service("web", "nginx:1.25"), _service("api", "node:18")],
+    "tid-002": [_service("web", "nginx:1.27")],
+}
+
+
+@pytest.fixture
+def portal(mock_tenant_resource):
+    tenant_clients = {}
+
+    def tenant_client(tenant_id):
+        if tenant_id not in tenant_clients:
+            resource = MagicMock()
+            resource.list.return_value = SERVICES[tenant_id]
+            resource.image_from_body.side_effect = lambda body: DuploService.image_from_body(resource, body)
+            resource.list_services.return_value = [{"Name": f"ecs-{tenant_id}", "TaskDefinition": "arn:web:3"}]
+            client = MagicMock()
+            client.load.return_value = resource
+            tenant_clients[tenant_id] = client
+        return tenant_clients[tenant_id]
+
+    with (
+        patch("duplocloud_mcp.tools.inventory.get_portal_resource", return_value=mock_tenant_resource),
+        patch("duplocloud_mcp.tools.inventory.get_tenant_client", side_effect=tenant_client),
+    ):
+        yield tenant_clients
+
+
+def test_inventory_search_by_image(portal):
+    result = json.loads(inventory_search("NGINX", fields="TenantName,Name"))
+    assert result["items"] == [{"TenantName": "dev", "Name": "web"}, {"TenantName": "staging", "Name": "web"}]
+    assert result["tenants_searched"] == 2
+    assert result["failed_tenants"] == []
+
+
+def test_inventory_search_limited_to_tenants(portal):
+    result = json.loads(inventory_search("web", tenants=["staging"]))
+    assert [item["TenantId"] for item in result["items"]] == ["tid-002"]
+    assert list(portal) == ["tid-002"]
+
+
+def test_inventory_search_ecs(portal):
+    result = json.loads(inventory_search("arn:web", kind="ecs", fields="TenantId,Name"))
+    assert {item["Name"] for item in result["items"]} == {"ecs-tid-001", "ecs-tid-002"}
+
+
+def test_inventory_search_unknown_kind(portal):
+    result = json.loads(inventory_search(kind="lambda"))
+    assert result["code"] == 400
+
+
+def test_inventory_search_reports_failed_tenants(portal):
+    portal_client = MagicMock()
+    portal_client.load.return_value.list.side_effect = DuploError("Forbidden", 403)
+    portal["tid-002"] = portal_client
+
+    result = json.loads(inventory_search())
+    assert [item["TenantId"] for item in result["items"]] == ["tid-001", "tid-001"]
+    assert result["failed_tenants"][0]["TenantId"] == "tid-002"
+    assert "Forbidden" in result["failed_tenants"][0]["error"]
+
+
+def test_service_list_all_tenants_paginated(portal):
+    first = json.loads(service_list_all_tenants(fields="Name", limit=2))
+    assert first["total"] == 3
+    assert len(first["items"]) == 2
+    second = json.loads(service_list_all_tenants(fields="Name", limit=2, cursor=first["next_cursor"]))
+    assert second["items"] == [{"Name": "web"}]
+    assert second["next_cursor"] is None
+    assert "failed_tenants" not in second
+
+
+def test_service_list_all_tenants_shares_service_cache(portal):
+    service_list_all_tenants()
+    service_list_all_tenants()
+    assert portal["tid-001"].load.return_value.list.call_count == 1
+
+
+def test_inventory_search_reports_timed_out_tenants(portal, monkeypatch):
+    release = threading.Event()
+    slow_client = MagicMock()
+    slow_client.load.return_value.list.side_effect = lambda: release.wait(5) and []
+    portal["tid-002"] = slow_client
+    monkeypatch.setenv("DUPLO_BATCH_TIMEOUT", "0.2")
+
+    try:
+        result = json.loads(inventory_search())
+    finally:
+        release.set()
+    assert [item["TenantId"] for item in result["items"]] == ["tid-001", "tid-001"]
+    assert result["failed_tenants"][0]["TenantId"] == "tid-002"
+    assert result["failed_tenants"][0]["status"] == "timeout"
+    assert "outcome unknown" in result["failed_tenants"][0]["error"]
@@ -0,0 +1,166 @@
+import json
+from unittest.mock import patch
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from duplocloud_mcp.server import mcp
+from duplocloud_mcp.tools.containers import ecs_task_run
+from duplocloud_mcp.tools.databases import database_create
+from duplocloud_mcp.tools.hosts import host_create
+from duplocloud_mcp.tools.jobs import job_status, job_wait
+from duplocloud_mcp.tools.services import service_restart
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+async def test_host_create_job(mock_get_client, mock_duplo_client, mock_host_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_host_resource.name_from_body.return_value = "duploservices-dev-host-1"
+    mock_host_resource.find.side_effect = [{"Status": "pending"}, {"Status": "pending"}, {"Status": "running"}]
+
+    result = json.loads(host_create("tid-001", "host-1", "t3.medium", job=True))
+    assert result["result"]["id"] == "i-new123"
+    status = json.loads(await job_wait(result["job_id"], timeout=2))
+    assert status["state"] == "ready"
+    assert status["name"] == "duploservices-dev-host-1"
+    assert status["polls"] == 3
+    assert json.loads(job_status(result["job_id"]))["state"] == "ready"
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+def test_host_create_without_job(mock_get_client, mock_duplo_client, mock_host_resource):
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    assert "job_id" not in json.loads(host_create("tid-001", "host-1", "t3.medium"))
+    mock_host_resource.find.assert_not_called()
+
+
+@patch("duplocloud_mcp.tools.databases.get_tenant_client")
+async def test_database_create_job_fails(mock_get_client, mock_duplo_client, mock_rds_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_rds_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_rds_resource.name_from_body.return_value = "duplomydb"
+    mock_rds_resource.find.side_effect = [{"InstanceStatus": "creating"}, {"InstanceStatus": "incompatible-network"}]
+
+    result = json.loads(database_create("tid-001", "mydb", "postgres", "db.t3.micro", "admin", "secret", job=True))
+    status = json.loads(await job_wait(result["job_id"], timeout=2))
+    assert status["state"] == "failed"
+    assert status["detail"] == "incompatible-network"
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_service_restart_job_waits_for_new_pods(
+    mock_get_client, mock_duplo_client, mock_service_resource, monkeypatch
+):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    def pod(name, status=1):
+        return {"InstanceId": name, "CurrentStatus": status, "DesiredStatus": 1}
+
+    mock_service_resource.pods.side_effect = [
+        [pod("old-1"), pod("old-2")],
+        [pod("old-1"), pod("old-2")],
+        [pod("old-2"), pod("new-1"), pod("new-2", status=6)],
+        [pod("new-1"), pod("new-2")],
+    ]
+
+    result = json.loads(service_restart("tid-001", "web-app", job=True))
+    status = json.loads(await job_wait(result["job_id"], timeout=2))
+    assert status["state"] == "ready"
+    assert status["polls"] == 3
+    assert status["detail"] == {"running": 2, "replicas": 2}
+
+
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
+async def test_ecs_task_run_job_waits_for_started_tasks(
+    mock_get_client, mock_duplo_client, mock_ecs_resource, monkeypatch
+):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_ecs_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_ecs_resource.prefixed_name.return_value = "duploservices-dev-my-task-def"
+    old = {"TaskArn": "arn:aws:ecs:task/old", "DesiredStatus": "STOPPED", "LastStatus": "STOPPED"}
+    mock_ecs_resource.list_tasks.side_effect = [
+        [old],
+        [old],
+        [old, {"TaskArn": "arn:aws:ecs:task/new123", "DesiredStatus": "RUNNING", "LastStatus": "PROVISIONING"}],
+        [old, {"TaskArn": "arn:aws:ecs:task/new123", "DesiredStatus": "RUNNING", "LastStatus": "RUNNING"}],
+    ]
+
+    result = json.loads(ecs_task_run("tid-001", "my-task-def", job=True))
+    status = json.loads(await job_wait(result["job_id"], timeout=2))
+    assert status["state"] == "ready"
+    assert status["polls"] == 3
+    assert status["detail"] == {"tasks": 1, "unsettled": 0}
+    mock_ecs_resource.list_tasks.assert_called_with("duploservices-dev-my-task-def")
+
+
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
+async def test_ecs_task_run_job_without_task_arns(mock_get_client, mock_duplo_client, mock_ecs_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_ecs_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_ecs_resource.run_task.return_value = {"message": "started"}
+    old = {"TaskArn": "old", "DesiredStatus": "RUNNING", "LastStatus": "RUNNING"}
+    new = {"TaskArn": "new", "DesiredStatus": "RUNNING", "LastStatus": "RUNNING"}
+    mock_ecs_resource.list_tasks.side_effect = [[old], [old], [old, new], [old, new, dict(new, TaskArn="new-2")]]
+
+    result = json.loads(ecs_task_run("tid-001", "my-task-def", replicas=2, job=True))
+    status = json.loads(await job_wait(result["job_id"], timeout=2))
+    assert status["state"] == "ready"
+    assert status["detail"] == {"tasks": 2, "unsettled": 0}
+
+
+async def test_job_wait_validates_arguments():
+    assert json.loads(await job_wait("job-nope"))["code"] == 400
+    assert json.loads(await job_wait("job-nope", timeout=0)) == {"error": "timeout must be greater than 0", "code": 400}
+
+
+@patch("duplocloud_mcp.tools.hosts.get_tenant_client")
+async def test_job_wait_sends_progress_over_mcp(mock_get_client, mock_duplo_client, mock_host_resource, monkeypatch):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    monkeypatch.setenv("DUPLO_JOB_POLL_MAX_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_host_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_host_resource.name_from_body.return_value = "duploservices-dev-host-1"
+    mock_host_resource.find.side_effect = [{"Status": "pending"}] * 3 + [{"Status": "running"}]
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, message))
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        created = await client.call_tool(
+            "host_create", {"tenant_id": "tid-001", "friendly_name": "host-1", "capacity": "t3.medium", "job": True}
+        )
+        job_id = json.loads(created.content[0].text)["job_id"]
+        result = await client.call_tool("job_wait", {"job_id": job_id}, progress_callback=on_progress)
+    assert json.loads(result.content[0].text)["state"] == "ready"
+    assert updates
+    assert updates[0][1].startswith("hosts duploservices-dev-host-1: pending")
+
+
+@patch("duplocloud_mcp.tools.containers.get_tenant_client")
+async def test_second_ecs_task_run_waits_on_its_own_tasks(
+    mock_get_client, mock_duplo_client, mock_ecs_resource, monkeypatch
+):
+    monkeypatch.setenv("DUPLO_JOB_POLL_INTERVAL", "0.01")
+    mock_duplo_client.load.return_value = mock_ecs_resource
+    mock_get_client.return_value = mock_duplo_client
+    first_task = {"TaskArn": "arn:first", "DesiredStatus": "RUNNING", "LastStatus": "PROVISIONING"}
+    second_task = {"TaskArn": "arn:second", "DesiredStatus": "RUNNING", "LastStatus": "RUNNING"}
+    mock_ecs_resource.list_tasks.return_value = [first_task, second_task]
+    mock_ecs_resource.run_task.side_effect = [
+        {"tasks": [{"taskArn": "arn:first"}]},
+        {"tasks": [{"taskArn": "arn:second"}]},
+    ]
+
+    first = json.loads(ecs_task_run("tid-001", "my-task-def", job=True))["job_id"]
+    second = json.loads(ecs_task_run("tid-001", "my-task-def", job=True))["job_id"]
+    assert json.loads(await job_wait(second, timeout=2))["state"] == "ready"
+    assert json.loads(job_status(first))["state"] == "pending"
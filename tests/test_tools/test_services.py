@@ -1,17 +1,22 @@
 import json
 from unittest.mock import patch
 
+from duplocloud.errors import DuploError
+
 from duplocloud_mcp.tools.services import (
+    service_changes,
     service_create,
     service_delete,
     service_get,
     service_list,
     service_restart,
+    service_restart_many,
     service_update,
+    service_update_many,
 )
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_list(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -19,17 +24,17 @@ def test_service_list(mock_get_client, mock_duplo_client, mock_service_resource)
     result = json.loads(service_list("tid-001"))
     assert len(result) == 2
     assert result[0]["Name"] == "web-app"
-    assert mock_duplo_client.tenantid == "tid-001"
+    mock_get_client.assert_called_once_with("tid-001")
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_list_empty_tenant(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(service_list(""))
     assert "error" in result
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_get(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -39,7 +44,7 @@ def test_service_get(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_service_resource.find.assert_called_once_with("web-app")
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_create(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -49,7 +54,7 @@ def test_service_create(mock_get_client, mock_duplo_client, mock_service_resourc
     mock_service_resource.create.assert_called_once_with({"Name": "web-app", "Image": "nginx:latest", "Replicas": 2})
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_update_image(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -59,7 +64,7 @@ def test_service_update_image(mock_get_client, mock_duplo_client, mock_service_r
     mock_service_resource.update_image.assert_called_once_with("web-app", "nginx:2.0")
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_update_replicas(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -69,7 +74,7 @@ def test_service_update_replicas(mock_get_client, mock_duplo_client, mock_servic
     mock_service_resource.update_replicas.assert_called_once_with("web-app", 5)
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_update_nothing(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -78,7 +83,7 @@ def test_service_update_nothing(mock_get_client, mock_duplo_client, mock_service
     assert "error" in result
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_delete(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -88,7 +93,7 @@ def test_service_delete(mock_get_client, mock_duplo_client, mock_service_resourc
     mock_service_resource.delete.assert_called_once_with("web-app")
 
 
-@patch("duplocloud_mcp.tools.services.get_client")
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
 def test_service_restart(mock_get_client, mock_duplo_client, mock_service_resource):
     mock_duplo_client.load.return_value = mock_service_resource
     mock_get_client.return_value = mock_duplo_client
@@ -96,3 +101,158 @@ def test_service_restart(mock_get_client, mock_duplo_client, mock_service_resour
     result = json.loads(service_restart("tid-001", "web-app"))
     assert "message" in result
     mock_service_resource.restart.assert_called_once_with("web-app")
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_list_cached(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    first = json.loads(service_list("tid-001"))
+    second = json.loads(service_list("tid-001"))
+    assert first == second
+    mock_service_resource.list.assert_called_once()
+
+    service_list("tid-001", fresh=True)
+    assert mock_service_resource.list.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_list_cached_per_tenant(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    service_list("tid-001")
+    service_list("tid-002")
+    assert mock_service_resource.list.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_update_invalidates_cache(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    service_list("tid-001")
+    service_update("tid-001", "web-app", image="nginx:2.0")
+    service_list("tid-001")
+    assert mock_service_resource.list.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_get_served_from_list_index(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    service_list("tid-001")
+    result = json.loads(service_get("tid-001", "api"))
+    assert result == {"Name": "api", "Image": "node:18", "Replicas": 3}
+    mock_service_resource.find.assert_not_called()
+
+    service_get("tid-001", "api", fresh=True)
+    mock_service_resource.find.assert_called_once_with("api")
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_write_drops_only_that_name_from_index(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    service_list("tid-001")
+    service_restart("tid-001", "web-app")
+    service_get("tid-001", "api")
+    mock_service_resource.find.assert_not_called()
+    service_get("tid-001", "web-app")
+    mock_service_resource.find.assert_called_once_with("web-app")
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_list_paginated(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    first = json.loads(service_list("tid-001", fields="Name", limit=1))
+    assert first["items"] == [{"Name": "web-app"}]
+    assert first["total"] == 2
+    second = json.loads(service_list("tid-001", fields="Name", limit=1, cursor=first["next_cursor"]))
+    assert second["items"] == [{"Name": "api"}]
+    assert second["next_cursor"] is None
+    mock_service_resource.list.assert_called_once()
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_list_cursor_from_other_tenant(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    first = json.loads(service_list("tid-001", limit=1))
+    result = json.loads(service_list("tid-002", cursor=first["next_cursor"]))
+    assert result["code"] == 400
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_update_many(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+    mock_service_resource.update_image.side_effect = lambda name, image: (
+        (_ for _ in ()).throw(DuploError("Service not found", 404)) if name == "missing" else None
+    )
+
+    result = json.loads(service_update_many("tid-001", ["web-app", "missing", "api"], image="nginx:1.27"))
+    assert result["total"] == 3
+    assert result["succeeded"] == 2
+    rows = {row["target"]: row for row in result["results"]}
+    assert rows["missing"]["status"] == "error"
+    assert rows["missing"]["code"] == 404
+    assert rows["api"]["result"] == {"message": "Service 'api' updated"}
+    assert mock_service_resource.update_image.call_count == 3
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_update_many_nothing(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+    result = json.loads(service_update_many("tid-001", ["web-app"]))
+    assert "error" in result
+    mock_service_resource.update_image.assert_not_called()
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_restart_many(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+    result = json.loads(service_restart_many("tid-001", ["web-app", "api"], concurrency=2))
+    assert result["succeeded"] == 2
+    assert mock_service_resource.restart.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_changes(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    first = json.loads(service_changes("tid-001", fields="Name"))
+    assert first["full"] is True
+    assert first["added"] == [{"Name": "web-app"}, {"Name": "api"}]
+
+    mock_service_resource.list.return_value = [
+        {"Name": "web-app", "Image": "nginx:1.27", "Replicas": 2},
+        {"Name": "worker", "Image": "python:3.13", "Replicas": 1},
+    ]
+    unchanged = json.loads(service_changes("tid-001", since=first["version"]))
+    assert unchanged["version"] == first["version"]
+    assert unchanged["modified"] == []
+
+    result = json.loads(service_changes("tid-001", since=first["version"], fresh=True))
+    assert result["full"] is False
+    assert [r["Name"] for r in result["added"]] == ["worker"]
+    assert result["modified"] == [{"Name": "web-app", "Image": "nginx:1.27", "Replicas": 2}]
+    assert result["removed"] == ["api"]
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+def test_service_changes_invalid_since(mock_get_client, mock_duplo_client, mock_service_resource):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    result = json.loads(service_changes("tid-001", since="???"))
+    assert result == {"error": "Invalid version token", "code": 400}
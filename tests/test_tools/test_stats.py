@@ -0,0 +1,51 @@
+import json
+
+from duplocloud_mcp.metrics import get_metrics
+from duplocloud_mcp.tools.stats import metrics_dump, server_stats
+
+
+def test_server_stats_reports_worker_pool(monkeypatch):
+    monkeypatch.setenv("DUPLO_MCP_WORKERS", "4")
+    result = json.loads(server_stats())
+    assert result["workers"]["max_workers"] == 4
+    assert result["workers"]["queued"] == 0
+
+
+def test_server_stats_reports_cache():
+    result = json.loads(server_stats())
+    assert result["cache"]["entries"] == 0
+    assert result["cache"]["hits"] == 0
+
+
+def test_server_stats_reports_sessions():
+    result = json.loads(server_stats())
+    assert result["sessions"]["sessions"] == 0
+    assert result["sessions"]["concurrency_limit"] == 4
+
+
+def test_server_stats_reports_process_memory():
+    process = json.loads(server_stats())["process"]
+    assert process["peak_rss_bytes"] > 0
+    assert process["rss_bytes"] is None or process["rss_bytes"] > 0
+    assert process["threads"] >= 1
+
+
+def test_server_stats_persistent_store_disabled_by_default():
+    assert json.loads(server_stats())["persistent"] is None
+
+
+def test_metrics_dump_json():
+    with get_metrics().observing("tenant_list") as call:
+        call["result"] = "[]"
+    result = json.loads(metrics_dump())
+    assert result["tenant_list"]["calls"] == {"ok": 1}
+
+
+def test_metrics_dump_prometheus():
+    with get_metrics().observing("tenant_list") as call:
+        call["result"] = "[]"
+    assert 'duplo_mcp_tool_calls_total{tool="tenant_list",outcome="ok"} 1' in metrics_dump(format="prometheus")
+
+
+def test_metrics_dump_rejects_unknown_format():
+    assert json.loads(metrics_dump(format="xml"))["code"] == 400
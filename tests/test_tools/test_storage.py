@@ -1,10 +1,12 @@
 import json
 from unittest.mock import patch
 
+from duplocloud_mcp.changes import record_etag
+from duplocloud_mcp.meta import collecting_meta
 from duplocloud_mcp.tools.storage import bucket_create, bucket_delete, bucket_get, bucket_list, bucket_update
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_list(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_duplo_client.load.return_value = mock_s3_resource
     mock_get_client.return_value = mock_duplo_client
@@ -14,7 +16,7 @@ def test_bucket_list(mock_get_client, mock_duplo_client, mock_s3_resource):
     assert result[0]["Name"] == "my-bucket"
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_get(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_duplo_client.load.return_value = mock_s3_resource
     mock_get_client.return_value = mock_duplo_client
@@ -24,7 +26,7 @@ def test_bucket_get(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_s3_resource.find.assert_called_once_with("my-bucket")
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_create(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_duplo_client.load.return_value = mock_s3_resource
     mock_get_client.return_value = mock_duplo_client
@@ -34,7 +36,7 @@ def test_bucket_create(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_s3_resource.create.assert_called_once_with({"Name": "new-bucket"})
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_update_versioning(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_duplo_client.load.return_value = mock_s3_resource
     mock_get_client.return_value = mock_duplo_client
@@ -46,7 +48,7 @@ def test_bucket_update_versioning(mock_get_client, mock_duplo_client, mock_s3_re
     assert call_kwargs.kwargs["body"]["EnableVersioning"] is True
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_delete(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_duplo_client.load.return_value = mock_s3_resource
     mock_get_client.return_value = mock_duplo_client
@@ -56,8 +58,94 @@ def test_bucket_delete(mock_get_client, mock_duplo_client, mock_s3_resource):
     mock_s3_resource.delete.assert_called_once_with("my-bucket")
 
 
-@patch("duplocloud_mcp.tools.storage.get_client")
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
 def test_bucket_get_empty_name(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(bucket_get("tid-001", ""))
     assert "error" in result
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_create_invalidates_cache(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    bucket_list("tid-001")
+    bucket_create("tid-001", "new-bucket")
+    bucket_list("tid-001")
+    assert mock_s3_resource.list.call_count == 2
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_update_ignores_stale_cache(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    bucket_list("tid-001")
+    mock_s3_resource.find.return_value = {"Name": "my-bucket", "EnableVersioning": True, "AllowPublicAccess": True}
+    mock_s3_resource.update.return_value = {"Name": "my-bucket", "EnableVersioning": False, "AllowPublicAccess": True}
+    with collecting_meta() as meta:
+        result = json.loads(bucket_update("tid-001", "my-bucket", versioning=False))
+    mock_s3_resource.update.assert_called_once_with(
+        name="my-bucket", body={"Name": "my-bucket", "EnableVersioning": False, "AllowPublicAccess": True}
+    )
+    assert result == mock_s3_resource.update.return_value
+    assert meta == {
+        "duplocloud/changed": ["EnableVersioning"],
+        "duplocloud/etag": record_etag(mock_s3_resource.update.return_value),
+    }
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_update_does_not_skip_on_stale_cache(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    bucket_list("tid-001")
+    mock_s3_resource.list.return_value = [{"Name": "my-bucket", "EnableVersioning": True}]
+    bucket_list("tid-001")
+    bucket_update("tid-001", "my-bucket", versioning=True)
+    mock_s3_resource.update.assert_called_once()
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_update_skips_unchanged(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    with collecting_meta() as meta:
+        result = json.loads(bucket_update("tid-001", "my-bucket", versioning=False))
+    mock_s3_resource.update.assert_not_called()
+    assert result == mock_s3_resource.find.return_value
+    assert meta == {"duplocloud/changed": [], "duplocloud/etag": record_etag(mock_s3_resource.find.return_value)}
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_update_etag_conflict(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    etag = record_etag(mock_s3_resource.find.return_value)
+    changed = {"Name": "my-bucket", "EnableVersioning": False, "AllowPublicAccess": True}
+    mock_s3_resource.find.return_value = changed
+    result = json.loads(bucket_update("tid-001", "my-bucket", versioning=True, etag=etag))
+    assert result["code"] == 412
+    assert "modified since etag" in result["error"]
+    mock_s3_resource.update.assert_not_called()
+
+    current = result["error"].rsplit(" ", 1)[1]
+    bucket_update("tid-001", "my-bucket", versioning=True, etag=current)
+    assert mock_s3_resource.update.call_args.kwargs["body"]["AllowPublicAccess"] is True
+
+
+@patch("duplocloud_mcp.tools.storage.get_tenant_client")
+def test_bucket_update_costs_one_read_and_one_write(mock_get_client, mock_duplo_client, mock_s3_resource):
+    mock_duplo_client.load.return_value = mock_s3_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    mock_s3_resource.update.return_value = {"message": "updated"}
+    with collecting_meta() as meta:
+        result = json.loads(bucket_update("tid-001", "my-bucket", versioning=True))
+    assert result == {"message": "updated"}
+    assert mock_s3_resource.find.call_count == 1
+    assert meta == {"duplocloud/changed": ["EnableVersioning"]}
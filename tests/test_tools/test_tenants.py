@@ -4,7 +4,7 @@ from unittest.mock import patch
 from duplocloud_mcp.tools.tenants import tenant_create, tenant_delete, tenant_get, tenant_list
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_list(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_duplo_client.load.return_value = mock_tenant_resource
     mock_get_client.return_value = mock_duplo_client
@@ -15,7 +15,7 @@ def test_tenant_list(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_tenant_resource.list.assert_called_once()
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_get(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_duplo_client.load.return_value = mock_tenant_resource
     mock_get_client.return_value = mock_duplo_client
@@ -26,7 +26,7 @@ def test_tenant_get(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_tenant_resource.find.assert_called_once_with("dev")
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_get_empty_name(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(tenant_get(""))
@@ -34,7 +34,7 @@ def test_tenant_get_empty_name(mock_get_client, mock_duplo_client):
     assert result["code"] == 400
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_create(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_duplo_client.load.return_value = mock_tenant_resource
     mock_get_client.return_value = mock_duplo_client
@@ -44,14 +44,14 @@ def test_tenant_create(mock_get_client, mock_duplo_client, mock_tenant_resource)
     mock_tenant_resource.create.assert_called_once_with({"AccountName": "test", "PlanID": "plan-1"})
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_create_empty_name(mock_get_client, mock_duplo_client):
     mock_get_client.return_value = mock_duplo_client
     result = json.loads(tenant_create("", "plan-1"))
     assert "error" in result
 
 
-@patch("duplocloud_mcp.tools.tenants.get_client")
+@patch("duplocloud_mcp.client.get_client")
 def test_tenant_delete(mock_get_client, mock_duplo_client, mock_tenant_resource):
     mock_duplo_client.load.return_value = mock_tenant_resource
     mock_get_client.return_value = mock_duplo_client
@@ -59,3 +59,16 @@ def test_tenant_delete(mock_get_client, mock_duplo_client, mock_tenant_resource)
     result = json.loads(tenant_delete("test"))
     assert "message" in result
     mock_tenant_resource.delete.assert_called_once_with("test")
+
+
+@patch("duplocloud_mcp.client.get_client")
+def test_tenant_list_cached_until_create(mock_get_client, mock_duplo_client, mock_tenant_resource):
+    mock_duplo_client.load.return_value = mock_tenant_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    tenant_list()
+    tenant_list()
+    assert mock_tenant_resource.list.call_count == 1
+    tenant_create("new-tenant", "plan-1")
+    tenant_list()
+    assert mock_tenant_resource.list.call_count == 2
@@ -0,0 +1,202 @@
+import contextvars
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from duplocloud_mcp.client import get_tenant_client
+from duplocloud_mcp.server import mcp
+from duplocloud_mcp.tracing import FileExporter, Tracer, get_tracer, span
+
+
+class CollectingExporter:
+    exported: list[list[dict]] = []
+
+    def export(self, spans):
+        CollectingExporter.exported.append(list(spans))
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def exporter():
+    CollectingExporter.exported = []
+    return CollectingExporter()
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("DUPLO_TRACING", "1")
+    monkeypatch.setenv("DUPLO_TRACE_FILE", str(path))
+    return path
+
+
+def _read_spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_children_share_trace_and_point_to_parent(exporter):
+    tracer = Tracer(exporter)
+    with tracer.span("tool service_list", **{"duplo.tenant": "tid-001", "unset": None}):
+        with tracer.span("http GET") as child:
+            child.set("http.status_code", 200)
+    [spans] = exporter.exported
+    child, root = spans
+    assert root["parentSpanId"] is None
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["traceId"] == root["traceId"]
+    assert root["attributes"] == {"duplo.tenant": "tid-001"}
+    assert child["attributes"]["http.status_code"] == 200
+    assert root["status"] == {"code": "OK"}
+    assert root["endTimeUnixNano"] >= child["endTimeUnixNano"]
+
+
+def test_separate_roots_are_separate_traces(exporter):
+    tracer = Tracer(exporter)
+    with tracer.span("a"):
+        pass
+    with tracer.span("b"):
+        pass
+    assert exporter.exported[0][0]["traceId"] != exporter.exported[1][0]["traceId"]
+
+
+def test_exception_marks_span_as_error(exporter):
+    tracer = Tracer(exporter)
+    with pytest.raises(RuntimeError):
+        with tracer.span("tool"):
+            raise RuntimeError("boom")
+    assert exporter.exported[0][0]["status"] == {"code": "ERROR", "message": "RuntimeError: boom"}
+
+
+def test_spans_on_worker_threads_join_the_trace(exporter):
+    tracer = Tracer(exporter)
+
+    def request():
+        with tracer.span("http GET"):
+            pass
+
+    with tracer.span("tool"), ThreadPoolExecutor(2) as pool:
+        for future in [pool.submit(contextvars.copy_context().run, request) for _ in range(2)]:
+            future.result()
+    spans = exporter.exported[0]
+    root = spans[-1]
+    assert [s["name"] for s in spans] == ["http GET", "http GET", "tool"]
+    assert all(s["parentSpanId"] == root["spanId"] for s in spans[:2])
+
+
+def test_late_child_exported_on_its_own(exporter):
+    tracer = Tracer(exporter)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(context):
+        def body():
+            with tracer.span("late"):
+                started.set()
+                release.wait(1)
+
+        context.run(body)
+
+    with tracer.span("tool"):
+        thread = threading.Thread(target=slow, args=(contextvars.copy_context(),))
+        thread.start()
+        started.wait(1)
+    release.set()
+    thread.join()
+    assert [[s["name"] for s in batch] for batch in exporter.exported] == [["tool"], ["late"]]
+    assert exporter.exported[1][0]["parentSpanId"] == exporter.exported[0][0]["spanId"]
+
+
+def test_span_is_noop_when_tracing_off(monkeypatch):
+    monkeypatch.delenv("DUPLO_TRACING", raising=False)
+    assert get_tracer() is None
+    with span("anything", a=1) as s:
+        s.set("b", 2)
+        s.set_error("ignored")
+
+
+def test_file_exporter_appends_json_lines(tmp_path):
+    path = tmp_path / "t.jsonl"
+    exporter = FileExporter(str(path))
+    exporter.export([{"name": "a"}])
+    exporter.export([{"name": "b"}, {"name": "c"}])
+    assert [s["name"] for s in _read_spans(path)] == ["a", "b", "c"]
+
+
+def test_file_exporter_rotates(tmp_path):
+    path = tmp_path / "t.jsonl"
+    exporter = FileExporter(str(path), max_bytes=40)
+    for name in "abcd":
+        exporter.export([{"name": name * 10}])
+    assert (tmp_path / "t.jsonl.1").exists()
+    assert path.stat().st_size <= 40
+
+
+def test_file_exporter_is_default(trace_file):
+    assert isinstance(get_tracer().exporter, FileExporter)
+    assert get_tracer().exporter.path == str(trace_file)
+
+
+def test_exporter_loaded_from_import_path(monkeypatch, exporter):
+    monkeypatch.setenv("DUPLO_TRACING", "1")
+    monkeypatch.setenv("DUPLO_TRACE_EXPORTER", "tests.test_tracing:CollectingExporter")
+    with span("tool"):
+        pass
+    assert exporter.exported[0][0]["name"] == "tool"
+
+
+def test_bad_exporter_disables_tracing(monkeypatch):
+    monkeypatch.setenv("DUPLO_TRACING", "1")
+    monkeypatch.setenv("DUPLO_TRACE_EXPORTER", "zipkin")
+    assert get_tracer() is None
+
+
+@patch("duplocloud_mcp.tools.services.get_tenant_client")
+async def test_tool_call_traced(mock_get_client, mock_duplo_client, mock_service_resource, trace_file):
+    mock_duplo_client.load.return_value = mock_service_resource
+    mock_get_client.return_value = mock_duplo_client
+
+    await mcp.call_tool("service_list", {"tenant_id": "tid-001"})
+    spans = {s["name"]: s for s in _read_spans(trace_file)}
+    root = spans["tool service_list"]
+    assert root["attributes"]["mcp.tool"] == "service_list"
+    assert root["attributes"]["duplo.tenant"] == "tid-001"
+    assert root["attributes"]["mcp.result_bytes"] > 0
+    assert spans["cache.read"]["parentSpanId"] == root["spanId"]
+    assert spans["cache.read"]["attributes"] == {
+        "duplo.tenant": "tid-001",
+        "duplo.resource": "service",
+        "cache.op": "list",
+        "cache.result": "miss",
+    }
+    assert spans["serialize"]["attributes"]["payload.bytes"] == root["attributes"]["mcp.result_bytes"]
+
+
+async def test_tool_error_marks_root_span(trace_file):
+    await mcp.call_tool("service_get", {"tenant_id": "tid-001", "name": ""})
+    [root] = _read_spans(trace_file)
+    assert root["attributes"]["duplo.error_code"] == "400"
+    assert root["status"]["code"] == "ERROR"
+
+
+def test_http_requests_traced(mock_env, trace_file):
+    client = get_tenant_client("tid-001")
+    response = MagicMock(status_code=200, headers={}, content=b'{"ok": true}')
+    with span("tool"), patch.object(client.session, "request", return_value=response):
+        client.get("subscriptions/tid-001/GetReplicationControllers")
+    http, root = _read_spans(trace_file)
+    assert http["name"] == "http GET"
+    assert http["attributes"].pop("ratelimit.wait_ms") >= 0
+    assert http["parentSpanId"] == root["spanId"]
+    assert http["attributes"] == {
+        "http.method": "GET",
+        "http.route": "subscriptions/tid-001/GetReplicationControllers",
+        "duplo.tenant": "tid-001",
+        "retry": 0,
+        "http.status_code": 200,
+        "http.response_bytes": 12,
+    }
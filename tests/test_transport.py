@@ -0,0 +1,83 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from duplocloud_mcp.transport import HttpSettings, build_session, http_settings, session_stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.1)
+        body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def portal():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DUPLO_HTTP_POOL_SIZE", "4")
+    monkeypatch.setenv("DUPLO_HTTP_KEEPALIVE", "5")
+    monkeypatch.setenv("DUPLO_HTTP_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("DUPLO_HTTP_READ_TIMEOUT", "20")
+    settings = http_settings()
+    assert settings == HttpSettings(pool_size=4, keepalive=5.0, connect_timeout=1.5, read_timeout=20.0)
+    assert settings.timeout == (1.5, 20.0)
+
+
+def test_connections_are_reused(portal):
+    session = build_session(HttpSettings())
+    for _ in range(5):
+        session.get(f"{portal}/ok").raise_for_status()
+    stats = session_stats(session)
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reuse_ratio"] == 0.8
+    session.close()
+
+
+def test_idle_connections_expire_after_keepalive(portal):
+    session = build_session(HttpSettings(keepalive=0.05))
+    session.get(f"{portal}/ok")
+    time.sleep(0.1)
+    session.get(f"{portal}/ok")
+    stats = session_stats(session)
+    assert stats["expired_idle"] == 1
+    assert stats["reused"] == 0
+    session.close()
+
+
+def test_pool_size_bounds_connections_and_records_wait(portal):
+    session = build_session(HttpSettings(pool_size=2))
+    with ThreadPoolExecutor(6) as pool:
+        list(pool.map(lambda _: session.get(f"{portal}/slow"), range(6)))
+    stats = session_stats(session)
+    assert stats["requests"] == 6
+    assert stats["new_connections"] == 2
+    assert stats["wait_ms_max"] > 50
+    session.close()
+
+
+def test_session_stats_for_plain_session():
+    assert session_stats(requests.Session()) == {}